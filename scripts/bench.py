@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+UI 性能测试
+
+在模拟器中运行（默认）：
+    ./scripts/bench.py --output report.json
+
+在设备上运行（需要先部署 src，包括 bench.py）：
+    ./scripts/bench.py --device --output report.json
+
+与基准报告比较，总线字节数、内存分配或帧耗时超出容差时返回非零退出码：
+    ./scripts/bench.py --baseline report.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SCENARIO_DIR = PROJECT_ROOT / "bench" / "scenarios"
+
+# 比较基准时检查的指标（值越小越好）和使用的容差参数
+COMPARED_METRICS = (
+    ("bus_bytes_per_frame", "tolerance"),
+    ("alloc_bytes_per_frame", "tolerance"),
+    ("frame_us_avg", "time_tolerance"),
+)
+
+# 模拟器中网络设置页面扫描到的网络，让菜单长度接近真实环境
+FAKE_NETWORKS = [
+    (f"Network-{i}".encode(), bytes(6), 1, -40 - i * 5, 3, False) for i in range(8)
+]
+
+
+def load_scenarios(names):
+    scenarios = []
+    for path in sorted(SCENARIO_DIR.glob("*.json")):
+        if names and path.stem not in names:
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            scenarios.append(json.load(f))
+    return scenarios
+
+
+def run_host(scenarios):
+    sys.path.insert(0, str(PROJECT_ROOT))
+    from sim import runtime
+
+    runtime.install()
+    import network
+
+    network.WLAN.scan_results = FAKE_NETWORKS
+
+    from sim import Simulator
+
+    simulator = Simulator()
+    from bench import Bench
+
+    bench = Bench(simulator.ui)
+    results = []
+    for scenario in scenarios:
+        print(f"running {scenario.get('name')}", file=sys.stderr)
+        results.append(bench.run_scenario(scenario))
+    return {"platform": "host", "results": results}
+
+
+def run_device(scenarios):
+    from mpremote.main import State
+
+    state = State()
+    state._auto_soft_reset = False
+    state.ensure_raw_repl()
+    try:
+        code = "import bench\nbench.run_device({!r})".format(json.dumps(scenarios))
+        output, error = state.transport.exec_raw(
+            code,
+            timeout=None,
+            data_consumer=lambda data: sys.stderr.write(data.decode(errors="replace")),
+        )
+    finally:
+        state.transport.close()
+    if error:
+        raise RuntimeError(error.decode(errors="replace"))
+    for line in output.decode().splitlines():
+        if line.startswith("BENCH "):
+            return json.loads(line[len("BENCH ") :])
+    raise RuntimeError("no benchmark report received")
+
+
+def compare(report, baseline, tolerances):
+    """返回超出容差的指标列表"""
+    baseline_results = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        old = baseline_results.get(result["name"])
+        if old is None:
+            continue
+        for metric, tolerance_name in COMPARED_METRICS:
+            tolerance = tolerances[tolerance_name]
+            new_value = result.get(metric)
+            old_value = old.get(metric)
+            if new_value is None or old_value is None:
+                continue
+            if new_value > old_value * (1 + tolerance / 100) and new_value - old_value > 1:
+                regressions.append((result["name"], metric, old_value, new_value))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UI 性能测试")
+    parser.add_argument("scenarios", nargs="*", help="只运行指定场景（文件名，不含 .json）")
+    parser.add_argument("--device", action="store_true", help="在连接的设备上运行")
+    parser.add_argument("--output", help="报告输出文件（默认输出到标准输出）")
+    parser.add_argument("--baseline", help="用于比较的基准报告")
+    parser.add_argument("--tolerance", type=float, default=10, help="字节数允许的退化百分比")
+    parser.add_argument(
+        "--time-tolerance", type=float, default=25, help="帧耗时允许的退化百分比"
+    )
+    args = parser.parse_args()
+
+    scenarios = load_scenarios(args.scenarios)
+    report = run_device(scenarios) if args.device else run_host(scenarios)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        tolerances = {"tolerance": args.tolerance, "time_tolerance": args.time_tolerance}
+        regressions = compare(report, baseline, tolerances)
+        for name, metric, old_value, new_value in regressions:
+            print(f"REGRESSION {name}.{metric}: {old_value} -> {new_value}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
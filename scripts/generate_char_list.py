@@ -1,13 +1,23 @@
 #!/usr/bin/env python3
 
+import argparse
+import ast
+from pathlib import Path
 
-def generate_char_list():
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def ascii_chars():
+    """基础 ASCII 字符 (32-126)，包括空格、标点、数字、大小写字母"""
+    return [chr(i) for i in range(32, 127)]
+
+
+def generate_char_list(output="chars.txt"):
     chars = []
 
     # 1. 添加基础 ASCII 字符 (32-126)
     # 包括空格、标点、数字、大小写字母
-    for i in range(32, 127):
-        chars.append(chr(i))
+    chars.extend(ascii_chars())
 
     # 2. 遍历 GB2312 编码范围
     # GB2312 编码范围：高字节 0xA1-0xFE, 低字节 0xA1-0xFE
@@ -23,11 +33,89 @@ def generate_char_list():
                 continue
 
     # 3. 写入文件，使用 UTF-8 编码存储
-    with open("chars.txt", "w", encoding="utf-8") as f:
+    with open(output, "w", encoding="utf-8") as f:
         f.write("".join(chars))
 
-    print(f"成功生成 chars.txt，包含字符总数: {len(chars)}")
+    print(f"成功生成 {output}，包含字符总数: {len(chars)}")
+
+
+def _docstring_nodes(tree):
+    """模块、类和函数的文档字符串节点（不会显示在屏幕上）"""
+    nodes = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            body = node.body
+            if (
+                body
+                and isinstance(body[0], ast.Expr)
+                and isinstance(body[0].value, ast.Constant)
+                and isinstance(body[0].value.value, str)
+            ):
+                nodes.add(id(body[0].value))
+    return nodes
+
+
+def collect_source_chars(src_dir):
+    """
+    收集源码中所有字符串字面量用到的字符（包括 data.py 中的课程名，不包括文档字符串和注释）
+
+    Returns:
+        set: 字符集合
+    """
+    chars = set()
+    for path in sorted(Path(src_dir).rglob("*.py")):
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        docstrings = _docstring_nodes(tree)
+        for node in ast.walk(tree):
+            if (
+                isinstance(node, ast.Constant)
+                and isinstance(node.value, str)
+                and id(node) not in docstrings
+            ):
+                chars.update(node.value)
+    return chars
+
+
+def generate_subset(src_dir, extra_files, output="chars.txt"):
+    """
+    生成只包含固件实际使用字符的字符集：ASCII + 源码字符串 + 额外字符文件
+
+    Args:
+        src_dir: 源码目录
+        extra_files: 额外字符文件列表（如服务器返回的学生名单），文件中的所有字符都会加入
+        output: 输出文件
+    """
+    chars = ascii_chars()
+    used = collect_source_chars(src_dir)
+    for path in extra_files:
+        with open(path, "r", encoding="utf-8") as f:
+            used.update(f.read())
+
+    # 控制字符不需要字形，ASCII 已经在前面
+    extra = sorted(char for char in used if ord(char) > 126)
+    chars.extend(extra)
+
+    with open(output, "w", encoding="utf-8") as f:
+        f.write("".join(chars))
+
+    print(f"成功生成 {output}，包含字符总数: {len(chars)}（非 ASCII 字符 {len(extra)} 个）")
 
 
 if __name__ == "__main__":
-    generate_char_list()
+    parser = argparse.ArgumentParser(description="生成字符集文件")
+    parser.add_argument("--output", default="chars.txt", help="输出文件 (默认: chars.txt)")
+    parser.add_argument(
+        "--subset", action="store_true", help="只包含源码字符串中用到的字符，而不是整个 GB2312"
+    )
+    parser.add_argument(
+        "--src", default=str(PROJECT_ROOT / "src"), help="--subset 时扫描的源码目录"
+    )
+    parser.add_argument(
+        "--extra", action="append", default=[], help="--subset 时额外加入的字符文件（可多次指定）"
+    )
+    args = parser.parse_args()
+
+    if args.subset:
+        generate_subset(args.src, args.extra, args.output)
+    else:
+        generate_char_list(args.output)
@@ -1,31 +1,70 @@
 #!/usr/bin/env python3
 
 import argparse
+import struct
+import zlib
 
 from PIL import Image, ImageDraw, ImageFont
 
+# 字形索引每块的条目数（设备上每次查找读取一块）
+INDEX_BLOCK_SIZE = 64
+# 按页保存的字形索引（v2 字体使用，格式见 src/ui_framework/glyph_index.py）
+INDEX_VERSION_PAGES = 2
+INDEX_PAGE_BITMAP_SIZE = 32
 
-def generate_font_bin(ttf_path, chars_file, output_bin, size):
-    # 加载字体
+# v2 字体文件（格式见 src/ui_framework/fonts.py）
+FONT_MAGIC = b"ZFNT"
+FONT_VERSION = 2
+FONT_HEADER = "<4sHBBBBBBHHIIII"
+FORMAT_VLSB = 0
+# 压缩方式：位图数据按块用 raw deflate 压缩，设备上用 deflate 模块解压
+COMPRESS_NONE = 0
+COMPRESS_DEFLATE = 1
+# 每个压缩块包含的字形数（块越大压缩率越高，但缓存未命中时需要解压的数据越多）
+COMPRESS_BLOCK_SIZE = 16
+# deflate 窗口大小（2^10 = 1 KB，与 fonts.py 中的 FONT_WBITS 一致）
+COMPRESS_WBITS = 10
+# 字形位图宽度（v1 和 v2 都统一使用 16 像素宽的格子）
+CELL_WIDTH = 16
+# 字体中不存在的字符显示为这个字符的字形（v2 字体总是包含）
+FALLBACK_CHAR = "\ufffd"
+
+
+def render_glyphs(ttf_path, chars, size):
+    """
+    用 TTF 字体渲染每个字符
+
+    Returns:
+        tuple: (MONO_HLSB 位图列表, 步进宽度列表)
+    """
     font = ImageFont.truetype(ttf_path, size)
+    glyphs = []
+    advances = []
+    for char in chars:
+        # 创建 16 x size 的黑色画布（统一使用 16 像素宽度存储）
+        img = Image.new("1", (CELL_WIDTH, size), 0)
+        draw = ImageDraw.Draw(img)
+        # 渲染字符
+        draw.text((0, 0), char, font=font, fill=1)
+        # 导出为 bytes (16 x size 占用 2 * size 字节)
+        # 使用 'raw' MONO_HLSB 模式
+        glyphs.append(img.tobytes())
+        advances.append(min(CELL_WIDTH, max(0, round(font.getlength(char)))))
+    return glyphs, advances
 
+
+def generate_font_bin(ttf_path, chars_file, output_bin, size):
     with open(chars_file, "r", encoding="utf-8") as f:
         chars = f.read()
 
     # 使用 16 像素宽度存储，高度为 size
     # 每行 2 字节（16位），共 size 行
     bytes_per_char = 2 * size
+    glyphs, _ = render_glyphs(ttf_path, chars, size)
 
     with open(output_bin, "wb") as f_out:
-        for char in chars:
-            # 创建 16 x size 的黑色画布（统一使用 16 像素宽度存储）
-            img = Image.new("1", (16, size), 0)
-            draw = ImageDraw.Draw(img)
-            # 渲染字符
-            draw.text((0, 0), char, font=font, fill=1)
-            # 导出为 bytes (16 x size 占用 2 * size 字节)
-            # 使用 'raw' MONO_HLSB 模式
-            f_out.write(img.tobytes())
+        for glyph in glyphs:
+            f_out.write(glyph)
 
     total_bytes = len(chars) * bytes_per_char
     print(f"完成！生成 {output_bin}")
@@ -33,13 +72,424 @@ def generate_font_bin(ttf_path, chars_file, output_bin, size):
     print(f"总大小: {total_bytes / 1024:.2f} KB")
 
 
+def build_index(chars, block_size=INDEX_BLOCK_SIZE):
+    """
+    生成按码点排序的字形索引（格式见 src/ui_framework/glyph_index.py）
+
+    字形序号即字符在字符集中的位置，重复的字符使用第一次出现的位置。
+
+    Returns:
+        bytes: 索引文件内容
+    """
+    entries = {}
+    for glyph, char in enumerate(chars):
+        entries.setdefault(ord(char), glyph)
+    codes = sorted(entries)
+
+    data = bytearray(b"GIDX")
+    data += struct.pack("<HHI", 1, block_size, len(codes))
+    # 目录：每块第一个条目的码点
+    for start in range(0, len(codes), block_size):
+        data += struct.pack("<I", codes[start])
+    for code in codes:
+        data += struct.pack("<IH", code, entries[code])
+    return bytes(data)
+
+
+def build_page_index(codes):
+    """
+    生成按页保存的字形索引（字形序号即码点在升序排列的 codes 中的位置）
+
+    Returns:
+        bytes: 索引内容
+    """
+    pages = {}
+    for glyph, code in enumerate(codes):
+        page = code >> 8
+        if page not in pages:
+            pages[page] = [glyph, bytearray(INDEX_PAGE_BITMAP_SIZE)]
+        pages[page][1][(code & 0xFF) >> 3] |= 1 << (code & 7)
+
+    data = bytearray(b"GIDX")
+    data += struct.pack("<HHI", INDEX_VERSION_PAGES, len(pages), len(codes))
+    for page in pages:
+        data += struct.pack("<H", page)
+    for rank, _ in pages.values():
+        data += struct.pack("<H", rank)
+    for _, bitmap in pages.values():
+        data += bitmap
+    return bytes(data)
+
+
+def parse_index(data, offset=0):
+    """
+    读取字形索引（两种版本）
+
+    Returns:
+        dict: 码点 -> 字形序号
+    """
+    if data[offset : offset + 4] != b"GIDX":
+        raise ValueError("不是字形索引")
+    version, size, count = struct.unpack_from("<HHI", data, offset + 4)
+    entries = {}
+    if version == INDEX_VERSION_PAGES:
+        pages = struct.unpack_from(f"<{size}H", data, offset + 12)
+        bitmaps = offset + 12 + 4 * size
+        glyph = 0
+        for i, page in enumerate(pages):
+            bitmap = data[bitmaps + i * INDEX_PAGE_BITMAP_SIZE :][:INDEX_PAGE_BITMAP_SIZE]
+            for low in range(256):
+                if bitmap[low >> 3] & (1 << (low & 7)):
+                    entries[page << 8 | low] = glyph
+                    glyph += 1
+    else:
+        blocks = (count + size - 1) // size
+        entries_offset = offset + 12 + 4 * blocks
+        for i in range(count):
+            code, glyph = struct.unpack_from("<IH", data, entries_offset + i * 6)
+            entries[code] = glyph
+    return entries
+
+
+def generate_index(chars_file, output_idx, block_size=INDEX_BLOCK_SIZE):
+    """生成字形索引文件（如 chars.idx）"""
+    with open(chars_file, "r", encoding="utf-8") as f:
+        chars = f.read()
+
+    data = build_index(chars, block_size)
+    with open(output_idx, "wb") as f_out:
+        f_out.write(data)
+
+    count = struct.unpack_from("<I", data, 8)[0]
+    print(f"完成！生成 {output_idx}，共 {count} 个字符")
+
+
+def hlsb_to_vlsb(glyph, width, height):
+    """把 MONO_HLSB 位图转换为 MONO_VLSB（按 page 排列，每字节为一列 8 个像素）"""
+    row_bytes = (width + 7) // 8
+    out = bytearray((height + 7) // 8 * width)
+    for y in range(height):
+        for x in range(width):
+            if glyph[y * row_bytes + x // 8] & (0x80 >> (x % 8)):
+                out[(y // 8) * width + x] |= 1 << (y % 8)
+    return bytes(out)
+
+
+def fallback_glyph(width, height):
+    """替代字符的字形：一个空心方框（MONO_VLSB）"""
+    cell = bytearray((height + 7) // 8 * CELL_WIDTH)
+    for y in range(1, height - 1):
+        for x in range(1, width - 1):
+            if x in (1, width - 2) or y in (1, height - 2):
+                cell[(y // 8) * CELL_WIDTH + x] |= 1 << (y % 8)
+    return bytes(cell)
+
+
+def compress_cells(cells, data_offset, block_size=COMPRESS_BLOCK_SIZE):
+    """
+    按块压缩位图数据
+
+    Returns:
+        bytes: 块位置表（块数 + 1 个 u32 文件位置）+ 各块的 raw deflate 数据
+    """
+    blocks = []
+    for start in range(0, len(cells), block_size):
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -COMPRESS_WBITS)
+        block = b"".join(cells[start : start + block_size])
+        blocks.append(compressor.compress(block) + compressor.flush())
+
+    offset = data_offset + 4 * (len(blocks) + 1)
+    table = bytearray()
+    for block in blocks:
+        table += struct.pack("<I", offset)
+        offset += len(block)
+    table += struct.pack("<I", offset)
+    return bytes(table) + b"".join(blocks)
+
+
+def write_font_v2(
+    output,
+    chars,
+    cells,
+    advances,
+    height,
+    ascii_width,
+    cjk_width,
+    compress=False,
+    index_path=None,
+):
+    """
+    写入 v2 字体文件，字符集中没有替代字符时自动加入
+
+    字形按码点排序（重复的字符只保留第一个），索引按页保存。
+    指定 index_path 时索引写入单独的文件，字符集相同的字体可以共用这个文件。
+
+    Args:
+        output: 输出文件路径
+        chars: 字符集（字形顺序）
+        cells: 每个字符的 16 x height MONO_VLSB 位图
+        advances: 每个字符的步进宽度
+        height: 字形高度
+        ascii_width, cjk_width: 默认步进宽度（字符不存在时使用）
+        compress: 是否按块压缩位图数据
+        index_path: 共用的索引文件路径（None 表示把索引内嵌在字体文件中）
+    """
+    glyphs = {}
+    for char, cell, advance in zip(chars, cells, advances):
+        glyphs.setdefault(char, (cell, advance))
+    if FALLBACK_CHAR not in glyphs:
+        glyphs[FALLBACK_CHAR] = (fallback_glyph(cjk_width, height), cjk_width)
+    chars = sorted(glyphs)
+    cells = [glyphs[char][0] for char in chars]
+    advances = [glyphs[char][1] for char in chars]
+
+    index = build_page_index([ord(char) for char in chars])
+    bytes_per_glyph = (height + 7) // 8 * CELL_WIDTH
+
+    header_size = struct.calcsize(FONT_HEADER)
+    if index_path:
+        with open(index_path, "wb") as f_out:
+            f_out.write(index)
+        print(f"字形索引写入 {index_path}（{len(index)} 字节）")
+        index = b""
+        index_offset = 0
+        widths_offset = header_size
+    else:
+        index_offset = header_size
+        widths_offset = index_offset + len(index)
+    data_offset = widths_offset + len(chars)
+    if compress:
+        data = compress_cells(cells, data_offset)
+        compression, block_size = COMPRESS_DEFLATE, COMPRESS_BLOCK_SIZE
+    else:
+        data = b"".join(cells)
+        compression, block_size = COMPRESS_NONE, 0
+    header = struct.pack(
+        FONT_HEADER,
+        FONT_MAGIC,
+        FONT_VERSION,
+        FORMAT_VLSB,
+        CELL_WIDTH,
+        height,
+        ascii_width,
+        cjk_width,
+        compression,
+        bytes_per_glyph,
+        block_size,
+        len(chars),
+        index_offset,
+        widths_offset,
+        data_offset,
+    )
+
+    with open(output, "wb") as f_out:
+        f_out.write(header)
+        f_out.write(index)
+        f_out.write(bytes(advances))
+        f_out.write(data)
+
+    total = data_offset + len(data)
+    print(f"完成！生成 {output}")
+    print(f"字符数: {len(chars)}, 每字符 {bytes_per_glyph} 字节")
+    if compress:
+        raw = len(chars) * bytes_per_glyph
+        print(f"位图数据: {raw / 1024:.2f} KB -> {len(data) / 1024:.2f} KB")
+    print(f"总大小: {total / 1024:.2f} KB")
+
+
+def generate_font_v2(ttf_path, chars_file, output, size, compress=False, index_path=None):
+    """用 TTF 字体生成 v2 字体文件"""
+    with open(chars_file, "r", encoding="utf-8") as f:
+        chars = f.read()
+
+    glyphs, advances = render_glyphs(ttf_path, chars, size)
+    cells = [hlsb_to_vlsb(glyph, CELL_WIDTH, size) for glyph in glyphs]
+    write_font_v2(output, chars, cells, advances, size, size // 2, size, compress, index_path)
+
+
+def convert_font_bin(
+    bin_path,
+    chars_file,
+    output,
+    height,
+    ascii_width,
+    cjk_width,
+    compress=False,
+    index_path=None,
+):
+    """
+    把 v1 字体文件（无文件头的 16 x height MONO_HLSB 位图）转换为 v2
+
+    v1 中 ASCII 字符的步进宽度为 ascii_width，其他字符为 cjk_width。
+    """
+    with open(chars_file, "r", encoding="utf-8") as f:
+        chars = f.read()
+    with open(bin_path, "rb") as f:
+        data = f.read()
+
+    bytes_per_char = 2 * height
+    if len(data) != len(chars) * bytes_per_char:
+        raise ValueError(f"{bin_path} 的大小与字符集不匹配")
+    glyphs = [data[i * bytes_per_char : (i + 1) * bytes_per_char] for i in range(len(chars))]
+    cells = [hlsb_to_vlsb(glyph, CELL_WIDTH, height) for glyph in glyphs]
+    advances = [ascii_width if ord(char) < 128 else cjk_width for char in chars]
+    write_font_v2(
+        output, chars, cells, advances, height, ascii_width, cjk_width, compress, index_path
+    )
+
+
+def read_font_v2(path, index_path=None):
+    """
+    读取 v2 字体文件（支持压缩的文件）
+
+    Args:
+        path: 字体文件路径
+        index_path: 共用的索引文件路径（字体没有内嵌索引时需要）
+
+    Returns:
+        dict: height、ascii_width、cjk_width 和 glyphs（字符 -> (位图, 步进宽度)）
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    fields = struct.unpack_from(FONT_HEADER, data)
+    magic, version, fmt, _, height, ascii_width, cjk_width, compression = fields[:8]
+    bytes_per_glyph, glyphs_per_block, count = fields[8:11]
+    index_offset, widths_offset, data_offset = fields[11:]
+    if magic != FONT_MAGIC or version != FONT_VERSION or fmt != FORMAT_VLSB:
+        raise ValueError(f"{path} 不是 v2 字体文件")
+
+    if compression == COMPRESS_DEFLATE:
+        cells = bytearray()
+        blocks = (count + glyphs_per_block - 1) // glyphs_per_block
+        for block in range(blocks):
+            start, end = struct.unpack_from("<II", data, data_offset + 4 * block)
+            cells += zlib.decompress(data[start:end], -COMPRESS_WBITS)
+        cells = bytes(cells)
+    elif compression == COMPRESS_NONE:
+        cells = data[data_offset : data_offset + count * bytes_per_glyph]
+    else:
+        raise ValueError(f"{path} 使用了未知的压缩方式 {compression}")
+
+    if index_offset:
+        entries = parse_index(data, index_offset)
+    elif index_path:
+        with open(index_path, "rb") as f:
+            entries = parse_index(f.read())
+    else:
+        raise ValueError(f"{path} 使用共用的字形索引，需要指定索引文件")
+    if len(entries) != count:
+        raise ValueError(f"{path} 与字形索引不匹配")
+    glyphs = {}
+    for code, glyph in entries.items():
+        start = glyph * bytes_per_glyph
+        glyphs[chr(code)] = (cells[start : start + bytes_per_glyph], data[widths_offset + glyph])
+    return {
+        "height": height,
+        "ascii_width": ascii_width,
+        "cjk_width": cjk_width,
+        "glyphs": glyphs,
+    }
+
+
+def subset_font(
+    font_path, chars_file, output, compress=False, index_path=None, input_index_path=None
+):
+    """
+    从 v2 字体文件中取出字符集里的字符，生成更小的 v2 字体文件
+
+    字体中没有的字符会被跳过（设备上显示为替代字符）。
+    """
+    with open(chars_file, "r", encoding="utf-8") as f:
+        chars = f.read()
+    font = read_font_v2(font_path, input_index_path)
+    glyphs = font["glyphs"]
+
+    subset = []
+    missing = []
+    for char in dict.fromkeys(chars):
+        if char in glyphs:
+            subset.append(char)
+        elif char != FALLBACK_CHAR:
+            missing.append(char)
+    if missing:
+        print(f"警告：字体中没有以下字符，将显示为替代字符: {''.join(missing)}")
+
+    write_font_v2(
+        output,
+        subset,
+        [glyphs[char][0] for char in subset],
+        [glyphs[char][1] for char in subset],
+        font["height"],
+        font["ascii_width"],
+        font["cjk_width"],
+        compress,
+        index_path,
+    )
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="生成字体二进制文件")
-    parser.add_argument("ttf_path", help="TrueType 字体文件路径")
+    parser.add_argument(
+        "ttf_path", help="TrueType 字体文件路径（--from-bin/--from-fnt 时为 v1/v2 字体文件路径）"
+    )
     parser.add_argument("chars_file", help="包含字符的文本文件路径")
     parser.add_argument("output_bin", help="输出二进制文件路径")
     parser.add_argument("--size", type=int, default=16, help="字体大小/高度 (默认: 16)")
+    parser.add_argument("--index", help="同时生成字形索引文件（如 chars.idx，仅 v1 需要）")
+    parser.add_argument(
+        "--v2", action="store_true", help="生成 v2 字体文件（带文件头、内嵌索引和步进宽度）"
+    )
+    parser.add_argument(
+        "--from-bin", action="store_true", help="把 v1 字体文件转换为 v2，而不是从 TTF 生成"
+    )
+    parser.add_argument(
+        "--from-fnt",
+        action="store_true",
+        help="从 v2 字体文件中取出字符集中的字符（配合 generate_char_list.py --subset 使用）",
+    )
+    parser.add_argument(
+        "--compress", action="store_true", help="按块压缩 v2 字体的位图数据（设备需要 deflate 模块）"
+    )
+    parser.add_argument(
+        "--shared-index",
+        help="把 v2 字体的字形索引写入单独的文件（如 chars.idx），字符集相同的字体共用",
+    )
+    parser.add_argument(
+        "--input-index", help="--from-fnt 的输入字体使用共用索引时，索引文件的路径"
+    )
 
     args = parser.parse_args()
 
-    generate_font_bin(args.ttf_path, args.chars_file, args.output_bin, args.size)
+    if args.from_fnt:
+        subset_font(
+            args.ttf_path,
+            args.chars_file,
+            args.output_bin,
+            args.compress,
+            args.shared_index,
+            args.input_index,
+        )
+    elif args.from_bin:
+        convert_font_bin(
+            args.ttf_path,
+            args.chars_file,
+            args.output_bin,
+            args.size,
+            args.size // 2,
+            args.size,
+            args.compress,
+            args.shared_index,
+        )
+    elif args.v2:
+        generate_font_v2(
+            args.ttf_path,
+            args.chars_file,
+            args.output_bin,
+            args.size,
+            args.compress,
+            args.shared_index,
+        )
+    else:
+        generate_font_bin(args.ttf_path, args.chars_file, args.output_bin, args.size)
+    if args.index:
+        generate_index(args.chars_file, args.index)
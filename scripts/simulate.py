@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+在电脑上无硬件运行 UI
+
+示例：
+    ./scripts/simulate.py --keys "wait:1000,ok,wait:500,down,down,ok" --png out.png --gif out.gif
+
+按键脚本用逗号分隔，每一步为：
+    KEY          短按（物理按键 k1~k4 或逻辑按键 up/down/back/ok）
+    hold:KEY     长按
+    wait:MS      运行 MS 毫秒
+    png:PATH     保存当前屏幕截图
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sim import Simulator  # noqa: E402
+
+
+def run_script(sim, script):
+    for step in script.split(","):
+        step = step.strip()
+        if not step:
+            continue
+        action, _, arg = step.partition(":")
+        if action == "wait":
+            sim.run_ms(int(arg))
+        elif action == "hold":
+            sim.hold(arg)
+        elif action == "png":
+            sim.save_png(arg)
+        else:
+            sim.press(step)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="无硬件运行 UI")
+    parser.add_argument("--keys", default="", help="按键脚本")
+    parser.add_argument("--ms", type=int, default=1000, help="启动后先运行的时间（毫秒）")
+    parser.add_argument("--png", help="结束时保存截图")
+    parser.add_argument("--gif", help="把整个过程保存为 GIF")
+    parser.add_argument("--scale", type=int, default=4, help="截图放大倍数")
+    parser.add_argument("--realtime", action="store_true", help="按真实时间运行")
+    parser.add_argument("--workdir", help="工作目录（settings.json 所在目录）")
+    args = parser.parse_args()
+
+    sim = Simulator(workdir=args.workdir, realtime=args.realtime)
+    if args.gif:
+        sim.start_recording()
+    sim.run_ms(args.ms)
+    run_script(sim, args.keys)
+
+    if args.png:
+        sim.save_png(args.png, args.scale)
+    if args.gif:
+        sim.save_gif(args.gif, max(1, args.scale // 2))
+    print(json.dumps(sim.get_stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+主机端模拟器
+在 CPython 上无硬件运行 ui_framework 和 ui_app，用于调试、截图和性能测试
+
+    from sim import Simulator
+
+    sim = Simulator()
+    sim.run_ms(1000)
+    sim.press("ok")
+    sim.save_png("menu.png")
+"""
+
+from sim.simulator import Simulator
+
+__all__ = ["Simulator"]
@@ -0,0 +1,72 @@
+"""
+FrameBuffer.text() 使用的 8x8 字体
+
+MicroPython 内置的 petme128 字体没有随仓库提供，这里用 Pillow 自带的位图字体
+逐字符栅格化成 8x8 的列数据（与内置字体相同的格式：每字节一列，bit0 在最上方）。
+字形与设备上不完全相同，但字符宽度一致，布局和传输字节数不受影响。
+没有安装 Pillow 时用空心方框代替。
+"""
+
+_cache = {}
+_font = None
+
+# 没有 Pillow 时的占位字形
+_BOX = (0x00, 0x7E, 0x42, 0x42, 0x42, 0x42, 0x7E, 0x00)
+_BLANK = (0,) * 8
+
+
+def _load_font():
+    global _font
+    if _font is None:
+        try:
+            from PIL import ImageFont
+
+            loader = getattr(ImageFont, "load_default_imagefont", None)
+            _font = loader() if loader else ImageFont.load_default()
+        except ImportError:
+            _font = False
+    return _font
+
+
+def glyph_columns(char):
+    """
+    获取字符的 8 列点阵
+
+    Args:
+        char: 单个字符（非 ASCII 可打印字符按 MicroPython 的规则显示为 0x7F）
+
+    Returns:
+        tuple: 8 个字节，每个字节是一列，bit0 为最上面的像素
+    """
+    columns = _cache.get(char)
+    if columns is not None:
+        return columns
+
+    code = ord(char)
+    if code < 32 or code > 127:
+        code = 127
+    if code == 32:
+        columns = _BLANK
+    else:
+        font = _load_font()
+        if not font:
+            columns = _BOX
+        else:
+            columns = _rasterize(font, chr(code))
+    _cache[char] = columns
+    return columns
+
+
+def _rasterize(font, char):
+    from PIL import Image, ImageDraw
+
+    image = Image.new("1", (8, 12))
+    ImageDraw.Draw(image).text((1, -2), char, font=font, fill=1)
+    columns = []
+    for x in range(8):
+        value = 0
+        for y in range(8):
+            if image.getpixel((x, y)):
+                value |= 1 << y
+        columns.append(value)
+    return tuple(columns)
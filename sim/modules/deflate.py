@@ -0,0 +1,63 @@
+"""
+deflate 模块的 CPython 实现（仅解压）
+"""
+
+import zlib
+
+AUTO = 0
+RAW = 1
+ZLIB = 2
+GZIP = 3
+
+
+class DeflateIO:
+    def __init__(self, stream, format=AUTO, wbits=0, close=False):
+        if format == RAW:
+            zwbits = -(wbits or 8)
+        elif format == GZIP:
+            zwbits = 16 + (wbits or 15)
+        elif format == ZLIB:
+            zwbits = wbits or 15
+        else:
+            zwbits = 32 + 15
+        # zlib 的 raw deflate 窗口最小为 9 位
+        if -9 < zwbits < 0:
+            zwbits = -9
+        self._stream = stream
+        self._close = close
+        self._decoder = zlib.decompressobj(zwbits)
+        self._pending = b""
+
+    def read(self, size=-1):
+        out = self._pending
+        while size < 0 or len(out) < size:
+            if self._decoder.eof:
+                break
+            chunk = self._stream.read(64)
+            if not chunk:
+                out += self._decoder.flush()
+                break
+            out += self._decoder.decompress(chunk)
+        if size < 0:
+            self._pending = b""
+            return out
+        self._pending = out[size:]
+        return out[:size]
+
+    def readinto(self, buf):
+        data = self.read(len(buf))
+        buf[: len(data)] = data
+        return len(data)
+
+    def write(self, data):
+        raise OSError("compression not supported")
+
+    def close(self):
+        if self._close:
+            self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
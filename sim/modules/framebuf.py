@@ -0,0 +1,392 @@
+"""
+framebuf 模块的 CPython 实现
+按 MicroPython modframebuf.c 的像素格式和绘图算法实现，供模拟器使用
+"""
+
+MONO_VLSB = 0
+MVLSB = 0
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+
+# 每个格式每像素的位数
+_BPP = {
+    MONO_VLSB: 1,
+    RGB565: 16,
+    GS4_HMSB: 4,
+    MONO_HLSB: 1,
+    MONO_HMSB: 1,
+    GS2_HMSB: 2,
+    GS8: 8,
+}
+
+
+class FrameBuffer:
+    """帧缓冲区"""
+
+    def __init__(self, buffer, width, height, format, stride=None):
+        """
+        初始化帧缓冲区
+
+        Args:
+            buffer: 可写的缓冲区（bytearray 或 memoryview）
+            width: 宽度（像素）
+            height: 高度（像素）
+            format: 像素格式
+            stride: 每行的像素数，默认等于 width
+        """
+        if format not in _BPP:
+            raise ValueError("invalid format")
+        if stride is None:
+            stride = width
+        # 与 MicroPython 一致，按字节对齐 stride
+        if format in (MONO_HLSB, MONO_HMSB):
+            stride = (stride + 7) & ~7
+        elif format == GS2_HMSB:
+            stride = (stride + 3) & ~3
+        elif format == GS4_HMSB:
+            stride = (stride + 1) & ~1
+
+        if format == MONO_VLSB:
+            size = ((height + 7) >> 3) * stride
+        else:
+            size = (stride * height * _BPP[format] + 7) >> 3
+        if len(buffer) < size:
+            raise ValueError("buffer too small")
+
+        self._buf = buffer
+        self._width = width
+        self._height = height
+        self._format = format
+        self._stride = stride
+
+    # ---- 像素读写 ----
+
+    def _get(self, x, y):
+        buf = self._buf
+        fmt = self._format
+        if fmt == MONO_VLSB:
+            return (buf[(y >> 3) * self._stride + x] >> (y & 7)) & 1
+        if fmt == MONO_HLSB:
+            index = x + y * self._stride
+            return (buf[index >> 3] >> (7 - (index & 7))) & 1
+        if fmt == MONO_HMSB:
+            index = x + y * self._stride
+            return (buf[index >> 3] >> (index & 7)) & 1
+        if fmt == GS8:
+            return buf[x + y * self._stride]
+        if fmt == RGB565:
+            index = (x + y * self._stride) * 2
+            return buf[index] | (buf[index + 1] << 8)
+        if fmt == GS4_HMSB:
+            index = x + y * self._stride
+            value = buf[index >> 1]
+            return (value >> 4) & 0x0F if index & 1 == 0 else value & 0x0F
+        # GS2_HMSB
+        index = x + y * self._stride
+        return (buf[index >> 2] >> ((index & 3) << 1)) & 0x03
+
+    def _set(self, x, y, color):
+        buf = self._buf
+        fmt = self._format
+        if fmt == MONO_VLSB:
+            index = (y >> 3) * self._stride + x
+            mask = 1 << (y & 7)
+        elif fmt == MONO_HLSB:
+            index = x + y * self._stride
+            mask = 0x80 >> (index & 7)
+            index >>= 3
+        elif fmt == MONO_HMSB:
+            index = x + y * self._stride
+            mask = 1 << (index & 7)
+            index >>= 3
+        elif fmt == GS8:
+            buf[x + y * self._stride] = color & 0xFF
+            return
+        elif fmt == RGB565:
+            index = (x + y * self._stride) * 2
+            buf[index] = color & 0xFF
+            buf[index + 1] = (color >> 8) & 0xFF
+            return
+        elif fmt == GS4_HMSB:
+            index = x + y * self._stride
+            value = buf[index >> 1]
+            if index & 1 == 0:
+                buf[index >> 1] = (value & 0x0F) | ((color & 0x0F) << 4)
+            else:
+                buf[index >> 1] = (value & 0xF0) | (color & 0x0F)
+            return
+        else:
+            index = x + y * self._stride
+            shift = (index & 3) << 1
+            value = buf[index >> 2]
+            buf[index >> 2] = (value & ~(0x03 << shift) & 0xFF) | ((color & 0x03) << shift)
+            return
+
+        if color & 1:
+            buf[index] |= mask
+        else:
+            buf[index] &= ~mask & 0xFF
+
+    def _set_checked(self, x, y, color, mask):
+        if mask and 0 <= x < self._width and 0 <= y < self._height:
+            self._set(x, y, color)
+
+    # ---- 绘图 ----
+
+    def fill(self, c):
+        """用颜色填充整个缓冲区"""
+        if self._format == MONO_VLSB:
+            value = 0xFF if c & 1 else 0x00
+            pages = (self._height + 7) >> 3
+            self._buf[: pages * self._stride] = bytes([value]) * (pages * self._stride)
+            return
+        self.fill_rect(0, 0, self._width, self._height, c)
+
+    def pixel(self, x, y, c=None):
+        """读取或设置像素"""
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return None
+        if c is None:
+            return self._get(x, y)
+        self._set(x, y, c)
+        return None
+
+    def fill_rect(self, x, y, w, h, c):
+        """填充矩形"""
+        if (
+            h < 1
+            or w < 1
+            or x + w <= 0
+            or y + h <= 0
+            or y >= self._height
+            or x >= self._width
+        ):
+            return
+        x_end = min(self._width, x + w)
+        y_end = min(self._height, y + h)
+        x = max(x, 0)
+        y = max(y, 0)
+
+        if self._format == MONO_VLSB:
+            buf = self._buf
+            stride = self._stride
+            while y < y_end:
+                page = y >> 3
+                # 本 page 内需要填充的位
+                bottom = min(y_end, (page + 1) << 3)
+                mask = (0xFF << (y & 7)) & (0xFF >> (8 - (bottom - (page << 3))))
+                base = page * stride
+                if c & 1:
+                    for i in range(base + x, base + x_end):
+                        buf[i] |= mask
+                else:
+                    inverse = ~mask & 0xFF
+                    for i in range(base + x, base + x_end):
+                        buf[i] &= inverse
+                y = bottom
+            return
+
+        for yy in range(y, y_end):
+            for xx in range(x, x_end):
+                self._set(xx, yy, c)
+
+    def hline(self, x, y, w, c):
+        """画水平线"""
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        """画垂直线"""
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        """画矩形（f 为 True 时填充）"""
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.fill_rect(x, y, w, 1, c)
+        self.fill_rect(x, y + h - 1, w, 1, c)
+        self.fill_rect(x, y, 1, h, c)
+        self.fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        """画直线（Bresenham 算法）"""
+        dx = x2 - x1
+        if dx > 0:
+            sx = 1
+        else:
+            dx = -dx
+            sx = -1
+        dy = y2 - y1
+        if dy > 0:
+            sy = 1
+        else:
+            dy = -dy
+            sy = -1
+
+        steep = dy > dx
+        if steep:
+            x1, y1 = y1, x1
+            dx, dy = dy, dx
+            sx, sy = sy, sx
+
+        e = 2 * dy - dx
+        for _ in range(dx):
+            if steep:
+                self._set_checked(y1, x1, c, True)
+            else:
+                self._set_checked(x1, y1, c, True)
+            while e >= 0:
+                y1 += sy
+                e -= 2 * dx
+            x1 += sx
+            e += 2 * dy
+        self._set_checked(x2, y2, c, True)
+
+    def _ellipse_points(self, cx, cy, x, y, c, mask):
+        if mask & 0x10:
+            if mask & 0x01:
+                self.fill_rect(cx, cy - y, x + 1, 1, c)
+            if mask & 0x02:
+                self.fill_rect(cx - x, cy - y, x + 1, 1, c)
+            if mask & 0x04:
+                self.fill_rect(cx - x, cy + y, x + 1, 1, c)
+            if mask & 0x08:
+                self.fill_rect(cx, cy + y, x + 1, 1, c)
+        else:
+            self._set_checked(cx + x, cy - y, c, mask & 0x01)
+            self._set_checked(cx - x, cy - y, c, mask & 0x02)
+            self._set_checked(cx - x, cy + y, c, mask & 0x04)
+            self._set_checked(cx + x, cy + y, c, mask & 0x08)
+
+    def ellipse(self, x, y, xr, yr, c, f=False, m=0x0F):
+        """画椭圆（f 填充，m 为象限掩码）"""
+        mask = (0x10 if f else 0) | (m & 0x0F)
+        if xr == 0 and yr == 0:
+            if mask & 0x0F:
+                self._set_checked(x, y, c, True)
+            return
+
+        two_asquare = 2 * xr * xr
+        two_bsquare = 2 * yr * yr
+        px = xr
+        py = 0
+        xchange = yr * yr * (1 - 2 * xr)
+        ychange = xr * xr
+        error = 0
+        stopping_x = two_bsquare * xr
+        stopping_y = 0
+        while stopping_x >= stopping_y:
+            self._ellipse_points(x, y, px, py, c, mask)
+            py += 1
+            stopping_y += two_asquare
+            error += ychange
+            ychange += two_asquare
+            if 2 * error + xchange > 0:
+                px -= 1
+                stopping_x -= two_bsquare
+                error += xchange
+                xchange += two_bsquare
+
+        px = 0
+        py = yr
+        xchange = yr * yr
+        ychange = xr * xr * (1 - 2 * yr)
+        error = 0
+        stopping_x = 0
+        stopping_y = two_asquare * yr
+        while stopping_x <= stopping_y:
+            self._ellipse_points(x, y, px, py, c, mask)
+            px += 1
+            stopping_x += two_bsquare
+            error += xchange
+            xchange += two_bsquare
+            if 2 * error + ychange > 0:
+                py -= 1
+                stopping_y -= two_asquare
+                error += ychange
+                ychange += two_asquare
+
+    def text(self, s, x, y, c=1):
+        """用 8x8 字体写字符串"""
+        from sim.font8x8 import glyph_columns
+
+        for char in s:
+            columns = glyph_columns(char)
+            for column in columns:
+                if 0 <= x < self._width:
+                    yy = y
+                    while column:
+                        if column & 1 and 0 <= yy < self._height:
+                            self._set(x, yy, c)
+                        column >>= 1
+                        yy += 1
+                x += 1
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        """把另一个帧缓冲区绘制到 (x, y)，颜色等于 key 的像素视为透明"""
+        if isinstance(fbuf, tuple):
+            fbuf = FrameBuffer(*fbuf)
+        if (
+            x >= self._width
+            or y >= self._height
+            or -x >= fbuf._width
+            or -y >= fbuf._height
+        ):
+            return
+
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = max(0, -x)
+        y1 = max(0, -y)
+        x0_end = min(self._width, x + fbuf._width)
+        y0_end = min(self._height, y + fbuf._height)
+
+        sy = y1
+        for dy in range(y0, y0_end):
+            sx = x1
+            for dx in range(x0, x0_end):
+                color = fbuf._get(sx, sy)
+                if palette is not None:
+                    color = palette._get(color, 0)
+                if color != key:
+                    self._set(dx, dy, color)
+                sx += 1
+            sy += 1
+
+    def scroll(self, xstep, ystep):
+        """滚动缓冲区内容（移出的部分保持不变）"""
+        if xstep < 0:
+            sx = 0
+            x_end = self._width + xstep
+            if x_end <= 0:
+                return
+            dx = 1
+        else:
+            sx = self._width - 1
+            x_end = xstep - 1
+            if x_end >= sx:
+                return
+            dx = -1
+        if ystep < 0:
+            y = 0
+            y_end = self._height + ystep
+            if y_end <= 0:
+                return
+            dy = 1
+        else:
+            y = self._height - 1
+            y_end = ystep - 1
+            if y_end >= y:
+                return
+            dy = -1
+
+        while y != y_end:
+            x = sx
+            while x != x_end:
+                self._set(x, y, self._get(x - xstep, y - ystep))
+                x += dx
+            y += dy
@@ -0,0 +1,215 @@
+"""
+machine 模块的 CPython 实现
+Pin 的电平由模拟器脚本控制，I2C 统计传输字节数并把数据转发给挂载的模拟设备
+"""
+
+import time
+
+# lightsleep / deepsleep 唤醒源（Pin.irq 的 wake 参数）
+SLEEP = 2
+DEEPSLEEP = 4
+
+
+class Pin:
+    """GPIO 引脚（所有同号引脚共享电平）"""
+
+    IN = 1
+    OUT = 3
+    OPEN_DRAIN = 7
+    PULL_UP = 2
+    PULL_DOWN = 1
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
+
+    # 引脚号 -> 电平（未设置的输入引脚按上拉处理为 1）
+    levels = {}
+    # 引脚号 -> (handler, trigger, Pin)
+    irqs = {}
+
+    def __init__(self, id, mode=-1, pull=-1, value=None, **kwargs):
+        """
+        初始化引脚
+
+        Args:
+            id: 引脚号
+            mode: 模式
+            pull: 上拉/下拉
+            value: 输出模式的初始电平
+        """
+        self.id = id
+        self.init(mode, pull, value)
+
+    def init(self, mode=-1, pull=-1, value=None, **kwargs):
+        if mode != -1:
+            self.mode = mode
+        if pull != -1:
+            self.pull = pull
+        if value is not None:
+            Pin.set_level(self.id, value)
+        elif self.id not in Pin.levels:
+            Pin.levels[self.id] = 0 if pull == Pin.PULL_DOWN else 1
+
+    def value(self, x=None):
+        if x is None:
+            return Pin.levels.get(self.id, 1)
+        Pin.set_level(self.id, x)
+        return None
+
+    def __call__(self, x=None):
+        return self.value(x)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, **kwargs):
+        """注册电平变化回调"""
+        if handler is None:
+            Pin.irqs.pop(self.id, None)
+        else:
+            Pin.irqs[self.id] = (handler, trigger, self)
+        return None
+
+    @classmethod
+    def set_level(cls, id, level):
+        """
+        设置引脚电平（模拟器脚本用来模拟按键），电平变化时触发 irq 回调
+
+        Args:
+            id: 引脚号
+            level: 0 或 1
+        """
+        level = 1 if level else 0
+        old = cls.levels.get(id, 1)
+        cls.levels[id] = level
+        if old == level:
+            return
+        entry = cls.irqs.get(id)
+        if entry is None:
+            return
+        handler, trigger, pin = entry
+        if (level and trigger & cls.IRQ_RISING) or (not level and trigger & cls.IRQ_FALLING):
+            handler(pin)
+
+
+class I2C:
+    """I2C 总线（统计传输字节数，把数据交给挂载的模拟设备）"""
+
+    def __init__(self, id=0, *, scl=None, sda=None, freq=400000, **kwargs):
+        self.id = id
+        self.freq = freq
+        self.devices = {}
+        self.bytes_written = 0
+        self.transactions = 0
+
+    def attach(self, addr, device):
+        """
+        挂载模拟设备
+
+        Args:
+            addr: 设备地址
+            device: 实现 write(data) 的对象
+        """
+        self.devices[addr] = device
+
+    def scan(self):
+        return sorted(self.devices)
+
+    def reset_stats(self):
+        """清空传输统计"""
+        self.bytes_written = 0
+        self.transactions = 0
+
+    def writeto(self, addr, buf, stop=True):
+        self.bytes_written += len(buf)
+        self.transactions += 1
+        device = self.devices.get(addr)
+        if device is not None:
+            device.write(bytes(buf))
+        return len(buf)
+
+    def writevto(self, addr, vector, stop=True):
+        data = b"".join(bytes(buf) for buf in vector)
+        self.bytes_written += len(data)
+        self.transactions += 1
+        device = self.devices.get(addr)
+        if device is not None:
+            device.write(data)
+        return len(vector)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        return bytes(nbytes)
+
+    def readfrom_into(self, addr, buf, stop=True):
+        pass
+
+
+SoftI2C = I2C
+
+
+class RTC:
+    """实时时钟（读取主机时间，设置时记录偏移）"""
+
+    offset = 0
+
+    def __init__(self, id=0):
+        pass
+
+    def datetime(self, datetimetuple=None):
+        """
+        读取或设置时间
+
+        Args:
+            datetimetuple: (年, 月, 日, 星期, 时, 分, 秒, 亚秒)
+
+        Returns:
+            tuple: 同上格式（读取时）
+        """
+        if datetimetuple is not None:
+            year, month, day, _, hour, minute, second = datetimetuple[:7]
+            RTC.offset = time.mktime((year, month, day, hour, minute, second, 0, 0)) - time.time()
+            return None
+        t = time.gmtime(time.time() + RTC.offset)
+        return (t[0], t[1], t[2], t[6], t[3], t[4], t[5], 0)
+
+    def init(self, datetimetuple):
+        self.datetime(datetimetuple)
+
+
+def lightsleep(time_ms=None):
+    if time_ms is not None:
+        time.sleep_ms(time_ms)
+
+
+def deepsleep(time_ms=None):
+    raise SystemExit("deepsleep")
+
+
+def idle():
+    pass
+
+
+def reset():
+    raise SystemExit("machine.reset()")
+
+
+def soft_reset():
+    raise SystemExit("machine.soft_reset()")
+
+
+def freq(hz=None):
+    return 240_000_000
+
+
+def unique_id():
+    return b"\x00\x00\x00\x00\x00\x00"
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state=0):
+    pass
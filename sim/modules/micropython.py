@@ -0,0 +1,45 @@
+"""
+micropython 模块的 CPython 实现
+代码发射器装饰器直接返回原函数；viper 的类型（ptr8 等）不存在，使用它们的代码会退回纯 Python 实现
+"""
+
+
+def const(value):
+    return value
+
+
+def native(func):
+    return func
+
+
+def viper(func):
+    return func
+
+
+def schedule(func, arg):
+    # 模拟器没有中断上下文，直接调用
+    func(arg)
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+def opt_level(level=None):
+    return 0
+
+
+def mem_info(verbose=False):
+    pass
+
+
+def qstr_info(verbose=False):
+    pass
+
+
+def heap_lock():
+    return 0
+
+
+def heap_unlock():
+    return 0
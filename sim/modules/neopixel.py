@@ -0,0 +1,29 @@
+"""
+neopixel 模块的 CPython 实现（只记录颜色，不输出）
+"""
+
+
+class NeoPixel:
+    """WS2812 灯带"""
+
+    def __init__(self, pin, n, bpp=3, timing=1):
+        self.pin = pin
+        self.n = n
+        self.bpp = bpp
+        self.pixels = [(0,) * bpp] * n
+        self.writes = 0
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, index):
+        return self.pixels[index]
+
+    def __setitem__(self, index, value):
+        self.pixels[index] = tuple(value)
+
+    def fill(self, value):
+        self.pixels = [tuple(value)] * self.n
+
+    def write(self):
+        self.writes += 1
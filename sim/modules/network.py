@@ -0,0 +1,66 @@
+"""
+network 模块的 CPython 实现
+WLAN 始终处于未连接状态，扫描结果可由模拟器脚本设置
+"""
+
+STA_IF = 0
+AP_IF = 1
+
+# 与 ESP32 固件相同的状态码
+STAT_IDLE = 1000
+STAT_CONNECTING = 1001
+STAT_GOT_IP = 1010
+STAT_BEACON_TIMEOUT = 200
+STAT_NO_AP_FOUND = 201
+STAT_WRONG_PASSWORD = 202
+STAT_ASSOC_FAIL = 203
+STAT_CONNECT_FAIL = 203
+STAT_HANDSHAKE_TIMEOUT = 204
+STAT_NO_AP_FOUND_W_COMPATIBLE_SECURITY = 210
+STAT_NO_AP_FOUND_IN_AUTHMODE_THRESHOLD = 211
+STAT_NO_AP_FOUND_IN_RSSI_THRESHOLD = 212
+
+
+class WLAN:
+    """无线网络接口"""
+
+    # 扫描结果：[(ssid, bssid, channel, rssi, security, hidden), ...]
+    scan_results = []
+
+    def __init__(self, interface_id=STA_IF):
+        self.interface_id = interface_id
+        self._active = False
+        self._status = STAT_IDLE
+        self._config = {"ssid": "", "mac": b"\x00" * 6}
+
+    def active(self, is_active=None):
+        if is_active is None:
+            return self._active
+        self._active = bool(is_active)
+        return None
+
+    def scan(self):
+        return list(WLAN.scan_results)
+
+    def connect(self, ssid=None, key=None, **kwargs):
+        self._status = STAT_NO_AP_FOUND
+
+    def disconnect(self):
+        self._status = STAT_IDLE
+
+    def status(self, param=None):
+        if param == "rssi":
+            return 0
+        return self._status
+
+    def isconnected(self):
+        return self._status == STAT_GOT_IP
+
+    def ifconfig(self, config=None):
+        return ("0.0.0.0", "0.0.0.0", "0.0.0.0", "0.0.0.0")
+
+    def config(self, *args, **kwargs):
+        if args:
+            return self._config.get(args[0])
+        self._config.update(kwargs)
+        return None
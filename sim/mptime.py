@@ -0,0 +1,112 @@
+"""
+MicroPython 风格的 time 模块
+提供 ticks_ms/ticks_us/ticks_diff/sleep_ms 等接口，其余属性转发给 CPython 的 time
+
+模拟时钟 = 主机的单调时钟 + 被跳过的休眠时间：
+- 非实时模式下 sleep 不真正等待，只把时钟向前拨，帧率控制和空闲等待都不耗费主机时间，
+  但 ticks_us 仍能测出代码的实际执行耗时
+- 实时模式下 sleep 真正等待，适合人工观察
+"""
+
+import calendar
+import time as _time
+
+# 与 MicroPython 相同，ticks 值在 2^30 处回绕
+TICKS_PERIOD = 1 << 30
+TICKS_MAX = TICKS_PERIOD - 1
+TICKS_HALFPERIOD = TICKS_PERIOD >> 1
+
+
+class Clock:
+    """模拟时钟"""
+
+    def __init__(self, realtime=False):
+        """
+        初始化时钟
+
+        Args:
+            realtime: 是否真正执行休眠
+        """
+        self.realtime = realtime
+        self.start_ns = _time.monotonic_ns()
+        self.skipped_ns = 0
+
+    def now_ns(self):
+        """时钟启动以来经过的纳秒数"""
+        return _time.monotonic_ns() - self.start_ns + self.skipped_ns
+
+    def sleep_ns(self, ns):
+        """休眠（非实时模式下只拨动时钟）"""
+        if ns <= 0:
+            return
+        if self.realtime:
+            _time.sleep(ns / 1_000_000_000)
+        else:
+            self.skipped_ns += ns
+
+    def advance_ms(self, ms):
+        """把时钟向前拨 ms 毫秒（两种模式下都不等待）"""
+        self.skipped_ns += ms * 1_000_000
+
+
+clock = Clock()
+
+
+def ticks_ms():
+    return (clock.now_ns() // 1_000_000) & TICKS_MAX
+
+
+def ticks_us():
+    return (clock.now_ns() // 1_000) & TICKS_MAX
+
+
+def ticks_cpu():
+    return ticks_us()
+
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) & TICKS_MAX
+
+
+def ticks_diff(ticks1, ticks2):
+    return ((ticks1 - ticks2 + TICKS_HALFPERIOD) & TICKS_MAX) - TICKS_HALFPERIOD
+
+
+def sleep(seconds):
+    clock.sleep_ns(int(seconds * 1_000_000_000))
+
+
+def sleep_ms(ms):
+    clock.sleep_ns(ms * 1_000_000)
+
+
+def sleep_us(us):
+    clock.sleep_ns(us * 1_000)
+
+
+def time():
+    return int(_time.time() + clock.skipped_ns // 1_000_000_000)
+
+
+def time_ns():
+    return _time.time_ns() + clock.skipped_ns
+
+
+def gmtime(secs=None):
+    """返回 MicroPython 格式的 8 元组 (年, 月, 日, 时, 分, 秒, 星期, 年内第几天)"""
+    if secs is None:
+        secs = time()
+    return tuple(_time.gmtime(secs))[:8]
+
+
+localtime = gmtime
+
+
+def mktime(t):
+    """gmtime 的逆运算（设备上没有时区，本地时间即 UTC）"""
+    return calendar.timegm(tuple(t[:6]) + (0, 0, 0))
+
+
+def __getattr__(name):
+    # 其余属性（perf_counter、strftime 等）使用 CPython 的实现
+    return getattr(_time, name)
@@ -0,0 +1,158 @@
+"""
+SSD1306 控制器模型
+解析 I2C 上收到的命令和数据，维护控制器显存（GDDRAM），
+截图得到的是真正传输到屏幕的内容，可用来检查局部刷新是否漏传
+"""
+
+# 带参数的命令及参数个数
+_ARG_COUNT = {
+    0x20: 1,  # SET_MEM_ADDR
+    0x21: 2,  # SET_COL_ADDR
+    0x22: 2,  # SET_PAGE_ADDR
+    0x81: 1,  # SET_CONTRAST
+    0x8D: 1,  # SET_CHARGE_PUMP
+    0xA8: 1,  # SET_MUX_RATIO
+    0xAD: 1,  # SET_IREF_SELECT
+    0xD3: 1,  # SET_DISP_OFFSET
+    0xD5: 1,  # SET_DISP_CLK_DIV
+    0xD9: 1,  # SET_PRECHARGE
+    0xDA: 1,  # SET_COM_PIN_CFG
+    0xDB: 1,  # SET_VCOM_DESEL
+}
+
+
+class SSD1306Panel:
+    """SSD1306 控制器（水平寻址模式）"""
+
+    COLUMNS = 128
+
+    def __init__(self, width=128, height=64):
+        """
+        初始化控制器
+
+        Args:
+            width: 屏幕宽度（窄屏使用居中的列）
+            height: 屏幕高度
+        """
+        self.width = width
+        self.height = height
+        self.pages = height // 8
+        self.col_offset = (self.COLUMNS - width) // 2 if width != self.COLUMNS else 0
+        self.ram = bytearray(self.COLUMNS * self.pages)
+
+        self.display_on = False
+        self.inverted = False
+        self.contrast = 0x7F
+        self.col_start = 0
+        self.col_end = self.COLUMNS - 1
+        self.page_start = 0
+        self.page_end = self.pages - 1
+        self.col = 0
+        self.page = 0
+
+        self._command = None
+        self._args = []
+
+        # 统计
+        self.data_bytes = 0
+        self.command_bytes = 0
+
+    def write(self, data):
+        """
+        接收一次 I2C 写入
+
+        Args:
+            data: 控制字节加上命令或数据
+        """
+        index = 0
+        length = len(data)
+        while index < length:
+            control = data[index]
+            index += 1
+            if control & 0x40:
+                # D/C# = 1：之后的字节都是显存数据
+                self._write_ram(data[index:])
+                return
+            if control & 0x80:
+                # Co = 1：只跟一个命令字节，之后还是控制字节
+                if index < length:
+                    self._command_byte(data[index])
+                    index += 1
+                continue
+            # Co = 0：之后的字节都是命令
+            for value in data[index:]:
+                self._command_byte(value)
+            return
+
+    def _command_byte(self, value):
+        self.command_bytes += 1
+        if self._command is None:
+            count = _ARG_COUNT.get(value, 0)
+            if count:
+                self._command = value
+                self._args = []
+            else:
+                self._simple_command(value)
+            return
+
+        self._args.append(value)
+        if len(self._args) < _ARG_COUNT[self._command]:
+            return
+        command = self._command
+        args = self._args
+        self._command = None
+        if command == 0x21:
+            self.col_start = args[0] & 0x7F
+            self.col_end = args[1] & 0x7F
+            self.col = self.col_start
+        elif command == 0x22:
+            self.page_start = args[0] & 0x07
+            self.page_end = args[1] & 0x07
+            self.page = self.page_start
+        elif command == 0x81:
+            self.contrast = args[0]
+
+    def _simple_command(self, value):
+        if value == 0xAE:
+            self.display_on = False
+        elif value == 0xAF:
+            self.display_on = True
+        elif value == 0xA6:
+            self.inverted = False
+        elif value == 0xA7:
+            self.inverted = True
+
+    def _write_ram(self, data):
+        self.data_bytes += len(data)
+        ram = self.ram
+        for value in data:
+            if self.page < self.pages:
+                ram[self.page * self.COLUMNS + self.col] = value
+            # 水平寻址：列到达窗口末尾后换到下一 page，page 到达末尾后回到窗口开头
+            if self.col >= self.col_end:
+                self.col = self.col_start
+                self.page = self.page_start if self.page >= self.page_end else self.page + 1
+            else:
+                self.col += 1
+
+    def pixel(self, x, y):
+        """读取屏幕上 (x, y) 的像素（考虑反色和显示开关）"""
+        value = (self.ram[(y >> 3) * self.COLUMNS + x + self.col_offset] >> (y & 7)) & 1
+        if not self.display_on:
+            return 0
+        return value ^ 1 if self.inverted else value
+
+    def frame(self):
+        """
+        获取当前屏幕内容
+
+        Returns:
+            bytes: MONO_VLSB 格式，width * pages 字节
+        """
+        if self.col_offset == 0 and self.width == self.COLUMNS:
+            return bytes(self.ram)
+        result = bytearray()
+        for page in range(self.pages):
+            start = page * self.COLUMNS + self.col_offset
+            result += self.ram[start : start + self.width]
+        return bytes(result)
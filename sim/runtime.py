@@ -0,0 +1,56 @@
+"""
+模拟器运行环境
+把 MicroPython 专有模块替换为 sim/modules 中的实现，并把 src 加入模块搜索路径
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+ASSETS = os.path.join(SRC, "assets")
+MODULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "modules")
+
+_installed = False
+
+
+def install(workdir=None, realtime=False):
+    """
+    安装模拟环境（可重复调用）
+
+    Args:
+        workdir: 工作目录（settings.json 等运行时文件写在这里），None 表示不切换
+        realtime: 休眠是否真正等待
+
+    Returns:
+        Clock: 模拟时钟
+    """
+    global _installed
+    if not _installed:
+        # src/datetime.py 会遮蔽标准库的 datetime，先导入依赖它的标准库模块
+        import calendar  # noqa: F401
+
+        try:
+            import PIL.GifImagePlugin  # noqa: F401
+            import PIL.Image  # noqa: F401
+            import PIL.ImageDraw  # noqa: F401
+            import PIL.ImageFont  # noqa: F401
+            import PIL.PngImagePlugin  # noqa: F401
+        except ImportError:
+            pass
+
+        from sim import mptime
+
+        # 之后导入的模块使用 MicroPython 风格的 time
+        sys.modules["time"] = mptime
+        sys.modules["utime"] = mptime
+        sys.path.insert(0, MODULES)
+        sys.path.insert(1, SRC)
+        _installed = True
+
+    from sim import mptime
+
+    mptime.clock.realtime = realtime
+    if workdir is not None:
+        os.chdir(workdir)
+    return mptime.clock
@@ -0,0 +1,277 @@
+"""
+无硬件模拟器
+在 CPython 上按 main.py 的方式启动 UI，支持脚本化按键、逐帧统计总线字节数和截图
+"""
+
+import tempfile
+
+from sim import runtime
+from sim.panel import SSD1306Panel
+
+# 与 main.py 相同的按键配置：(物理按键, 引脚, 逻辑按键)
+DEFAULT_BUTTONS = (
+    ("k1", 4, "up"),
+    ("k2", 5, "down"),
+    ("k3", 6, "back"),
+    ("k4", 7, "ok"),
+)
+
+
+class Simulator:
+    """UI 模拟器"""
+
+    def __init__(
+        self,
+        width=128,
+        height=64,
+        workdir=None,
+        realtime=False,
+        fps=60,
+        transition="push_left",
+        load_fonts=True,
+        create_ui=True,
+    ):
+        """
+        初始化模拟器
+
+        Args:
+            width, height: 屏幕尺寸
+            workdir: 工作目录（settings.json 写在这里），None 表示使用临时目录
+            realtime: 休眠是否真正等待（False 时模拟时钟直接跳过休眠）
+            fps: 目标帧率
+            transition: 默认页面过渡动画
+            load_fonts: 是否加载 src/assets 中的字体
+            create_ui: 是否调用 ui_app.pages.create_ui 创建应用页面
+        """
+        if workdir is None:
+            workdir = tempfile.mkdtemp(prefix="zty-sim-")
+        self.clock = runtime.install(workdir, realtime)
+
+        import ssd1306
+        from machine import I2C, RTC
+        from ntp import Ntp
+        from ui_framework.framework import UIFramework
+
+        self.panel = SSD1306Panel(width, height)
+        self.i2c = I2C(0)
+        self.i2c.attach(0x3C, self.panel)
+        self.display = ssd1306.SSD1306_I2C(width, height, self.i2c)
+
+        if load_fonts:
+            from ui_framework.components.fusion_text import FusionText
+            from ui_framework.components.unifont_text import UnifontText
+
+            index_path = runtime.ASSETS + "/chars.idx"
+            UnifontText.init_unifont(runtime.ASSETS + "/unifont.fnt", index_path=index_path)
+            FusionText.init_fusion(runtime.ASSETS + "/fusion.fnt", index_path=index_path)
+        Ntp.set_datetime_callback(RTC().datetime)
+
+        self.ui = UIFramework(self.display)
+        for physical, pin, logical in DEFAULT_BUTTONS:
+            self.ui.register_button(physical, pin)
+            self.ui.set_key_mapping(physical, logical)
+        if transition:
+            self.ui.set_default_transition(transition)
+        if create_ui:
+            from ui_app.pages import create_ui as create_app_ui
+
+            create_app_ui(self.ui)
+        self.ui.fps = fps
+
+        # 每次 step 的记录：(时间 ms, 总线字节数)
+        self.steps = []
+        self.recording = False
+        self.recorded = []  # [(时间 ms, 帧内容), ...]
+        self.i2c.reset_stats()
+
+    # ---- 时间 ----
+
+    def now_ms(self):
+        """模拟时钟的当前时间（毫秒，不回绕）"""
+        return self.clock.now_ns() // 1_000_000
+
+    def step(self, max_wait_ms=1):
+        """
+        运行主循环的一次迭代（与 UIFramework.run 相同）
+
+        设备上按键会在 idle_poll_ms 内结束空闲等待，因此脚本回放时空闲等待不超过下一个脚本时间点。
+
+        Args:
+            max_wait_ms: 空闲等待的最长时间（毫秒）
+
+        Returns:
+            int: 本次迭代通过总线传输的字节数
+        """
+        before = self.i2c.bytes_written
+        self.ui.step(max_wait_ms)
+        sent = self.i2c.bytes_written - before
+        now = self.now_ms()
+        self.steps.append((now, sent))
+        if self.recording:
+            self.recorded.append((now, self.panel.frame()))
+        return sent
+
+    def run_frames(self, count):
+        """运行 count 次主循环迭代"""
+        for _ in range(count):
+            self.step()
+
+    def run_ms(self, ms):
+        """运行主循环直到模拟时钟前进 ms 毫秒"""
+        deadline = self.now_ms() + ms
+        while self.now_ms() < deadline:
+            self.step(max(1, deadline - self.now_ms()))
+
+    # ---- 输入 ----
+
+    def _pin_for(self, key):
+        """把物理按键名或逻辑按键名转换为引脚号"""
+        buttons = self.ui.input_manager.buttons
+        if key in buttons:
+            return buttons[key]["pin"].id
+        for name, button in buttons.items():
+            if self.ui.key_mapper.map_key(name) == key:
+                return button["pin"].id
+        raise ValueError("unknown key: {}".format(key))
+
+    def key_down(self, key):
+        """按下按键（物理按键名如 "k1"，或逻辑按键名如 "ok"）"""
+        from machine import Pin
+
+        Pin.set_level(self._pin_for(key), 0)
+
+    def key_up(self, key):
+        """松开按键"""
+        from machine import Pin
+
+        Pin.set_level(self._pin_for(key), 1)
+
+    def press(self, key, hold_ms=60):
+        """
+        短按一次按键
+
+        Args:
+            key: 按键名
+            hold_ms: 按住的时间（毫秒）
+        """
+        self.key_down(key)
+        self.step()
+        self.run_ms(hold_ms)
+        self.key_up(key)
+        self.step()
+
+    def hold(self, key, hold_ms=800):
+        """长按一次按键"""
+        self.press(key, hold_ms)
+
+    # ---- 截图 ----
+
+    def frame(self):
+        """
+        获取屏幕当前内容（控制器显存，即真正传输到屏幕的内容）
+
+        Returns:
+            bytes: MONO_VLSB 格式
+        """
+        return self.panel.frame()
+
+    def image(self, scale=4, frame=None):
+        """
+        把屏幕内容转换为 Pillow 图像
+
+        Args:
+            scale: 放大倍数
+            frame: 帧内容，None 表示当前屏幕
+
+        Returns:
+            PIL.Image.Image: 灰度图像
+        """
+        from PIL import Image
+
+        if frame is None:
+            frame = self.panel.frame()
+        width = self.panel.width
+        height = self.panel.height
+        pixels = bytearray(width * height)
+        for y in range(height):
+            row = (y >> 3) * width
+            bit = y & 7
+            offset = y * width
+            for x in range(width):
+                if (frame[row + x] >> bit) & 1:
+                    pixels[offset + x] = 0xFF
+        if self.panel.inverted:
+            pixels = bytearray(0xFF - value for value in pixels)
+        if not self.panel.display_on:
+            pixels = bytearray(width * height)
+        image = Image.frombytes("L", (width, height), bytes(pixels))
+        if scale != 1:
+            image = image.resize((width * scale, height * scale), Image.NEAREST)
+        return image
+
+    def save_png(self, path, scale=4):
+        """保存当前屏幕为 PNG"""
+        self.image(scale).save(path, "PNG")
+
+    def start_recording(self):
+        """开始逐帧记录屏幕内容"""
+        self.recording = True
+        self.recorded = [(self.now_ms(), self.panel.frame())]
+
+    def stop_recording(self):
+        """停止记录"""
+        self.recording = False
+
+    def save_gif(self, path, scale=2):
+        """
+        把记录的帧保存为 GIF（内容相同的连续帧合并，帧间隔取模拟时钟时间）
+
+        Args:
+            path: 文件路径
+            scale: 放大倍数
+        """
+        if not self.recorded:
+            raise ValueError("no frames recorded")
+        frames = []
+        durations = []
+        last = None
+        for index, (timestamp, frame) in enumerate(self.recorded):
+            if index + 1 < len(self.recorded):
+                duration = self.recorded[index + 1][0] - timestamp
+            else:
+                duration = 100
+            if frame == last:
+                durations[-1] += duration
+                continue
+            frames.append(self.image(scale, frame))
+            durations.append(duration)
+            last = frame
+        # GIF 的帧间隔最小单位为 10ms
+        durations = [max(20, duration) for duration in durations]
+        frames[0].save(
+            path,
+            "GIF",
+            save_all=True,
+            append_images=frames[1:],
+            duration=durations,
+            loop=0,
+        )
+
+    # ---- 统计 ----
+
+    def get_stats(self):
+        """
+        获取运行统计
+
+        Returns:
+            dict: steps（迭代次数）、bus_bytes（总线总字节数）、
+                  elapsed_ms（模拟时间）、以及 PageManager/FrameScheduler 的统计
+        """
+        stats = {
+            "steps": len(self.steps),
+            "bus_bytes": self.i2c.bytes_written,
+            "elapsed_ms": self.steps[-1][0] - self.steps[0][0] if self.steps else 0,
+        }
+        stats["transfer"] = self.ui.page_manager.get_stats()
+        stats["scheduler"] = self.ui.get_frame_stats()
+        return stats
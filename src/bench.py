@@ -0,0 +1,380 @@
+"""
+UI 性能测试
+按场景回放注入的按键事件，统计帧数、每帧耗时、写入屏幕的字节数和内存分配，
+在字符输入组件中输入文本时还统计每输入一个字符需要的按键次数
+
+设备和模拟器使用同一套场景文件（bench/scenarios/*.json），由 scripts/bench.py 调用。
+"""
+
+import gc
+import json
+import random
+import sys
+import time
+
+
+class Bench:
+    """性能测试器"""
+
+    def __init__(self, ui, mem_alloc=None):
+        """
+        初始化性能测试器
+
+        Args:
+            ui: UIFramework 实例
+            mem_alloc: 返回已分配堆内存字节数的函数，None 时使用 gc.mem_alloc（CPython 上没有）
+        """
+        self.ui = ui
+        if mem_alloc is None:
+            mem_alloc = getattr(gc, "mem_alloc", None)
+        self.mem_alloc = mem_alloc
+
+        # 统计写入屏幕的字节数和每帧耗时
+        display = ui.display
+        self._write_data = display.write_data
+        display.write_data = self._count_write_data
+        self._run_once = ui.run_once
+        ui.run_once = self._measure_frame
+
+        self.reset()
+
+    def reset(self):
+        """清空统计数据"""
+        self.frames = 0
+        self.frame_us = 0
+        self.max_frame_us = 0
+        self.late_frames = 0
+        self.bus_bytes = 0
+        self.alloc_bytes = 0
+        self.gc_frames = 0
+        self.presses = 0  # 注入的按键操作数（短按、长按和组合键各算一次）
+        self.typed = 0  # 通过 "type" 步骤输入的字符数
+
+    def _count_write_data(self, buf):
+        self.bus_bytes += len(buf)
+        self._write_data(buf)
+
+    def _measure_frame(self):
+        mem_alloc = self.mem_alloc
+        before = mem_alloc() if mem_alloc else 0
+        start = time.ticks_us()
+        self._run_once()
+        elapsed = time.ticks_diff(time.ticks_us(), start)
+        if mem_alloc:
+            after = mem_alloc()
+            if after >= before:
+                self.alloc_bytes += after - before
+            else:
+                # 本帧内发生了垃圾回收，无法得到分配量
+                self.gc_frames += 1
+
+        self.frames += 1
+        self.frame_us += elapsed
+        if elapsed > self.max_frame_us:
+            self.max_frame_us = elapsed
+        if elapsed > self.ui.scheduler.frame_us:
+            self.late_frames += 1
+
+    # ---- 回放 ----
+
+    def run_ms(self, ms):
+        """按正常的主循环运行 ms 毫秒"""
+        deadline = time.ticks_add(time.ticks_ms(), ms)
+        while True:
+            remaining = time.ticks_diff(deadline, time.ticks_ms())
+            if remaining <= 0:
+                break
+            self.ui.step(remaining)
+
+    def _physical_key(self, key):
+        """把逻辑按键名转换为物理按键名（事件在 UIFramework 中会重新映射）"""
+        buttons = self.ui.input_manager.buttons
+        if key in buttons:
+            return key
+        for name in buttons:
+            if self.ui.key_mapper.map_key(name) == key:
+                return name
+        return key
+
+    def press(self, key, hold_ms=50):
+        """
+        注入一次短按（key_press、key_release、key_click）
+
+        Args:
+            key: 按键名
+            hold_ms: 按住的时间（毫秒）
+        """
+        input_manager = self.ui.input_manager
+        key = self._physical_key(key)
+        self.presses += 1
+        input_manager.push_event("key_press", key)
+        self.run_ms(hold_ms)
+        input_manager.push_event("key_release", key, hold_ms)
+        input_manager.push_event("key_click", key)
+
+    def hold(self, key, hold_ms=800):
+        """
+        注入一次长按（key_press、key_long_press、key_release）
+
+        Args:
+            key: 按键名
+            hold_ms: 按住的时间（毫秒）
+        """
+        input_manager = self.ui.input_manager
+        key = self._physical_key(key)
+        long_press_ms = input_manager.long_press_ms
+        self.presses += 1
+        input_manager.push_event("key_press", key)
+        self.run_ms(min(hold_ms, long_press_ms))
+        input_manager.push_event("key_long_press", key, hold_ms)
+        self.run_ms(max(0, hold_ms - long_press_ms))
+        input_manager.push_event("key_release", key, hold_ms)
+
+    def chord(self, key, key2, hold_ms=50):
+        """
+        注入一次组合键（两个 key_press、key_chord、两个 key_release）
+
+        Args:
+            key, key2: 按键名（key 先按下）
+            hold_ms: 按住的时间（毫秒）
+        """
+        input_manager = self.ui.input_manager
+        key = self._physical_key(key)
+        key2 = self._physical_key(key2)
+        self.presses += 1
+        input_manager.push_event("key_press", key)
+        input_manager.push_event("key_press", key2)
+        input_manager.push_event("key_chord", key, key2=key2)
+        self.run_ms(hold_ms)
+        input_manager.push_event("key_release", key, hold_ms)
+        input_manager.push_event("key_release", key2, hold_ms)
+
+    # 字符矩阵组件中移动光标的按键和对应的方法（见 CharMatrixMixin）
+    CURSOR_MOVES = (
+        ("up", "move_cursor_up"),
+        ("down", "move_cursor_down"),
+        ("back", "move_cursor_left"),
+        ("ok", "move_cursor_right"),
+    )
+
+    def _input_component(self):
+        """当前页面中的字符输入组件（Keyboard、NumPad）"""
+        page = self.ui.page_manager.current_page
+        for component in page.components if page else ():
+            if hasattr(component, "get_current_char") and hasattr(component, "add_char"):
+                return component
+        raise ValueError("no input component on the current page")
+
+    def _plan(self, component, char):
+        """
+        找出把光标移到字符 char 上的最少按键操作（广度优先搜索，用组件自己的方法移动光标）
+
+        Returns:
+            list: 按键操作（"up"、"down"、"back"、"ok" 或 "jump"，即 UP+OK 跳到预测行）
+        """
+        moves = [(key, getattr(component, name)) for key, name in self.CURSOR_MOVES]
+        if getattr(component, "predictor", None) is not None:
+            moves.append(("jump", component.jump_to_prediction))
+        start = (component.cursor_x, component.cursor_y)
+        paths = {start: []}
+        queue = [start]
+        found = None
+        try:
+            for state in queue:
+                component.cursor_x, component.cursor_y = state
+                if component.get_current_char() == char:
+                    found = paths[state]
+                    break
+                for key, move in moves:
+                    component.cursor_x, component.cursor_y = state
+                    move()
+                    next_state = (component.cursor_x, component.cursor_y)
+                    if next_state not in paths:
+                        paths[next_state] = paths[state] + [key]
+                        queue.append(next_state)
+        finally:
+            component.cursor_x, component.cursor_y = start
+        if found is None:
+            raise ValueError("cannot type {!r}".format(char))
+        return found
+
+    def type_text(self, text, gap_ms=80):
+        """
+        在当前页面的字符输入组件中输入文本
+
+        每个字符用最少的按键操作移动光标，再长按 OK 输入。
+
+        Args:
+            text: 文本
+            gap_ms: 两次按键操作之间的间隔（毫秒）
+        """
+        for char in text:
+            component = self._input_component()
+            for key in self._plan(component, char):
+                if key == "jump":
+                    self.chord("up", "ok")
+                else:
+                    self.press(key)
+                self.run_ms(gap_ms)
+            self.hold("ok", self.ui.input_manager.long_press_ms + 100)
+            self.run_ms(gap_ms)
+            self.typed += 1
+
+    def run_step(self, step):
+        """
+        执行场景中的一步
+
+        Args:
+            step: 字典，支持以下形式（都可以带 "repeat" 重复次数）：
+                {"wait": 毫秒}
+                {"press": 按键, "hold": 毫秒, "gap": 毫秒}
+                {"hold": 按键, "ms": 毫秒, "gap": 毫秒}
+                {"chord": [按键, 按键], "hold": 毫秒, "gap": 毫秒}
+                {"type": 文本, "gap": 毫秒}（在当前页面的字符输入组件中输入）
+                {"goto": 页面名}
+                {"push": 页面名} 或 {"push": "模块:类名", "args": [...]}
+                {"pop": true}
+                {"steps": [...]}（按顺序执行一组步骤）
+        """
+        ui = self.ui
+        for _ in range(step.get("repeat", 1)):
+            if "wait" in step:
+                self.run_ms(step["wait"])
+            elif "press" in step:
+                self.press(step["press"], step.get("hold", 50))
+                self.run_ms(step.get("gap", 100))
+            elif "chord" in step:
+                self.chord(step["chord"][0], step["chord"][1], step.get("hold", 50))
+                self.run_ms(step.get("gap", 100))
+            elif "hold" in step:
+                self.hold(step["hold"], step.get("ms", 800))
+                self.run_ms(step.get("gap", 100))
+            elif "type" in step:
+                self.type_text(step["type"], step.get("gap", 80))
+            elif "goto" in step:
+                ui.goto_page(step["goto"], clear_stack=True)
+                self._page_changed()
+            elif "push" in step:
+                ui.push_page(self._page(step["push"], step.get("args", ())))
+                self._page_changed()
+            elif "pop" in step:
+                ui.pop_page()
+                self._page_changed()
+            elif "steps" in step:
+                for sub_step in step["steps"]:
+                    self.run_step(sub_step)
+            else:
+                raise ValueError("unknown step: {}".format(step))
+
+    def _page_changed(self):
+        """
+        脚本直接切换页面后，让过渡动画从下一帧开始计时
+
+        （相当于在事件处理中切换页面，不把上一次空闲等待的时间计入动画）
+        """
+        self.ui.last_update_ms = time.ticks_ms()
+
+    def _page(self, name, args):
+        """已注册的页面直接使用页面名，"模块:类名" 形式则创建页面实例"""
+        if ":" not in name:
+            return name
+        module_name, class_name = name.split(":")
+        module = __import__(module_name, None, None, [class_name])
+        return getattr(module, class_name)(*args)
+
+    def run_scenario(self, scenario):
+        """
+        运行一个场景
+
+        Args:
+            scenario: 场景字典（name、start、settle_ms、seed、steps）
+
+        Returns:
+            dict: 测试结果
+        """
+        ui = self.ui
+        random.seed(scenario.get("seed", 1))
+        start = scenario.get("start")
+        if start:
+            ui.goto_page(start, clear_stack=True, transition=False)
+        # 等待上一个场景的过渡动画等结束，不计入统计
+        self.run_ms(scenario.get("settle_ms", 300))
+
+        gc.collect()
+        self.reset()
+        start_ms = time.ticks_ms()
+        for step in scenario["steps"]:
+            self.run_step(step)
+        elapsed_ms = time.ticks_diff(time.ticks_ms(), start_ms)
+        return self.result(scenario.get("name", "unnamed"), elapsed_ms)
+
+    def result(self, name, elapsed_ms):
+        """
+        汇总当前统计数据
+
+        Args:
+            name: 场景名
+            elapsed_ms: 场景耗时（毫秒）
+
+        Returns:
+            dict: 测试结果（mem_alloc 不可用时 alloc 字段为 None，没有输入文本时 presses_per_char 为 None）
+        """
+        frames = self.frames or 1
+        measured = self.frames - self.gc_frames
+        return {
+            "name": name,
+            "frames": self.frames,
+            "elapsed_ms": elapsed_ms,
+            "fps": self.frames * 1000 // elapsed_ms if elapsed_ms > 0 else 0,
+            "frame_us_avg": self.frame_us // frames,
+            "frame_us_max": self.max_frame_us,
+            "late_frames": self.late_frames,
+            "bus_bytes": self.bus_bytes,
+            "bus_bytes_per_frame": self.bus_bytes // frames,
+            "alloc_bytes": self.alloc_bytes if self.mem_alloc else None,
+            "alloc_bytes_per_frame": (
+                self.alloc_bytes // measured if self.mem_alloc and measured > 0 else None
+            ),
+            "gc_frames": self.gc_frames if self.mem_alloc else None,
+            "presses": self.presses,
+            "presses_per_char": (
+                round(self.presses / self.typed, 2) if self.typed else None
+            ),
+        }
+
+    def run(self, scenarios):
+        """
+        依次运行多个场景
+
+        Args:
+            scenarios: 场景字典列表
+
+        Returns:
+            list: 每个场景的测试结果
+        """
+        results = []
+        for scenario in scenarios:
+            results.append(self.run_scenario(scenario))
+        return results
+
+
+def run_device(scenarios_json):
+    """
+    在设备上运行性能测试（由 scripts/bench.py 通过 mpremote 调用）
+
+    结果以一行 "BENCH {...}" 的 JSON 输出。
+
+    Args:
+        scenarios_json: 场景列表的 JSON 字符串
+    """
+    from main import create_framework, init_display, init_fonts
+
+    scenarios = json.loads(scenarios_json)
+    display = init_display()
+    init_fonts()
+    bench = Bench(create_framework(display))
+    results = []
+    for scenario in scenarios:
+        print("running", scenario.get("name"))
+        results.append(bench.run_scenario(scenario))
+    print("BENCH " + json.dumps({"platform": sys.platform, "results": results}))
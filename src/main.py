@@ -5,49 +5,36 @@ from common import connect_to_saved_networks, sync_time
 from led import set_led_color
 
 
-def main():
-    """主函数 - 启动系统和 UI"""
-
-    # 初始化 I2C 和 OLED 显示屏
+def init_display():
+    """初始化 I2C 和 OLED 显示屏"""
     scl = Pin(16)
     sda = Pin(15)
     i2c = I2C(scl=scl, sda=sda)
-    display = ssd1306.SSD1306_I2C(128, 64, i2c)
-    display.fill(0)
-    display.text("Loading...", 0, 0)
-    display.show()
+    return ssd1306.SSD1306_I2C(128, 64, i2c)
 
-    # 加载提示
-    set_led_color(2, 5, 16)
 
-    try:
-        from ui_framework.components.fusion_text import FusionText
-        from ui_framework.components.unifont_text import UnifontText
+def init_fonts():
+    """加载字体文件"""
+    from ui_framework.components.fusion_text import FusionText
+    from ui_framework.components.unifont_text import UnifontText
 
-        display.text("Loading fonts", 0, 8)
-        display.show()
-        UnifontText.init_unifont(
-            bin_path="/assets/unifont.bin", chars_path="/assets/chars.txt"
-        )
-        FusionText.init_fusion(
-            bin_path="/assets/fusion.bin", chars_path="/assets/chars.txt"
-        )
-        display.text("Connecting Wi-Fi", 0, 16)
-        display.show()
-        connect_to_saved_networks()
-        display.text("Syncing time", 0, 24)
-        display.show()
-        sync_time()
-        set_led_color(0, 0, 0)
-    except Exception as e:
-        set_led_color(10, 0, 0)
-        display.text(str(e), 0, 24)
-        # 继续运行，不中断 UI
+    UnifontText.init_unifont(bin_path="/assets/unifont.fnt", index_path="/assets/chars.idx")
+    FusionText.init_fusion(bin_path="/assets/fusion.fnt", index_path="/assets/chars.idx")
+
+
+def create_framework(display):
+    """
+    创建 UI 框架，注册按键和应用页面
 
+    Args:
+        display: SSD1306 显示对象
+
+    Returns:
+        UIFramework: UI 框架
+    """
     from ui_app.pages import create_ui
     from ui_framework.framework import UIFramework
 
-    # 创建 UI 框架
     ui = UIFramework(display)
 
     # 注册按钮
@@ -69,6 +56,39 @@ def main():
 
     # 设置帧率
     ui.fps = 60
+    return ui
+
+
+def main():
+    """主函数 - 启动系统和 UI"""
+
+    # 初始化 I2C 和 OLED 显示屏
+    display = init_display()
+    display.fill(0)
+    display.text("Loading...", 0, 0)
+    display.show()
+
+    # 加载提示
+    set_led_color(2, 5, 16)
+
+    try:
+        display.text("Loading fonts", 0, 8)
+        display.show()
+        init_fonts()
+        display.text("Connecting Wi-Fi", 0, 16)
+        display.show()
+        connect_to_saved_networks()
+        display.text("Syncing time", 0, 24)
+        display.show()
+        sync_time()
+        set_led_color(0, 0, 0)
+    except Exception as e:
+        set_led_color(10, 0, 0)
+        display.text(str(e), 0, 24)
+        # 继续运行，不中断 UI
+
+    # 创建 UI 框架
+    ui = create_framework(display)
 
     # 准备就绪，关闭 LED
     set_led_color(0, 0, 0)
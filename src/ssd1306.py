@@ -33,7 +33,9 @@ class SSD1306(framebuf.FrameBuffer):
         self.external_vcc = external_vcc
         self.pages = self.height // 8
         self.buffer = bytearray(self.pages * self.width)
-        super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
+        self.buffer_view = memoryview(self.buffer)
+        self.format = framebuf.MONO_VLSB
+        super().__init__(self.buffer, self.width, self.height, self.format)
         self.init_display()
 
     def init_display(self):
@@ -93,20 +95,31 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(SET_SEG_REMAP | (rotate & 1))
 
     def show(self):
-        x0 = 0
-        x1 = self.width - 1
-        if self.width != 128:
+        self.show_region(0, self.width - 1, 0, self.pages - 1)
+
+    def show_region(self, x0, x1, page0, page1):
+        # only transfer columns x0..x1 of pages page0..page1
+        width = self.width
+        count = x1 - x0 + 1
+        start = page0 * width + x0
+        col_offset = 0
+        if width != 128:
             # narrow displays use centred columns
-            col_offset = (128 - self.width) // 2
-            x0 += col_offset
-            x1 += col_offset
+            col_offset = (128 - width) // 2
         self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
+        self.write_cmd(x0 + col_offset)
+        self.write_cmd(x1 + col_offset)
         self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+        self.write_cmd(page0)
+        self.write_cmd(page1)
+        if count == width:
+            # full-width window is contiguous in the buffer
+            self.write_data(self.buffer_view[start : (page1 + 1) * width])
+        else:
+            # the RAM pointer wraps inside the window, so send page by page
+            for _ in range(page1 - page0 + 1):
+                self.write_data(self.buffer_view[start : start + count])
+                start += width
 
 
 class SSD1306_I2C(SSD1306):
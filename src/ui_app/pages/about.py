@@ -10,6 +10,8 @@ from ui_framework.page import Page
 class AboutPage(Page):
     """关于页面"""
 
+    track_damage = True
+
     def __init__(self):
         super().__init__("About")
 
@@ -28,7 +30,7 @@ class AboutPage(Page):
         self.add_component(self.menu)
 
     def _handle_page_event(self, event):
-        if event.get("type") == "key_press" and event.get("key") == "back":
+        if event.type == "key_press" and event.key == "back":
             if self.manager:
                 self.manager.pop_page()
             return True
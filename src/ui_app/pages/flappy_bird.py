@@ -71,6 +71,10 @@ class FlappyBirdPage(Page):
                 self.game_started = True
             self.bird_velocity = self.jump_strength
 
+    def is_idle(self):
+        """游戏开始前画面静止"""
+        return not self.game_started
+
     def update(self, delta_time):
         """游戏逻辑更新"""
         super().update(delta_time)
@@ -223,8 +227,8 @@ class FlappyBirdPage(Page):
 
     def _handle_page_event(self, event):
         """处理页面事件"""
-        event_type = event.get("type")
-        key = event.get("key")
+        event_type = event.type
+        key = event.key
 
         if event_type == "key_press":
             if key == "ok":
@@ -288,8 +292,8 @@ class FlappyBirdPausePage(Page):
 
     def _handle_page_event(self, event):
         """处理页面事件"""
-        if event.get("type") == "key_press":
-            key = event.get("key")
+        if event.type == "key_press":
+            key = event.key
             if key == "up":
                 self.menu.select_prev()
                 return True
@@ -343,8 +347,8 @@ class FlappyBirdGameOverPage(Page):
 
     def _handle_page_event(self, event):
         """处理页面事件"""
-        if event.get("type") == "key_press":
-            key = event.get("key")
+        if event.type == "key_press":
+            key = event.key
             if key == "up":
                 self.menu.select_prev()
                 return True
@@ -14,6 +14,8 @@ from ui_framework.page import Page
 class Home(Page):
     """首页"""
 
+    track_damage = True
+
     def __init__(self):
         super().__init__("Home")
 
@@ -21,10 +23,16 @@ class Home(Page):
         self.add_component(self.primary)
         self.secondary = Text("----/--/--", 8, 32)
         self.add_component(self.secondary)
+        self.ms_until_next_second = 1000
+
+    def get_wakeup_interval(self):
+        # 静止时在下一秒开始时更新时钟
+        return min(super().get_wakeup_interval(), self.ms_until_next_second)
 
     def update(self, delta_time):
         super().update(delta_time)
         year, month, day, hour, minute, second, weekday, yearday, us = Ntp.time()
+        self.ms_until_next_second = 1000 - us // 1000
         if 0 <= weekday <= 4:
             # 查询现在是哪节课
             lesson = None
@@ -67,8 +75,8 @@ class Home(Page):
         self.secondary.text = f"{year:04}/{month:02}/{day:02}"
 
     def _handle_page_event(self, event):
-        if event.get("type") == "key_press":
-            key = event.get("key")
+        if event.type == "key_press":
+            key = event.key
             if key == "ok":
                 if self.manager:
                     self.manager.push_page("main_menu")
@@ -1,8 +1,10 @@
 """
 键盘输入页面
-提供 ASCII 字符输入功能
+提供 ASCII 字符输入功能，输入习惯（字符和二元组频率）保存在设置中用于预测
 """
 
+from config import save_settings, settings
+from ui_framework.char_predictor import CharPredictor
 from ui_framework.components.keyboard import Keyboard
 from ui_framework.page import Page
 
@@ -10,6 +12,9 @@ from ui_framework.page import Page
 class KeyboardPage(Page):
     """键盘输入页面"""
 
+    # 所有键盘页面共用的预测器（第一次使用时从设置中读取）
+    predictor = None
+
     def __init__(self, title="Input", default_value="", callback=None):
         """
         初始化键盘页面
@@ -28,12 +33,33 @@ class KeyboardPage(Page):
 
         # 创建键盘组件
         self.keyboard = Keyboard(
-            title=title, default_value=default_value, callback=self._callback, x=0, y=0
+            title=title,
+            default_value=default_value,
+            callback=self._callback,
+            x=0,
+            y=0,
+            predictor=self.get_predictor(),
         )
         self.add_component(self.keyboard)
 
+    @classmethod
+    def get_predictor(cls):
+        """
+        获取共用的预测器
+
+        Returns:
+            CharPredictor: 预测器
+        """
+        if cls.predictor is None:
+            cls.predictor = CharPredictor.from_dict(settings.get("keyboard_stats"))
+        return cls.predictor
+
     def _callback(self, text):
         """内部回调函数，调用用户提供的回调"""
+        if text is not None:
+            # 键盘组件在确认时已学习输入的文本
+            settings["keyboard_stats"] = self.get_predictor().to_dict()
+            save_settings()
         if self._init_callback and text is not None:
             self._init_callback(text)
         if self.manager:
@@ -45,7 +71,7 @@ class KeyboardPage(Page):
         """
         super().on_enter(**kwargs)
 
-        # 重置光标位置
+        # 重置光标位置（有预测行时即最可能的字符）
         self.keyboard.cursor_x = 0
         self.keyboard.cursor_y = 0
 
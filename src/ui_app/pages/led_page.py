@@ -13,6 +13,8 @@ from ui_framework.page import Page
 class LEDPage(Page):
     """LED 页面"""
 
+    track_damage = True
+
     def __init__(self):
         super().__init__("LEDPage")
 
@@ -54,8 +56,8 @@ class LEDPage(Page):
         set_led_color(0, 0, 0, 0)
 
     def _handle_page_event(self, event):
-        if event.get("type") == "key_press":
-            key = event.get("key")
+        if event.type == "key_press":
+            key = event.key
             if key == "up":
                 self.menu.select_prev()
                 return True
@@ -6,6 +6,8 @@ from ui_framework.page import Page
 
 
 class LessonsPage(Page):
+    track_damage = True
+
     def __init__(self):
         super().__init__("Lessons")
 
@@ -34,15 +36,20 @@ class LessonsPage(Page):
         self.selected_time_text = Text("", x=2, y=54)
         self.add_component(self.selected_time_text)
 
-        self.long_press_time = {}
-        self.long_press_threshold = 0.5
-        self.long_press_triggered = {}
+    def get_prewarm_text(self):
+        # 课程名在切换光标时才显示，预读所有课程名
+        out = super().get_prewarm_text()
+        names = "".join(lesson.name for lessons in LESSONS for lesson in lessons)
+        out.append((self.selected_name_text.face, names))
+        return out
 
     def on_enter(self, **kwargs):
         super().on_enter(**kwargs)
         self.update_display()
 
     def update_display(self):
+        # 光标框在 render 中直接绘制，需要手动标记课程表区域
+        self.invalidate(0, self.lesson_grid_y - 1, 128, 26)
         self.weekday_text.text = self.weekdays[self.current_weekday]
 
         lessons = LESSONS[self.current_weekday]
@@ -89,17 +96,6 @@ class LessonsPage(Page):
             y = self.lesson_grid_y + row * 8
             display.rect(x - 1, y - 1, 17, 9, 1)
 
-    def update(self, delta_time):
-        super().update(delta_time)
-
-        for key in list(self.long_press_time.keys()):
-            if key in self.long_press_time:
-                self.long_press_time[key] += delta_time
-                if self.long_press_time[key] >= self.long_press_threshold:
-                    if key not in self.long_press_triggered:
-                        self.long_press_triggered[key] = True
-                        self._handle_long_press(key)
-
     def _handle_long_press(self, key):
         if key == "up":
             self.current_weekday = (self.current_weekday - 1) % 5
@@ -109,14 +105,10 @@ class LessonsPage(Page):
             self.update_display()
 
     def _handle_page_event(self, event):
-        event_type = event.get("type")
-        key = event.get("key")
+        event_type = event.type
+        key = event.key
 
         if event_type == "key_press":
-            if key in ["up", "down"]:
-                self.long_press_time[key] = 0
-                self.long_press_triggered.pop(key, None)
-
             if key == "up":
                 # 向前移动光标
                 lessons = LESSONS[self.current_weekday]
@@ -147,10 +139,10 @@ class LessonsPage(Page):
                 # 什么都不做
                 return True
 
-        elif event_type == "key_release":
-            if key in self.long_press_time:
-                del self.long_press_time[key]
-            if key in self.long_press_triggered:
-                del self.long_press_triggered[key]
+        elif event_type == "key_long_press":
+            # 长按上下键切换星期
+            if key in ("up", "down"):
+                self._handle_long_press(key)
+                return True
 
         return False
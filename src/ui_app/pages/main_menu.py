@@ -10,6 +10,8 @@ from ui_framework.page import Page
 class MainMenu(Page):
     """主菜单"""
 
+    track_damage = True
+
     def __init__(self):
         super().__init__("MainMenu")
 
@@ -27,8 +29,8 @@ class MainMenu(Page):
             self.manager.push_page(page_name)
 
     def _handle_page_event(self, event):
-        if event.get("type") == "key_press":
-            key = event.get("key")
+        if event.type == "key_press":
+            key = event.key
             if key == "up":
                 self.menu.select_prev()
                 return True
@@ -30,6 +30,8 @@ statuses = {
 class NetworkPage(Page):
     """网络配置页面"""
 
+    track_damage = True
+
     def __init__(self):
         super().__init__("Network")
 
@@ -141,8 +143,8 @@ class NetworkPage(Page):
         save_settings()
 
     def _handle_page_event(self, event):
-        if event.get("type") == "key_press":
-            key = event.get("key")
+        if event.type == "key_press":
+            key = event.key
             if key == "up":
                 self.menu.select_prev()
                 return True
@@ -10,6 +10,8 @@ from ui_framework.page import Page
 class SettingsPage(Page):
     """设置页面"""
 
+    track_damage = True
+
     def __init__(self):
         super().__init__("Settings")
 
@@ -26,8 +28,8 @@ class SettingsPage(Page):
         self.add_component(self.menu)
 
     def _handle_page_event(self, event):
-        if event.get("type") == "key_press":
-            key = event.get("key")
+        if event.type == "key_press":
+            key = event.key
             if key == "up":
                 self.menu.select_prev()
                 return True
@@ -40,11 +40,6 @@ class SnakeGamePage(Page):
         self.move_interval = 0.15  # 移动间隔（秒）
         self.move_timer = 0
 
-        # 按键长按检测
-        self.back_key_pressed = False
-        self.back_key_press_time = 0
-        self.long_press_threshold = 0.5  # 长按阈值（秒）
-
         # 初始化游戏
         self.reset_game()
 
@@ -97,6 +92,10 @@ class SnakeGamePage(Page):
         if (dx + curr_dx, dy + curr_dy) != (0, 0):
             self.next_direction = new_direction
 
+    def is_idle(self):
+        """游戏进行中每帧都需要更新"""
+        return False
+
     def update(self, delta_time):
         """游戏逻辑更新"""
         super().update(delta_time)
@@ -104,14 +103,6 @@ class SnakeGamePage(Page):
         if not self.active:
             return
 
-        # 检测 back 键长按
-        if self.back_key_pressed:
-            self.back_key_press_time += delta_time
-            if self.back_key_press_time >= self.long_press_threshold:
-                # 触发长按事件 - 进入暂停页面
-                self.goto_pause()
-                self.back_key_pressed = False  # 防止重复触发
-
         if self.game_over and not self.game_over_triggered:
             # 游戏结束，切换到游戏结束页面
             self.game_over_triggered = True
@@ -222,8 +213,8 @@ class SnakeGamePage(Page):
 
     def _handle_page_event(self, event):
         """处理页面事件"""
-        event_type = event.get("type")
-        key = event.get("key")
+        event_type = event.type
+        key = event.key
 
         if event_type == "key_press":
             if key == "up":
@@ -233,9 +224,6 @@ class SnakeGamePage(Page):
                 self.change_direction((0, 1))
                 return True
             elif key == "back":
-                # 开始检测长按
-                self.back_key_pressed = True
-                self.back_key_press_time = 0
                 # back 对应向左
                 self.change_direction((-1, 0))
                 return True
@@ -244,11 +232,10 @@ class SnakeGamePage(Page):
                 self.change_direction((1, 0))
                 return True
 
-        elif event_type == "key_release":
+        elif event_type == "key_long_press":
             if key == "back":
-                # 重置长按检测
-                self.back_key_pressed = False
-                self.back_key_press_time = 0
+                # 长按 back 进入暂停页面
+                self.goto_pause()
                 return True
 
         return False
@@ -304,8 +291,8 @@ class SnakePausePage(Page):
 
     def _handle_page_event(self, event):
         """处理页面事件"""
-        if event.get("type") == "key_press":
-            key = event.get("key")
+        if event.type == "key_press":
+            key = event.key
             if key == "up":
                 self.menu.select_prev()
                 return True
@@ -359,8 +346,8 @@ class SnakeGameOverPage(Page):
 
     def _handle_page_event(self, event):
         """处理页面事件"""
-        if event.get("type") == "key_press":
-            key = event.get("key")
+        if event.type == "key_press":
+            key = event.key
             if key == "up":
                 self.menu.select_prev()
                 return True
@@ -13,6 +13,8 @@ from ui_framework.page import Page
 class WhalePage(Page):
     """Whale 点名结果显示页面"""
 
+    track_damage = True
+
     def __init__(self):
         super().__init__("Whale")
 
@@ -197,8 +199,8 @@ class WhalePage(Page):
                 self.text_components[i].text = ""
 
     def _handle_page_event(self, event):
-        event_type = event.get("type")
-        key = event.get("key")
+        event_type = event.type
+        key = event.key
 
         if event_type == "key_press":
             if key == "up":
@@ -0,0 +1,156 @@
+"""
+帧缓冲区快速复制
+在缓冲区格式与屏幕一致（MONO_VLSB）时按字节复制，避免逐像素的格式转换
+"""
+
+import framebuf
+
+
+def native_format(display):
+    """
+    获取显示对象的原生帧缓冲区格式
+
+    Args:
+        display: 显示对象
+
+    Returns:
+        int: framebuf 格式常量，未声明时按 SSD1306 的 MONO_VLSB 处理
+    """
+    return getattr(display, "format", framebuf.MONO_VLSB)
+
+
+def blit_pages(dst, src, width, height, x, y):
+    """
+    把整幅 MONO_VLSB 缓冲区以 (x, y) 偏移不透明地复制到同尺寸的目标缓冲区
+
+    MONO_VLSB 中每个字节是一列 8 个像素，只要 y 是 8 的倍数，
+    每个 page 的一段连续字节就能直接切片复制。
+
+    Args:
+        dst: 目标缓冲区（memoryview 或 bytearray）
+        src: 源缓冲区（memoryview 或 bytearray）
+        width, height: 两个缓冲区的尺寸
+        x, y: 源缓冲区左上角在目标中的位置
+
+    Returns:
+        bool: 是否已完成复制；y 不是 8 的倍数时返回 False，由调用方回退到 blit()
+    """
+    if y & 7:
+        return False
+    if x >= width or x <= -width or y >= height or y <= -height:
+        # 完全移出屏幕，无需复制
+        return True
+
+    pages = height >> 3
+    page_offset = y >> 3
+    first = max(0, page_offset)
+    last = min(pages, pages + page_offset)
+
+    if x == 0:
+        # 整行对齐时所有 page 是一整段连续内存
+        start = first * width
+        end = last * width
+        shift = page_offset * width
+        dst[start:end] = src[start - shift : end - shift]
+        return True
+
+    if x > 0:
+        src_x = 0
+        dst_x = x
+        count = width - x
+    else:
+        src_x = -x
+        dst_x = 0
+        count = width + x
+
+    for page in range(first, last):
+        d = page * width + dst_x
+        s = (page - page_offset) * width + src_x
+        dst[d : d + count] = src[s : s + count]
+    return True
+
+
+def _merge_bits(dst, dst_start, src, src_start, count, mask):
+    """按位掩码把 src 中连续 count 个字节的部分位合并到 dst"""
+    keep = ~mask & 0xFF
+    for i in range(count):
+        dst[dst_start + i] = (dst[dst_start + i] & keep) | (src[src_start + i] & mask)
+
+
+try:
+    import micropython
+
+    @micropython.viper
+    def _merge_bits_viper(
+        dst: ptr8, dst_start: int, src: ptr8, src_start: int, count: int, mask: int
+    ):
+        keep = (mask ^ 0xFF) & 0xFF
+        i = 0
+        while i < count:
+            dst[dst_start + i] = (dst[dst_start + i] & keep) | (src[src_start + i] & mask)
+            i += 1
+
+    _merge_bits = _merge_bits_viper
+except (ImportError, AttributeError, NameError):
+    # 没有 viper 支持（如在 CPython 中运行）时使用纯 Python 实现
+    pass
+
+
+def copy_region(dst, src, width, height, src_x, src_y, w, h, dest_x, dest_y):
+    """
+    在两个同尺寸的 MONO_VLSB 缓冲区之间不透明地复制一个矩形区域
+
+    完整覆盖的 page 直接切片复制，区域上下边缘只覆盖部分行的 page
+    按位掩码合并。
+
+    Args:
+        dst: 目标缓冲区（memoryview 或 bytearray）
+        src: 源缓冲区（memoryview 或 bytearray）
+        width, height: 两个缓冲区的尺寸
+        src_x, src_y: 源区域左上角
+        w, h: 区域宽度和高度
+        dest_x, dest_y: 目标位置左上角
+
+    Returns:
+        bool: 是否已完成复制；源和目标的垂直偏移差不是 8 的倍数时返回 False，
+              由调用方回退到逐像素复制
+    """
+    if (dest_y - src_y) & 7:
+        return False
+
+    # 按源和目标的边界裁剪
+    if src_x < 0:
+        w += src_x
+        dest_x -= src_x
+        src_x = 0
+    if dest_x < 0:
+        w += dest_x
+        src_x -= dest_x
+        dest_x = 0
+    if src_y < 0:
+        h += src_y
+        dest_y -= src_y
+        src_y = 0
+    if dest_y < 0:
+        h += dest_y
+        src_y -= dest_y
+        dest_y = 0
+    w = min(w, width - src_x, width - dest_x)
+    h = min(h, height - src_y, height - dest_y)
+    if w <= 0 or h <= 0:
+        return True
+
+    page_delta = (dest_y - src_y) // 8
+    y_end = dest_y + h
+    for page in range(dest_y >> 3, ((y_end - 1) >> 3) + 1):
+        page_top = page << 3
+        top = max(dest_y, page_top) - page_top
+        bottom = min(y_end, page_top + 8) - page_top
+        d = page * width + dest_x
+        s = (page - page_delta) * width + src_x
+        if top == 0 and bottom == 8:
+            dst[d : d + w] = src[s : s + w]
+        else:
+            mask = ((1 << bottom) - 1) & ~((1 << top) - 1) & 0xFF
+            _merge_bits(dst, d, src, s, w, mask)
+    return True
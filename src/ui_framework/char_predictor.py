@@ -0,0 +1,126 @@
+"""
+字符预测
+按已输入文本学习字符频率和二元组（前一个字符 -> 下一个字符）频率，
+为键盘给出最可能的下一个字符。
+
+统计结果可以转换为 JSON 兼容的字典保存（见 to_dict/from_dict），
+计数总和超过 MAX_TOTAL 时全部减半，旧的输入习惯逐渐淡出，占用的内存也有上限。
+"""
+
+
+class CharPredictor:
+    """基于字符频率和二元组的下一个字符预测"""
+
+    # 没有统计数据时的候选顺序（英文常用字母和数字）
+    DEFAULT_ORDER = "eaoirtnsl1023cdu"
+    # 二元组计数相对于单字符计数的权重
+    BIGRAM_WEIGHT = 4
+    # 单字符计数总和的上限，超过时全部减半
+    MAX_TOTAL = 2000
+
+    def __init__(self):
+        """初始化预测器"""
+        self.unigrams = {}  # 字符 -> 次数
+        self.bigrams = {}  # 前一个字符（文本开头为 ""）-> {字符: 次数}
+        self.total = 0
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从 to_dict() 的结果恢复预测器
+
+        Args:
+            data: 字典（可以为 None 或不完整，如设置文件被手动修改）
+
+        Returns:
+            CharPredictor: 预测器
+        """
+        predictor = cls()
+        if isinstance(data, dict):
+            unigrams = data.get("u")
+            bigrams = data.get("b")
+            if isinstance(unigrams, dict):
+                predictor.unigrams = unigrams
+            if isinstance(bigrams, dict):
+                predictor.bigrams = bigrams
+            predictor.total = sum(predictor.unigrams.values())
+        return predictor
+
+    def to_dict(self):
+        """
+        转换为可以保存到设置文件的字典
+
+        Returns:
+            dict: {"u": 单字符计数, "b": 二元组计数}
+        """
+        return {"u": self.unigrams, "b": self.bigrams}
+
+    def learn(self, text):
+        """
+        学习一段完整输入的文本
+
+        Args:
+            text: 文本
+        """
+        unigrams = self.unigrams
+        bigrams = self.bigrams
+        prev = ""
+        for char in text:
+            unigrams[char] = unigrams.get(char, 0) + 1
+            following = bigrams.get(prev)
+            if following is None:
+                following = bigrams[prev] = {}
+            following[char] = following.get(char, 0) + 1
+            prev = char
+        self.total += len(text)
+        if self.total > self.MAX_TOTAL:
+            self._decay()
+
+    def _decay(self):
+        """所有计数减半，丢弃减到 0 的条目"""
+        self.unigrams = self._halve(self.unigrams)
+        bigrams = {}
+        for prev, following in self.bigrams.items():
+            following = self._halve(following)
+            if following:
+                bigrams[prev] = following
+        self.bigrams = bigrams
+        self.total = sum(self.unigrams.values())
+
+    @staticmethod
+    def _halve(counts):
+        halved = {}
+        for char, count in counts.items():
+            if count > 1:
+                halved[char] = count // 2
+        return halved
+
+    def predict(self, prev, count, allowed=None):
+        """
+        预测下一个字符
+
+        Args:
+            prev: 前一个字符（文本开头为 ""）
+            count: 返回的候选数量
+            allowed: 可以输入的字符（不在其中的候选会被跳过），None 表示不限制
+
+        Returns:
+            list: 按可能性从高到低排列的候选字符（不足 count 个时用 DEFAULT_ORDER 补足）
+        """
+        unigrams = self.unigrams
+        following = self.bigrams.get(prev, {})
+        weight = self.BIGRAM_WEIGHT
+        scores = {}
+        for char, n in unigrams.items():
+            scores[char] = n
+        for char, n in following.items():
+            scores[char] = scores.get(char, 0) + n * weight
+        ranked = sorted(scores, key=lambda char: -scores[char])
+
+        result = []
+        for char in ranked + list(self.DEFAULT_ORDER):
+            if len(result) >= count:
+                break
+            if char not in result and (allowed is None or char in allowed):
+                result.append(char)
+        return result
@@ -13,5 +13,7 @@ UI 组件包
     from ui_framework.components.icon import Icon
     from ui_framework.components.label import Label
     from ui_framework.components.keyboard import Keyboard
+    from ui_framework.components.font_text import FontText
     from ui_framework.components.unifont_text import UnifontText
+    from ui_framework.components.fusion_text import FusionText
 """
@@ -2,6 +2,11 @@
 UI 组件基类
 """
 
+import time
+
+from ui_framework.damage import DamageTracker
+from ui_framework.profiler import Profiler
+
 
 class Component:
     """UI 组件基类"""
@@ -37,6 +42,22 @@ class Component:
             child.parent = None
             self.children.remove(child)
 
+    def get_bounds(self):
+        """
+        获取组件在屏幕上占用的区域（子类可重写）
+
+        Returns:
+            tuple: (x, y, width, height)
+        """
+        return self.x, self.y, self.width, self.height
+
+    def invalidate(self):
+        """标记组件当前占用的区域需要重新传输到屏幕（状态改变时调用）"""
+        tracker = DamageTracker.active
+        if tracker is not None and not tracker.full:
+            x, y, w, h = self.get_bounds()
+            tracker.add(x, y, w, h)
+
     def render(self, display):
         """
         渲染组件（需要子类实现）
@@ -48,7 +69,13 @@ class Component:
             return
 
         # 渲染自己
-        self._render_self(display)
+        profiler = Profiler.active
+        if profiler is None:
+            self._render_self(display)
+        else:
+            start = time.ticks_us()
+            self._render_self(display)
+            profiler.record("comp.render", type(self).__name__, start)
 
         # 渲染所有子组件
         for child in self.children:
@@ -80,6 +107,56 @@ class Component:
         """处理组件自身的事件（子类重写此方法）"""
         return False
 
+    def is_idle(self):
+        """
+        组件是否处于静止状态（没有进行中的动画）
+
+        所有组件都静止时，框架会降低刷新频率并等待按键。
+
+        Returns:
+            bool: 是否静止
+        """
+        for child in self.children:
+            if not child.is_idle():
+                return False
+        return True
+
+    def get_wakeup_interval(self):
+        """
+        静止时需要再次更新的时间（用于光标闪烁等定时变化）
+
+        Returns:
+            int or None: 距离下一次需要更新的毫秒数，None 表示不需要定时更新
+        """
+        interval = None
+        for child in self.children:
+            child_interval = child.get_wakeup_interval()
+            if child_interval is not None and (
+                interval is None or child_interval < interval
+            ):
+                interval = child_interval
+        return interval
+
+    def get_repeat_keys(self, out):
+        """
+        收集组件需要自动重复（key_repeat 事件）的逻辑按键
+
+        Args:
+            out: 结果列表，追加按键名称
+        """
+        for child in self.children:
+            child.get_repeat_keys(out)
+
+    def get_prewarm_text(self, out):
+        """
+        收集组件将要显示的点阵字体文本，用于进入页面前预读字形
+
+        Args:
+            out: 结果列表，追加 (字体, 文本)
+        """
+        for child in self.children:
+            child.get_prewarm_text(out)
+
     def update(self, delta_time):
         """
         更新组件状态（用于动画等）
@@ -89,3 +166,132 @@ class Component:
         """
         for child in self.children:
             child.update(delta_time)
+
+
+class CursorBlinkMixin:
+    """
+    输入组件（Keyboard、NumPad、IPInput）的光标闪烁
+
+    使用的组件需要在初始化时调用 _init_cursor_blink()，渲染时按 cursor_visible 绘制光标。
+    """
+
+    # 光标闪烁间隔（秒）
+    cursor_blink_interval = 0.5
+
+    def _init_cursor_blink(self):
+        """初始化光标闪烁状态"""
+        self.cursor_blink_time = 0
+        self.cursor_visible = True
+
+    def get_wakeup_interval(self):
+        """光标闪烁需要定时唤醒（见 Component.get_wakeup_interval）"""
+        remaining = self.cursor_blink_interval - self.cursor_blink_time
+        interval = max(1, int(remaining * 1000))
+        child_interval = super().get_wakeup_interval()
+        if child_interval is not None and child_interval < interval:
+            return child_interval
+        return interval
+
+    def update(self, delta_time):
+        """更新光标闪烁"""
+        super().update(delta_time)
+
+        self.cursor_blink_time += delta_time
+        if self.cursor_blink_time >= self.cursor_blink_interval:
+            self.cursor_blink_time = 0
+            self.cursor_visible = not self.cursor_visible
+            self.invalidate()
+
+
+class CharMatrixMixin:
+    """
+    字符矩阵输入组件（Keyboard、NumPad）的公共逻辑
+
+    短按移动光标，组合键和长按编辑。组合键和长按之前的按下已经移动了光标，
+    编辑前恢复到按下之前记录的位置。
+    使用的组件需要提供 cursor_x、cursor_y、callback 和 move_cursor_*、
+    add_char、backspace、confirm_input 方法，并在初始化时调用 _init_cursor_history()。
+    """
+
+    def _init_cursor_history(self):
+        """初始化光标位置记录"""
+        # 最近两次按键移动光标之前的位置 (x, y)
+        self._cursor_history = [(0, 0), (0, 0)]
+
+    def _save_cursor(self):
+        """记录按键移动光标之前的位置"""
+        self._cursor_history[0] = self._cursor_history[1]
+        self._cursor_history[1] = (self.cursor_x, self.cursor_y)
+
+    def _restore_cursor(self, presses):
+        """
+        撤销最近几次按键造成的光标移动
+
+        Args:
+            presses: 撤销的按键次数（1 或 2）
+        """
+        self.cursor_x, self.cursor_y = self._cursor_history[2 - presses]
+        self.invalidate()
+
+    def _handle_self_event(self, event):
+        """处理光标移动、组合键和长按事件"""
+        event_type = event.type
+        key = event.key
+
+        # 处理短按事件 - 移动光标
+        if event_type == "key_press":
+            if key == "up":
+                self._save_cursor()
+                self.move_cursor_up()
+                return True
+            elif key == "down":
+                self._save_cursor()
+                self.move_cursor_down()
+                return True
+            elif key == "back":
+                self._save_cursor()
+                self.move_cursor_left()
+                return True
+            elif key == "ok":
+                self._save_cursor()
+                self.move_cursor_right()
+                return True
+
+        # 处理组合键（两个按键同时按下，不需要等待长按）：先撤销两次按下造成的光标移动
+        elif event_type == "key_chord":
+            if event.is_chord("back", "ok"):
+                # BACK+OK：添加字符
+                self._restore_cursor(2)
+                self.add_char()
+                return True
+            elif event.is_chord("up", "down"):
+                # UP+DOWN：退格
+                self._restore_cursor(2)
+                self.backspace()
+                return True
+
+        # 处理长按事件（InputManager 已保证每次长按只触发一次）
+        elif event_type == "key_long_press":
+            if key == "ok":
+                # 长按 OK：添加字符
+                self._restore_cursor(1)
+                self.add_char()
+                return True
+            elif key == "back":
+                # 长按 BACK：确认输入
+                self._restore_cursor(1)
+                self.confirm_input()
+                return True
+            elif key == "down":
+                # 长按 DOWN：取消输入
+                self._restore_cursor(1)
+                if self.callback:
+                    self.callback(None)
+                return True
+            elif key == "up":
+                # 长按 UP：退格
+                self._restore_cursor(1)
+                self.backspace()
+                return True
+
+        return False
@@ -19,19 +19,31 @@ class Button(Component):
             action: 点击回调函数
         """
         super().__init__(x, y, width, height)
-        self.text = text
+        self._text = text
         self.action = action
         self.pressed = False
 
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        if value != self._text:
+            self._text = value
+            self.invalidate()
+
     def press(self):
         """按下按钮"""
         self.pressed = True
+        self.invalidate()
         if self.action:
             self.action()
 
     def release(self):
         """释放按钮"""
         self.pressed = False
+        self.invalidate()
 
     def _render_self(self, display):
         """渲染按钮"""
@@ -51,11 +63,11 @@ class Button(Component):
 
     def _handle_self_event(self, event):
         """处理按钮事件"""
-        if event.get("type") == "key_press" and event.get("key") == "ok":
+        if event.type == "key_press" and event.key == "ok":
             if self.focused:
                 self.press()
                 return True
-        elif event.get("type") == "key_release" and event.get("key") == "ok":
+        elif event.type == "key_release" and event.key == "ok":
             if self.focused:
                 self.release()
                 return True
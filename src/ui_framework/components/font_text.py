@@ -0,0 +1,239 @@
+"""
+点阵字体文本组件
+通过 FontRegistry 读取字形，UnifontText 和 FusionText 都基于它
+
+测量、换行和对齐都使用 TextLayout 的排版结果（按文本、字体和最大宽度缓存），
+文本在排版变化时预渲染为每行一个缓冲区，之后每帧每行只需一次 blit。
+"""
+
+from ui_framework.components.base import Component
+from ui_framework.fonts import FontRegistry
+from ui_framework.text_layout import TextLayout
+
+
+class FontText(Component):
+    """点阵字体文本组件，支持中英文混合显示"""
+
+    # 默认字体名（子类指定）
+    FACE = None
+
+    # 预渲染缓冲区的大小上限（字节），超出时逐字渲染
+    RUN_LIMIT = 512
+
+    def __init__(
+        self,
+        text="",
+        x=0,
+        y=0,
+        color=1,
+        max_width=None,
+        auto_wrap=True,
+        align="left",
+        face=None,
+    ):
+        """
+        初始化文本组件
+
+        Args:
+            text: 显示的文本
+            x: x 坐标
+            y: y 坐标
+            color: 文本颜色 (0=黑, 1=白)
+            max_width: 最大行宽（用于自动换行），None 表示 120
+            auto_wrap: 是否自动换行
+            align: 对齐方式 ("left", "center", "right")
+            face: 字体名，None 表示使用类的 FACE
+        """
+        super().__init__(x, y)
+        self._text = text
+        self.color = color
+        self.max_width = max_width if max_width is not None else 120
+        self.auto_wrap = auto_wrap
+        self.align = align
+        self.face = FontRegistry.get_face(face or self.FACE)
+        self.line_height = self.face.height
+
+        # 当前排版及其参数（参数不变时每帧不再查找排版缓存）
+        self._layout = None
+        self._layout_text = None
+        self._layout_face = None
+        self._layout_max_width = None
+
+        # 预渲染结果：[(FrameBuffer, 行的 y 偏移), ...]，False 表示超出上限
+        self._run = None
+        self._run_layout = None
+
+    @classmethod
+    def measure(cls, text, face=None):
+        """
+        不创建组件计算文本宽度（不自动换行）
+
+        Args:
+            text: 文本
+            face: 字体名，None 表示使用类的 FACE
+
+        Returns:
+            int: 最宽一行的宽度（像素）
+        """
+        return TextLayout.get(face or cls.FACE, text).width
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        if value != self._text:
+            # 旧文本和新文本占用的区域都需要重新传输
+            self.invalidate()
+            self._text = value
+            self.invalidate()
+
+    def get_layout(self):
+        """
+        获取当前文本的排版
+
+        Returns:
+            TextLayout: 排版结果
+        """
+        max_width = self.max_width if self.auto_wrap else None
+        if (
+            self._layout is None
+            or self._text is not self._layout_text
+            or self.face is not self._layout_face
+            or max_width != self._layout_max_width
+        ):
+            self._layout = TextLayout.get(self.face, self._text, max_width)
+            self._layout_text = self._text
+            self._layout_face = self.face
+            self._layout_max_width = max_width
+        return self._layout
+
+    def _start_x(self, layout):
+        """按对齐方式计算行首的 x 坐标"""
+        if self.align == "center":
+            return self.x - layout.width // 2
+        if self.align == "right":
+            return self.x - layout.width
+        return self.x
+
+    def get_bounds(self):
+        """获取文本占用的区域（位图按整格计算）"""
+        if not self._text:
+            return self.x, self.y, 0, 0
+        layout = self.get_layout()
+        return self._start_x(layout), self.y, layout.extent, layout.height
+
+    def get_prewarm_text(self, out):
+        """收集当前文本（见 Component.get_prewarm_text）"""
+        if self._text:
+            out.append((self.face, self._text))
+        super().get_prewarm_text(out)
+
+    def _get_char_data(self, char):
+        """
+        获取字符的位图数据
+
+        Args:
+            char: 字符
+
+        Returns:
+            bytearray: 位图数据（格式为 self.face.glyph_format），如果字符不存在则返回 None
+        """
+        return FontRegistry.read_glyph(self.face, char)
+
+    def _render_self(self, display):
+        """渲染文本"""
+        if not self._text:
+            return
+
+        layout = self.get_layout()
+        start_x = self._start_x(layout)
+        if layout is not self._run_layout:
+            self._run = self._rasterize(layout)
+            self._run_layout = layout
+
+        if self._run is False:
+            self._render_glyphs(display, layout, start_x)
+            return
+        y = self.y
+        for fb, dy in self._run:
+            display.blit(fb, start_x, y + dy)
+
+    def _rasterize(self, layout):
+        """
+        把排版好的文本预渲染为每行一个缓冲区
+
+        Args:
+            layout: TextLayout
+
+        Returns:
+            list: [(FrameBuffer, 行的 y 偏移), ...]，总大小超过 RUN_LIMIT 时返回 False
+        """
+        face = self.face
+        size = 0
+        for _, _, _, extent in layout.lines:
+            size += FontRegistry.buffer_size(extent, face.height)
+        if size > self.RUN_LIMIT:
+            return False
+
+        text = layout.text
+        xs = layout.xs
+        FontRegistry.load_glyphs(face, text)
+        run = []
+        for index, (start, end, _, extent) in enumerate(layout.lines):
+            if extent <= 0:
+                continue
+            fb, _ = FontRegistry.make_buffer(extent, face.height)
+            for i in range(start, end):
+                glyph = FontRegistry.get_glyph(face, text[i])
+                if glyph is not None:
+                    fb.blit(glyph, xs[i], 0)
+            run.append((fb, index * self.line_height))
+        return run
+
+    def _render_glyphs(self, display, layout, start_x):
+        """逐字渲染（文本过长、不适合预渲染时使用）"""
+        face = self.face
+        text = layout.text
+        xs = layout.xs
+        FontRegistry.load_glyphs(face, text)
+        y = self.y
+        for start, end, _, _ in layout.lines:
+            for i in range(start, end):
+                # 字符不存在时跳过
+                fb = FontRegistry.get_glyph(face, text[i])
+                if fb is not None:
+                    display.blit(fb, start_x + xs[i], y)
+            y += self.line_height
+
+    def get_text_width(self, text=None):
+        """
+        计算文本宽度
+
+        Args:
+            text: 要计算的文本（不自动换行），None 表示使用 self.text（按当前排版）
+
+        Returns:
+            int: 最宽一行的宽度（像素）
+        """
+        if text is None:
+            return self.get_layout().width
+        return TextLayout.get(self.face, text).width
+
+    def get_text_height(self, text=None):
+        """
+        计算文本高度（考虑换行）
+
+        Args:
+            text: 要计算的文本，None 表示使用 self.text
+
+        Returns:
+            int: 文本高度（像素）
+        """
+        if text is None:
+            layout = self.get_layout()
+        else:
+            max_width = self.max_width if self.auto_wrap else None
+            layout = TextLayout.get(self.face, text, max_width)
+        return len(layout.lines) * self.line_height
@@ -5,7 +5,7 @@ IP地址输入组件
 
 import time
 
-from ui_framework.components.base import Component
+from ui_framework.components.base import Component, CursorBlinkMixin
 
 
 def get_time_ms():
@@ -18,7 +18,7 @@ def get_time_ms():
         return int(time.time() * 1000)
 
 
-class IPInput(Component):
+class IPInput(CursorBlinkMixin, Component):
     """IP地址输入组件"""
 
     def __init__(
@@ -52,10 +52,8 @@ class IPInput(Component):
         # 当前编辑的段索引（0-3）
         self.current_segment = 0
 
-        # 光标闪烁
-        self.cursor_blink_time = 0
-        self.cursor_blink_interval = 0.5
-        self.cursor_visible = True
+        # 光标闪烁（见 CursorBlinkMixin）
+        self._init_cursor_blink()
 
         # 布局参数
         self.title_y = 0
@@ -72,51 +70,47 @@ class IPInput(Component):
         """向左移动段"""
         if self.current_segment > 0:
             self.current_segment -= 1
+        self.invalidate()
 
     def move_segment_right(self):
         """向右移动段"""
         if self.current_segment < 3:
             self.current_segment += 1
+        self.invalidate()
 
     def increment_value(self):
         """增加当前段的值"""
         self.segments[self.current_segment] = (
             self.segments[self.current_segment] + 1
         ) % 256
+        self.invalidate()
 
     def decrement_value(self):
         """减少当前段的值"""
         self.segments[self.current_segment] = (
             self.segments[self.current_segment] - 1
         ) % 256
+        self.invalidate()
 
     def increment_value_fast(self):
         """快速增加当前段的值（+10）"""
         self.segments[self.current_segment] = (
             self.segments[self.current_segment] + 10
         ) % 256
+        self.invalidate()
 
     def decrement_value_fast(self):
         """快速减少当前段的值（-10）"""
         self.segments[self.current_segment] = (
             self.segments[self.current_segment] - 10
         ) % 256
+        self.invalidate()
 
     def confirm_input(self):
         """确认输入"""
         if self.callback:
             self.callback(self.get_ip_string())
 
-    def update(self, delta_time):
-        """更新组件状态"""
-        super().update(delta_time)
-
-        # 更新光标闪烁
-        self.cursor_blink_time += delta_time
-        if self.cursor_blink_time >= self.cursor_blink_interval:
-            self.cursor_blink_time = 0
-            self.cursor_visible = not self.cursor_visible
-
     def _render_self(self, display):
         """渲染IP地址输入界面"""
         # 渲染标题
@@ -150,8 +144,8 @@ class IPInput(Component):
 
     def _handle_self_event(self, event):
         """处理事件"""
-        event_type = event.get("type")
-        key = event.get("key")
+        event_type = event.type
+        key = event.key
 
         # 处理短按事件
         if event_type == "key_press":
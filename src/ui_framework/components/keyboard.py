@@ -1,11 +1,15 @@
 """
 键盘组件
 支持 ASCII 字符输入的虚拟键盘
+
+提供 CharPredictor 时，字符矩阵的第一行是预测的下一个字符（按可能性从高到低），
+每输入一个字符后预测行更新。光标停在原位置（预测不到的字符不需要从第一行重新移动过去），
+UP+OK 跳到最可能的字符上。
 """
 
 import time
 
-from ui_framework.components.base import Component
+from ui_framework.components.base import CharMatrixMixin, Component, CursorBlinkMixin
 
 
 def get_time_ms():
@@ -18,10 +22,12 @@ def get_time_ms():
         return int(time.time() * 1000)
 
 
-class Keyboard(Component):
+class Keyboard(CursorBlinkMixin, CharMatrixMixin, Component):
     """ASCII 字符键盘组件"""
 
-    def __init__(self, title="Input", default_value="", callback=None, x=0, y=0):
+    def __init__(
+        self, title="Input", default_value="", callback=None, x=0, y=0, predictor=None
+    ):
         """
         初始化键盘组件
 
@@ -31,43 +37,47 @@ class Keyboard(Component):
             callback: 完成回调函数，接收输入文本作为参数
             x: x 坐标
             y: y 坐标
+            predictor: CharPredictor，None 表示不显示预测行
         """
         super().__init__(x, y, width=128, height=64)
 
         self.title = title
         self.buffer = default_value
         self.callback = callback
+        self.predictor = predictor
 
         # ASCII 字符集（可打印字符）
-        self.chars = []
+        self.base_chars = []
         # 空格 (32)
-        self.chars.append(" ")
+        self.base_chars.append(" ")
         # 0-9 (48-57)
         for i in range(48, 58):
-            self.chars.append(chr(i))
+            self.base_chars.append(chr(i))
         # A-Z (65-90)
         for i in range(65, 91):
-            self.chars.append(chr(i))
+            self.base_chars.append(chr(i))
         # a-z (97-122)
         for i in range(97, 123):
-            self.chars.append(chr(i))
+            self.base_chars.append(chr(i))
         # 常用符号
         symbols = "!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"
         for s in symbols:
-            self.chars.append(s)
+            self.base_chars.append(s)
 
         # 字符矩阵布局配置
         self.cols = 16  # 每行16个字符
-        self.rows = (len(self.chars) + self.cols - 1) // self.cols
+        self.chars = self.base_chars
+        self.update_predictions()
 
         # 光标位置（在字符矩阵中）
         self.cursor_x = 0
         self.cursor_y = 0
 
-        # 光标闪烁
-        self.cursor_blink_time = 0
-        self.cursor_blink_interval = 0.5
-        self.cursor_visible = True
+        # 组合键和长按时恢复光标位置（见 CharMatrixMixin）
+        self._init_cursor_history()
+
+        # 光标闪烁（见 CursorBlinkMixin）
+        self._init_cursor_blink()
 
         # 布局参数
         self.title_y = 0
@@ -76,6 +86,24 @@ class Keyboard(Component):
         self.char_width = 8
         self.char_height = 8
 
+    def update_predictions(self):
+        """按当前输入更新预测行（没有预测器时只使用固定字符集）"""
+        if self.predictor is None:
+            self.chars = self.base_chars
+        else:
+            prev = self.buffer[-1] if self.buffer else ""
+            predicted = self.predictor.predict(prev, self.cols, self.base_chars)
+            self.chars = predicted + self.base_chars
+        self.rows = (len(self.chars) + self.cols - 1) // self.cols
+        self.invalidate()
+
+    def jump_to_prediction(self):
+        """把光标移到最可能的下一个字符（预测行的第一个字符）"""
+        if self.predictor is not None:
+            self.cursor_x = 0
+            self.cursor_y = 0
+            self.invalidate()
+
     def get_current_char(self):
         """获取当前光标位置的字符"""
         index = self.cursor_y * self.cols + self.cursor_x
@@ -87,6 +115,7 @@ class Keyboard(Component):
         """向上移动光标"""
         if self.cursor_y > 0:
             self.cursor_y -= 1
+        self.invalidate()
 
     def move_cursor_down(self):
         """向下移动光标"""
@@ -95,6 +124,7 @@ class Keyboard(Component):
             new_index = (self.cursor_y + 1) * self.cols + self.cursor_x
             if new_index < len(self.chars):
                 self.cursor_y += 1
+        self.invalidate()
 
     def move_cursor_left(self):
         """向左移动光标"""
@@ -109,6 +139,7 @@ class Keyboard(Component):
             while index >= len(self.chars) and self.cursor_x > 0:
                 self.cursor_x -= 1
                 index = self.cursor_y * self.cols + self.cursor_x
+        self.invalidate()
 
     def move_cursor_right(self):
         """向右移动光标"""
@@ -118,33 +149,32 @@ class Keyboard(Component):
             if self.cursor_x >= self.cols:
                 self.cursor_x = 0
                 self.cursor_y += 1
+        self.invalidate()
 
     def add_char(self):
         """添加当前字符到缓冲区"""
         char = self.get_current_char()
         if char is not None:
             self.buffer += char
+            if self.predictor is not None:
+                self.update_predictions()
+        self.invalidate()
 
     def backspace(self):
         """删除最后一个字符"""
         if len(self.buffer) > 0:
             self.buffer = self.buffer[:-1]
+            if self.predictor is not None:
+                self.update_predictions()
+        self.invalidate()
 
     def confirm_input(self):
-        """确认输入"""
+        """确认输入（有预测器时学习输入的文本）"""
+        if self.predictor is not None:
+            self.predictor.learn(self.buffer)
         if self.callback:
             self.callback(self.buffer)
 
-    def update(self, delta_time):
-        """更新组件状态"""
-        super().update(delta_time)
-
-        # 更新光标闪烁
-        self.cursor_blink_time += delta_time
-        if self.cursor_blink_time >= self.cursor_blink_interval:
-            self.cursor_blink_time = 0
-            self.cursor_visible = not self.cursor_visible
-
     def _render_self(self, display):
         """渲染键盘"""
         # 渲染标题
@@ -186,47 +216,9 @@ class Keyboard(Component):
                     display.text(char, x, y, 1)
 
     def _handle_self_event(self, event):
-        """处理键盘事件"""
-        event_type = event.get("type")
-        key = event.get("key")
-
-        # 处理短按事件 - 移动光标
-        if event_type == "key_press":
-            if key == "up":
-                self.move_cursor_up()
-                return True
-            elif key == "down":
-                self.move_cursor_down()
-                return True
-            elif key == "back":
-                self.move_cursor_left()
-                return True
-            elif key == "ok":
-                self.move_cursor_right()
-                return True
-
-        # 处理长按事件（InputManager 已保证每次长按只触发一次）
-        elif event_type == "key_long_press":
-            if key == "ok":
-                # 长按 OK：添加字符
-                self.move_cursor_left()
-                self.add_char()
-                return True
-            elif key == "back":
-                # 长按 BACK：确认输入
-                self.move_cursor_right()
-                self.confirm_input()
-                return True
-            elif key == "down":
-                # 长按 DOWN：取消输入
-                self.move_cursor_up()
-                if self.callback:
-                    self.callback(None)
-                return True
-            elif key == "up":
-                # 长按 UP：退格
-                self.move_cursor_down()
-                self.backspace()
-                return True
-
-        return False
+        """处理键盘事件（光标移动、组合键和长按见 CharMatrixMixin）"""
+        if event.is_chord("up", "ok") and self.predictor is not None:
+            # UP+OK：跳到最可能的下一个字符
+            self.jump_to_prediction()
+            return True
+        return super()._handle_self_event(event)
@@ -19,10 +19,20 @@ class Label(Component):
             border: 是否显示边框
         """
         super().__init__(x, y, width, height)
-        self.text = text
+        self._text = text
         self.border = border
         self.align = "left"  # left, center, right
 
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        if value != self._text:
+            self._text = value
+            self.invalidate()
+
     def _render_self(self, display):
         """渲染标签"""
         if self.border:
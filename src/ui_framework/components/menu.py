@@ -29,6 +29,8 @@ class Menu(Component):
 
         # 设置文本类
         self.text_class = text_class if text_class is not None else Text
+        # 自定义字体的文本组件（按文本复用，保留预渲染结果）
+        self._text_components = {}
 
         # 根据文本类的 SIZE 属性计算 item_height 和 max_visible_items
         self.item_height = self.text_class.SIZE + 4  # 文字高度 + 上下边距
@@ -45,11 +47,13 @@ class Menu(Component):
     def add_item(self, label, action=None):
         """添加菜单项"""
         self.items.append({"label": label, "action": action})
+        self.invalidate()
 
     def select_next(self):
         """选择下一项"""
         if self.selected_index < len(self.items) - 1:
             self.selected_index += 1
+            self.invalidate()
             # 自动滚动
             if self.selected_index >= self.scroll_offset + self.max_visible_items:
                 self.scroll_offset += 1
@@ -64,6 +68,7 @@ class Menu(Component):
         """选择上一项"""
         if self.selected_index > 0:
             self.selected_index -= 1
+            self.invalidate()
             # 自动滚动
             if self.selected_index < self.scroll_offset:
                 self.scroll_offset -= 1
@@ -100,6 +105,12 @@ class Menu(Component):
             self.anim_target_y = new_target
             self.anim_time = 0.0
 
+    def is_idle(self):
+        """选择框动画结束后即为静止"""
+        if self.anim_enabled and self.anim_time < self.anim_duration:
+            return False
+        return super().is_idle()
+
     def update(self, delta_time):
         """更新动画状态"""
         super().update(delta_time)
@@ -110,6 +121,7 @@ class Menu(Component):
         # 更新选择框动画
         if self.anim_time < self.anim_duration:
             self.anim_time += delta_time
+            self.invalidate()
 
             # 限制时间不超过动画时长
             if self.anim_time >= self.anim_duration:
@@ -145,26 +157,37 @@ class Menu(Component):
             display.text(text, x, y, 1)
         else:
             # 使用自定义字体类（UnifontText 或 FusionText）
-            text_component = self.text_class(text=text, x=x, y=y, color=1)
+            components = self._text_components
+            text_component = components.get(text)
+            if text_component is None:
+                # 菜单项变化后丢弃不再使用的文本
+                if len(components) > len(self.items) + 1:
+                    components.clear()
+                text_component = self.text_class(text=text, x=x, y=y, color=1)
+                components[text] = text_component
+            text_component.x = x
+            text_component.y = y
             text_component._render_self(display)
 
+    def get_repeat_keys(self, out):
+        """按住上下键时连续移动选择（见 Component.get_repeat_keys）"""
+        out.append("up")
+        out.append("down")
+        super().get_repeat_keys(out)
+
+    def get_prewarm_text(self, out):
+        """收集标题和所有菜单项（见 Component.get_prewarm_text）"""
+        face = getattr(self.text_class, "FACE", None)
+        if face is not None:
+            out.append((face, self.title))
+            for item in self.items:
+                out.append((face, item["label"]))
+        super().get_prewarm_text(out)
+
     def _render_self(self, display):
         """渲染菜单"""
         # 渲染标题（居中）
-        if self.text_class == Text:
-            title_text_width = len(self.title) * 8
-        else:
-            # 对于自定义字体，估算宽度
-            # 获取字符宽度常量（FusionText: 6/12, UnifontText: 8/16）
-            ascii_width = self.text_class.SIZE // 2
-            cjk_width = self.text_class.SIZE
-            title_text_width = 0
-            for char in self.title:
-                if ord(char) < 128:
-                    title_text_width += ascii_width
-                else:
-                    title_text_width += cjk_width
-
+        title_text_width = self.text_class.measure(self.title)
         title_x = self.x + (self.width - title_text_width) // 2
         self._render_text(display, self.title, title_x, self.y + 2)
 
@@ -217,8 +240,9 @@ class Menu(Component):
 
     def _handle_self_event(self, event):
         """处理菜单事件"""
-        if event.get("type") == "key_press":
-            key = event.get("key")
+        event_type = event.type
+        if event_type == "key_press":
+            key = event.key
             if key == "up":
                 self.select_prev()
                 return True
@@ -227,4 +251,12 @@ class Menu(Component):
                 return True
             elif key == "ok":
                 return self.activate_selected()
+        elif event_type == "key_repeat":
+            key = event.key
+            if key == "up":
+                self.select_prev()
+                return True
+            elif key == "down":
+                self.select_next()
+                return True
         return False
@@ -5,7 +5,7 @@
 
 import time
 
-from ui_framework.components.base import Component
+from ui_framework.components.base import CharMatrixMixin, Component, CursorBlinkMixin
 
 
 def get_time_ms():
@@ -18,7 +18,7 @@ def get_time_ms():
         return int(time.time() * 1000)
 
 
-class NumPad(Component):
+class NumPad(CursorBlinkMixin, CharMatrixMixin, Component):
     """数字键盘组件"""
 
     def __init__(self, title="Number", default_value="", callback=None, x=0, y=0):
@@ -49,10 +49,11 @@ class NumPad(Component):
         self.cursor_x = 0
         self.cursor_y = 0
 
-        # 光标闪烁
-        self.cursor_blink_time = 0
-        self.cursor_blink_interval = 0.5
-        self.cursor_visible = True
+        # 组合键和长按时恢复光标位置（见 CharMatrixMixin）
+        self._init_cursor_history()
+
+        # 光标闪烁（见 CursorBlinkMixin）
+        self._init_cursor_blink()
 
         # 布局参数
         self.title_y = 0
@@ -72,11 +73,13 @@ class NumPad(Component):
         """向上移动光标"""
         if self.cursor_y > 0:
             self.cursor_y -= 1
+        self.invalidate()
 
     def move_cursor_down(self):
         """向下移动光标"""
         if self.cursor_y < self.rows - 1:
             self.cursor_y += 1
+        self.invalidate()
 
     def move_cursor_left(self):
         """向左移动光标"""
@@ -85,6 +88,7 @@ class NumPad(Component):
         elif self.cursor_y > 0:
             self.cursor_y -= 1
             self.cursor_x = self.cols - 1
+        self.invalidate()
 
     def move_cursor_right(self):
         """向右移动光标"""
@@ -93,33 +97,26 @@ class NumPad(Component):
         elif self.cursor_y < self.rows - 1:
             self.cursor_x = 0
             self.cursor_y += 1
+        self.invalidate()
 
     def add_char(self):
         """添加当前字符到缓冲区"""
         char = self.get_current_char()
         if char is not None:
             self.buffer += char
+        self.invalidate()
 
     def backspace(self):
         """删除最后一个字符"""
         if len(self.buffer) > 0:
             self.buffer = self.buffer[:-1]
+        self.invalidate()
 
     def confirm_input(self):
         """确认输入"""
         if self.callback:
             self.callback(self.buffer)
 
-    def update(self, delta_time):
-        """更新组件状态"""
-        super().update(delta_time)
-
-        # 更新光标闪烁
-        self.cursor_blink_time += delta_time
-        if self.cursor_blink_time >= self.cursor_blink_interval:
-            self.cursor_blink_time = 0
-            self.cursor_visible = not self.cursor_visible
-
     def _render_self(self, display):
         """渲染数字键盘"""
         # 渲染标题
@@ -155,49 +152,3 @@ class NumPad(Component):
                 else:
                     display.rect(x, y, self.char_width - 4, self.char_height, 1)
                     display.text(char, x + 2, y + 1, 1)
-
-    def _handle_self_event(self, event):
-        """处理键盘事件"""
-        event_type = event.get("type")
-        key = event.get("key")
-
-        # 处理短按事件 - 移动光标
-        if event_type == "key_press":
-            if key == "up":
-                self.move_cursor_up()
-                return True
-            elif key == "down":
-                self.move_cursor_down()
-                return True
-            elif key == "back":
-                self.move_cursor_left()
-                return True
-            elif key == "ok":
-                self.move_cursor_right()
-                return True
-
-        # 处理长按事件
-        elif event_type == "key_long_press":
-            if key == "ok":
-                # 长按 OK：添加字符
-                self.move_cursor_left()
-                self.add_char()
-                return True
-            elif key == "back":
-                # 长按 BACK：确认输入
-                self.move_cursor_right()
-                self.confirm_input()
-                return True
-            elif key == "down":
-                # 长按 DOWN：取消输入
-                self.move_cursor_up()
-                if self.callback:
-                    self.callback(None)
-                return True
-            elif key == "up":
-                # 长按 UP：退格
-                self.move_cursor_down()
-                self.backspace()
-                return True
-
-        return False
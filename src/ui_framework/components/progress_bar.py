@@ -27,7 +27,10 @@ class ProgressBar(Component):
 
     def set_value(self, value):
         """设置进度值"""
-        self.value = max(0, min(value, self.max_value))
+        value = max(0, min(value, self.max_value))
+        if value != self.value:
+            self.value = value
+            self.invalidate()
 
     def _render_self(self, display):
         """渲染进度条"""
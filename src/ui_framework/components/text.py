@@ -21,10 +21,45 @@ class Text(Component):
             color: 文本颜色 (0=黑, 1=白)
         """
         super().__init__(x, y)
-        self.text = text
+        self._text = text
         self.color = color
         self.align = align
 
+    @classmethod
+    def measure(cls, text):
+        """
+        计算文本宽度（8x8 字体）
+
+        Args:
+            text: 文本
+
+        Returns:
+            int: 文本宽度（像素）
+        """
+        return len(text) * 8
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        if value != self._text:
+            # 旧文本和新文本占用的区域都需要重新传输
+            self.invalidate()
+            self._text = value
+            self.invalidate()
+
+    def get_bounds(self):
+        """获取文本占用的区域"""
+        text_width = len(self._text) * 8
+        x = self.x
+        if self.align == "center":
+            x = self.x - text_width // 2
+        elif self.align == "right":
+            x = self.x - text_width
+        return x, self.y, text_width, 8
+
     def _render_self(self, display):
         """渲染文本"""
         if not self.text:
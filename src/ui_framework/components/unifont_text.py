@@ -2,224 +2,33 @@
 Unifont 文本组件
 """
 
-import framebuf
+from ui_framework.components.font_text import FontText
+from ui_framework.fonts import FontRegistry
+from ui_framework.text_layout import TextLayout
 
-from ui_framework.components.base import Component
 
-
-class UnifontText(Component):
-    """Unifont 文本组件，支持中英文混合显示"""
+class UnifontText(FontText):
+    """Unifont 文本组件，支持中英文混合显示（中文16x16，英文8x16）"""
 
     SIZE = 16
-
-    # 类级别的共享资源
-    _unifont_index = None
-    _unifont_file = None
-    _unifont_cache = {}
-    _initialized = False
+    FACE = "unifont"
 
     @classmethod
-    def init_unifont(cls, bin_path, chars_path):
+    def init_unifont(cls, bin_path, chars_path=None, index_path=None):
         """
         初始化 Unifont 字体资源（全局调用一次）
 
         Args:
-            bin_path: unifont.bin 文件路径
-            chars_path: chars.txt 文件路径
+            bin_path: 字体文件路径（v2 的 unifont.fnt，或 v1 的 unifont.bin）
+            chars_path: chars.txt 文件路径（仅 v1，没有索引文件时使用）
+            index_path: 字形索引文件路径（如 chars.idx，所有字体共享；v1 字体和共用索引的 v2 字体需要）
         """
-        if cls._initialized:
-            return
-
-        # 加载索引字符串到 RAM
-        with open(chars_path, "r", encoding="utf-8") as f:
-            cls._unifont_index = f.read()
-
-        # 打开字体文件（保持打开状态）
-        cls._unifont_file = open(bin_path, "rb")
-        cls._initialized = True
+        if chars_path or index_path:
+            FontRegistry.init(chars_path, index_path)
+        FontRegistry.register(cls.FACE, bin_path, height=16, ascii_width=8, cjk_width=16)
 
     @classmethod
     def cleanup(cls):
         """清理资源"""
-        if cls._unifont_file:
-            cls._unifont_file.close()
-            cls._unifont_file = None
-        cls._unifont_index = None
-        cls._unifont_cache.clear()
-        cls._initialized = False
-
-    def __init__(
-        self, text="", x=0, y=0, color=1, max_width=None, auto_wrap=True, align="left"
-    ):
-        """
-        初始化 Unifont 文本组件
-
-        Args:
-            text: 显示的文本
-            x: x 坐标
-            y: y 坐标
-            color: 文本颜色 (0=黑, 1=白)
-            max_width: 最大宽度（用于自动换行），None 表示 120
-            auto_wrap: 是否自动换行
-            align: 对齐方式 ("left", "center", "right")
-        """
-        super().__init__(x, y)
-        self.text = text
-        self.color = color
-        self.max_width = max_width if max_width is not None else 120
-        self.auto_wrap = auto_wrap
-        self.align = align
-        self.line_height = 16
-
-    def _get_char_data(self, char):
-        """
-        获取字符的位图数据
-
-        Args:
-            char: 字符
-
-        Returns:
-            bytes: 32 字节的位图数据，如果字符不存在则返回 None
-        """
-        if not self.__class__._initialized:
-            raise RuntimeError(
-                "UnifontText 未初始化，请先调用 UnifontText.init_unifont()"
-            )
-
-        # 检查缓存
-        if char in self.__class__._unifont_cache:
-            return self.__class__._unifont_cache[char]
-
-        try:
-            # 检查资源是否可用
-            if (
-                self.__class__._unifont_index is None
-                or self.__class__._unifont_file is None
-            ):
-                return None
-
-            # 在索引中查找字符
-            idx = self.__class__._unifont_index.find(char)
-            if idx == -1:
-                return None
-
-            # 读取字体数据
-            self.__class__._unifont_file.seek(idx * 32)
-            data = self.__class__._unifont_file.read(32)
-
-            # 缓存字符（限制缓存大小）
-            if len(self.__class__._unifont_cache) < 500:
-                self.__class__._unifont_cache[char] = data
-
-            return data
-        except:
-            return None
-
-    def _render_self(self, display):
-        """渲染文本"""
-        if not self.text:
-            return
-
-        # 处理对齐方式
-        start_x = self.x
-        if self.align == "center":
-            text_width = self.get_text_width()
-            start_x = self.x - text_width // 2
-        elif self.align == "right":
-            text_width = self.get_text_width()
-            start_x = self.x - text_width
-
-        cursor_x = start_x
-        cursor_y = self.y
-
-        for char in self.text:
-            # 换行处理
-            if char == "\n":
-                cursor_y += self.line_height
-                cursor_x = start_x
-                continue
-
-            code = ord(char)
-            is_ascii = code < 128
-
-            # 获取位图
-            bitmap = self._get_char_data(char)
-            if not bitmap:
-                # 如果字符不存在，跳过并移动光标
-                cursor_x += 8 if is_ascii else 16
-                continue
-
-            # 渲染字符
-            if is_ascii:
-                # ASCII 字符：16x16 位图，但只占用 8 像素宽度
-                fb = framebuf.FrameBuffer(bytearray(bitmap), 16, 16, framebuf.MONO_HLSB)
-                display.blit(fb, cursor_x, cursor_y)
-                cursor_x += 8
-            else:
-                # 中文字符：16x16 位图，占用 16 像素宽度
-                fb = framebuf.FrameBuffer(bytearray(bitmap), 16, 16, framebuf.MONO_HLSB)
-                display.blit(fb, cursor_x, cursor_y)
-                cursor_x += 16
-
-            # 自动换行
-            if self.auto_wrap and cursor_x > self.max_width:
-                cursor_x = start_x
-                cursor_y += self.line_height
-
-    def get_text_width(self, text=None):
-        """
-        计算文本宽度
-
-        Args:
-            text: 要计算的文本，None 表示使用 self.text
-
-        Returns:
-            int: 文本宽度（像素）
-        """
-        if text is None:
-            text = self.text
-
-        width = 0
-        for char in text:
-            if char == "\n":
-                continue
-            code = ord(char)
-            is_ascii = code < 128
-            width += 8 if is_ascii else 16
-
-        return width
-
-    def get_text_height(self, text=None):
-        """
-        计算文本高度（考虑换行）
-
-        Args:
-            text: 要计算的文本，None 表示使用 self.text
-
-        Returns:
-            int: 文本高度（像素）
-        """
-        if text is None:
-            text = self.text
-
-        lines = 1
-        cursor_x = 0
-
-        for char in text:
-            if char == "\n":
-                lines += 1
-                cursor_x = 0
-                continue
-
-            code = ord(char)
-            is_ascii = code < 128
-            char_width = 8 if is_ascii else 16
-
-            # 检查是否需要自动换行
-            if self.auto_wrap and cursor_x + char_width > self.max_width:
-                lines += 1
-                cursor_x = char_width
-            else:
-                cursor_x += char_width
-
-        return lines * self.line_height
+        FontRegistry.unregister(cls.FACE)
+        TextLayout.clear_cache()
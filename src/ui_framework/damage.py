@@ -0,0 +1,116 @@
+"""
+脏区域跟踪
+记录组件状态变化时损坏的屏幕区域，并合并为 SSD1306 的 page/column 传输窗口
+"""
+
+
+class DamageTracker:
+    """脏区域跟踪器，按 8 行一个 page 记录需要重新传输的列区间"""
+
+    # 当前生效的跟踪器（由 PageManager 设置，组件通过它上报脏区域）
+    active = None  # type: DamageTracker | None
+
+    # 每开一个新传输窗口的额外开销（约 6 条命令，按字节估算）
+    WINDOW_COST = 18
+
+    def __init__(self, width=128, height=64):
+        """
+        初始化跟踪器
+
+        Args:
+            width: 屏幕宽度
+            height: 屏幕高度
+        """
+        self.width = width
+        self.height = height
+        self.pages = height // 8
+        self.col_min = [width] * self.pages
+        self.col_max = [-1] * self.pages
+        self.full = True  # 首帧总是整屏传输
+
+    def add(self, x, y, w, h):
+        """
+        标记一个矩形区域为脏区域
+
+        Args:
+            x, y: 左上角坐标
+            w, h: 宽度和高度
+        """
+        if self.full or w <= 0 or h <= 0:
+            return
+
+        # 裁剪到屏幕范围
+        x0 = max(0, x)
+        x1 = min(self.width - 1, x + w - 1)
+        y0 = max(0, y)
+        y1 = min(self.height - 1, y + h - 1)
+        if x0 > x1 or y0 > y1:
+            return
+
+        for page in range(y0 >> 3, (y1 >> 3) + 1):
+            if x0 < self.col_min[page]:
+                self.col_min[page] = x0
+            if x1 > self.col_max[page]:
+                self.col_max[page] = x1
+
+    def invalidate_all(self):
+        """标记整屏为脏区域"""
+        self.full = True
+
+    def clear(self):
+        """清空所有脏区域"""
+        self.full = False
+        for page in range(self.pages):
+            self.col_min[page] = self.width
+            self.col_max[page] = -1
+
+    def is_empty(self):
+        """是否没有任何脏区域"""
+        if self.full:
+            return False
+        for page in range(self.pages):
+            if self.col_max[page] >= 0:
+                return False
+        return True
+
+    def spans(self):
+        """
+        获取合并后的传输窗口
+
+        相邻的脏 page 在合并带来的多余字节少于新开窗口的开销时合并为一个窗口。
+
+        Returns:
+            list: [(x0, x1, page0, page1), ...]
+        """
+        if self.full:
+            return [(0, self.width - 1, 0, self.pages - 1)]
+
+        result = []
+        current = None  # [x0, x1, page0, page1, 实际脏字节数]
+        for page in range(self.pages):
+            x0 = self.col_min[page]
+            x1 = self.col_max[page]
+            if x1 < 0:
+                if current:
+                    result.append(tuple(current[:4]))
+                    current = None
+                continue
+
+            if current:
+                mx0 = min(current[0], x0)
+                mx1 = max(current[1], x1)
+                dirty = current[4] + x1 - x0 + 1
+                merged = (mx1 - mx0 + 1) * (page - current[2] + 1)
+                if merged - dirty <= self.WINDOW_COST:
+                    current[0] = mx0
+                    current[1] = mx1
+                    current[3] = page
+                    current[4] = dirty
+                    continue
+                result.append(tuple(current[:4]))
+
+            current = [x0, x1, page, page, x1 - x0 + 1]
+
+        if current:
+            result.append(tuple(current[:4]))
+        return result
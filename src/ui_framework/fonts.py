@@ -0,0 +1,687 @@
+"""
+字体注册表
+所有点阵字体共享一个字符索引、一组打开的字体文件和一个字形缓存
+
+字形缓存保存可以直接 blit 的 FrameBuffer（使用屏幕的原生格式），
+按字节预算做 LRU 淘汰，渲染已缓存的字符时不再分配内存。
+
+支持两种字体文件（由 scripts/generate_font_bin.py 生成）：
+    v1: 无文件头的 16 x 高度 MONO_HLSB 位图，字形顺序与共享的字符索引一致，
+        ASCII 字符和其他字符分别使用固定的步进宽度
+    v2: 文件头 + 内嵌字形索引 + 每个字形的步进宽度 + MONO_VLSB 位图，格式如下（小端序）：
+        0   4  魔数 b"ZFNT"
+        4   2  版本号（2）
+        6   1  位图格式（0 = MONO_VLSB，1 = MONO_HLSB）
+        7   1  格子宽度
+        8   1  格子高度
+        9   1  默认 ASCII 步进宽度（字符不存在时使用）
+        10  1  默认其他字符步进宽度
+        11  1  压缩方式（0 = 不压缩，1 = 按块 raw deflate 压缩）
+        12  2  每个字形的字节数（解压后）
+        14  2  每个压缩块的字形数（不压缩时为 0）
+        16  4  字形数 N
+        20  4  字形索引的位置（格式见 glyph_index.py），0 表示使用 FontRegistry 共享的索引
+        24  4  步进宽度表的位置（N 字节，按字形序号排列）
+        28  4  位图数据的位置（N 个字形依次排列）
+    压缩的 v2 字体在位图数据的位置存放块位置表（块数 + 1 个 u32 文件位置），
+    每块是连续若干字形位图的 raw deflate 数据（窗口 2^FONT_WBITS），读取时整块解压到复用的缓冲区
+    （解压器本身每次新建，见 FontRegistry._inflate）。
+    v2 字体中不存在的字符显示为替代字符 U+FFFD 的字形（生成工具总会加入一个方框）。
+    字符集相同的 v2 字体可以共用一个索引文件（字形按码点排序），设备上只保存和加载一份索引。
+
+使用方式：
+    FontRegistry.register("unifont", "/assets/unifont.fnt")
+    fb = FontRegistry.get_glyph("unifont", "中")
+
+    # 共用索引的 v2 字体先加载共享的索引
+    FontRegistry.init(index_path="/assets/chars.idx")
+    FontRegistry.register("unifont", "/assets/unifont.fnt")
+
+    # v1 字体需要共享的字符索引和字体尺寸
+    FontRegistry.init(index_path="/assets/chars.idx", chars_path="/assets/chars.txt")
+    FontRegistry.register("unifont", "/assets/unifont.bin", height=16, ascii_width=8, cjk_width=16)
+"""
+
+import array
+import io
+import struct
+
+import framebuf
+
+from ui_framework.glyph_index import GlyphIndex, load_index
+
+try:
+    import deflate
+except ImportError:
+    # 固件没有 deflate 模块时只能使用不压缩的字体
+    deflate = None
+
+FONT_MAGIC = b"ZFNT"
+# 字体中不存在的字符使用这个字符的字形
+FALLBACK_CHAR = "\ufffd"
+FONT_HEADER_SIZE = 32
+# v2 文件头中的位图格式
+FONT_FORMATS = (framebuf.MONO_VLSB, framebuf.MONO_HLSB)
+# v2 文件头中的压缩方式
+COMPRESS_NONE = 0
+COMPRESS_DEFLATE = 1
+# 压缩字体的 deflate 窗口大小（2 的幂次）
+FONT_WBITS = 10
+
+
+class FontFace:
+    """一种字体（一个字体文件）"""
+
+    def __init__(
+        self, name, bin_path, height=None, ascii_width=None, cjk_width=None, glyph_width=16
+    ):
+        """
+        打开字体文件，v2 文件的尺寸参数从文件头读取
+
+        Args:
+            name: 字体名
+            bin_path: 字体文件路径
+            height: 字形高度（行数，仅 v1）
+            ascii_width: ASCII 字符的步进宽度（仅 v1）
+            cjk_width: 其他字符的步进宽度（仅 v1）
+            glyph_width: 字形位图宽度（仅 v1，MONO_HLSB，每行按字节对齐）
+        """
+        self.name = name
+        self.file = open(bin_path, "rb")
+        # 字符 -> [FrameBuffer 或 None（字符不存在）, 最近使用序号, 占用字节数, 步进宽度]
+        self.cache = {}
+
+        header = self.file.read(FONT_HEADER_SIZE)
+        if header[:4] == FONT_MAGIC:
+            self._load_v2(header)
+            return
+
+        if height is None:
+            self.file.close()
+            raise ValueError("v1 字体 {} 需要指定尺寸".format(bin_path))
+        self.version = 1
+        self.height = height
+        self.ascii_width = ascii_width
+        self.cjk_width = cjk_width
+        self.glyph_width = glyph_width
+        self.glyph_format = framebuf.MONO_HLSB
+        self.bytes_per_glyph = (glyph_width + 7) // 8 * height
+        self.data_offset = 0
+        self.widths_offset = 0
+        self.index = None  # 使用 FontRegistry 的共享索引
+        self.fallback = -1
+        self.ascii_advance = None
+        self.compression = COMPRESS_NONE
+
+    def _load_v2(self, header):
+        (
+            version,
+            fmt,
+            self.glyph_width,
+            self.height,
+            self.ascii_width,
+            self.cjk_width,
+            self.compression,
+            self.bytes_per_glyph,
+            self.block_glyphs,
+            count,
+            index_offset,
+            self.widths_offset,
+            self.data_offset,
+        ) = struct.unpack_from("<HBBBBBBHHIIII", header, 4)
+        if version != 2 or fmt >= len(FONT_FORMATS):
+            self.file.close()
+            raise ValueError("unsupported font version or format")
+        if self.compression == COMPRESS_DEFLATE and deflate is not None:
+            # 块位置表常驻 RAM，压缩数据和解压后的块都保存在复用的缓冲区中
+            blocks = (count + self.block_glyphs - 1) // self.block_glyphs
+            offsets = array.array("I", [0] * (blocks + 1))
+            self.file.seek(self.data_offset)
+            self.file.readinto(offsets)
+            self.block_offsets = offsets
+            longest = 0
+            for block in range(blocks):
+                longest = max(longest, offsets[block + 1] - offsets[block])
+            self.compressed = bytearray(longest)
+            self.compressed_view = memoryview(self.compressed)
+            # 解压器的输入流，预先写满最长的块，之后每次覆盖写入不再扩容
+            self.compressed_stream = io.BytesIO(self.compressed)
+            self.block_buffer = bytearray(self.block_glyphs * self.bytes_per_glyph)
+            self.block_view = memoryview(self.block_buffer)
+            self.block = -1  # 缓冲区中的块序号
+        elif self.compression != COMPRESS_NONE:
+            self.file.close()
+            raise ValueError("unsupported font compression")
+        self.version = version
+        self.glyph_format = FONT_FORMATS[fmt]
+        if index_offset:
+            self.index = GlyphIndex(self.file, index_offset)
+            index = self.index
+        else:
+            # 使用共享的索引（必须是字形按码点排序、字形数相同的索引）
+            self.index = None
+            index = FontRegistry.index
+            if not isinstance(index, GlyphIndex) or len(index) != count:
+                self.file.close()
+                raise ValueError("font needs a matching shared glyph index")
+        self.fallback = index.find(FALLBACK_CHAR)
+
+        # ASCII 字符的步进宽度常驻 RAM，测量文本宽度时不需要读文件
+        self.ascii_advance = bytearray(128)
+        for code in range(128):
+            char = chr(code)
+            self.ascii_advance[code] = self.glyph_advance(char, index.find(char))
+
+    def close(self):
+        """关闭字体文件并清空缓存"""
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+        if self.file:
+            self.file.close()
+            self.file = None
+        self.cache.clear()
+
+    def glyph_advance(self, char, glyph):
+        """
+        字形的步进宽度
+
+        Args:
+            char: 字符
+            glyph: 字形序号，-1 表示字符不存在（有替代字符时使用替代字符的宽度）
+
+        Returns:
+            int: 步进宽度（像素）
+        """
+        if glyph == -1:
+            glyph = self.fallback
+        if self.version == 2 and glyph != -1:
+            self.file.seek(self.widths_offset + glyph)
+            return self.file.read(1)[0]
+        return self.ascii_width if ord(char) < 128 else self.cjk_width
+
+    def char_width(self, char):
+        """字符的步进宽度"""
+        code = ord(char)
+        if code < 128:
+            if self.ascii_advance is not None:
+                return self.ascii_advance[code]
+            return self.ascii_width
+        if self.version == 2:
+            return FontRegistry.get_advance(self, char)
+        return self.cjk_width
+
+    def text_width(self, text):
+        """单行文本宽度（忽略换行符）"""
+        if self.version == 2:
+            # 非 ASCII 字符的宽度随字形一起读取，先批量加载
+            FontRegistry.load_glyphs(self, text)
+        width = 0
+        for char in text:
+            if char == "\n":
+                continue
+            width += self.char_width(char)
+        return width
+
+
+class FontRegistry:
+    """字体注册表（类级别共享）"""
+
+    # 所有字体共享的字符索引（GlyphIndex 或 chars.txt 字符串）
+    index = None
+    faces = {}  # 字体名 -> FontFace
+
+    # 字形缓存的字节预算（所有字体共用）
+    cache_budget = 16 * 1024
+    cache_used = 0
+    # 每个缓存条目除位图外的估计开销（FrameBuffer、bytearray、列表和字典项）
+    ENTRY_OVERHEAD = 96
+    # 超出预算时一次淘汰到预算的这个比例，避免每次插入都扫描缓存
+    EVICT_RATIO = 3 / 4
+
+    # 缓存字形使用的格式（UIFramework 设置为屏幕的原生格式）
+    format = framebuf.MONO_VLSB
+
+    # 批量加载字形时使用的读取缓冲区大小（字节），能放进同一个缓冲区的字形合并为一次读取
+    # （闪存上一次读取的固定开销远大于多读几百字节）
+    READ_BUFFER_SIZE = 1024
+    _read_buffer = None
+
+    _tick = 0
+    hits = 0
+    misses = 0
+    reads = 0  # 读取字体文件的次数
+    inflates = 0  # 解压字形块的次数
+
+    @classmethod
+    def init(cls, chars_path=None, index_path=None):
+        """
+        加载共享的字符索引（全局调用一次，重复调用无效）
+
+        Args:
+            chars_path: chars.txt 文件路径（没有索引文件时使用，仅 v1 字体）
+            index_path: 字形索引文件路径（如 chars.idx）
+        """
+        if cls.index is None:
+            cls.index = load_index(chars_path, index_path)
+
+    @classmethod
+    def register(
+        cls, name, bin_path, height=None, ascii_width=None, cjk_width=None, glyph_width=16
+    ):
+        """
+        注册一种字体，已注册的同名字体保持不变
+
+        Args:
+            name: 字体名
+            bin_path: 字体文件路径
+            height, ascii_width, cjk_width, glyph_width: 见 FontFace（v2 字体不需要）
+
+        Returns:
+            FontFace: 字体
+        """
+        face = cls.faces.get(name)
+        if face is None:
+            face = FontFace(name, bin_path, height, ascii_width, cjk_width, glyph_width)
+            cls.faces[name] = face
+        return face
+
+    @classmethod
+    def get_face(cls, name):
+        """
+        获取已注册的字体
+
+        Raises:
+            RuntimeError: 字体未注册
+        """
+        face = cls.faces.get(name)
+        if face is None:
+            raise RuntimeError("字体 {} 未注册，请先调用 FontRegistry.register()".format(name))
+        return face
+
+    @classmethod
+    def set_format(cls, fmt):
+        """
+        设置缓存字形的 FrameBuffer 格式（与屏幕格式一致时 blit 无需转换）
+
+        Args:
+            fmt: framebuf 格式常量
+        """
+        if fmt != cls.format:
+            cls.format = fmt
+            cls.clear_cache()
+
+    @classmethod
+    def set_cache_budget(cls, budget):
+        """
+        设置字形缓存的字节预算
+
+        Args:
+            budget: 字节数
+        """
+        cls.cache_budget = budget
+        if cls.cache_used > budget:
+            cls._evict(int(budget * cls.EVICT_RATIO))
+
+    @classmethod
+    def find_glyph(cls, face, char):
+        """
+        查找字符在字体中的字形序号
+
+        Returns:
+            int: 字形序号，不存在时返回 -1
+        """
+        index = face.index if face.index is not None else cls.index
+        if index is None or face.file is None:
+            return -1
+        return index.find(char)
+
+    @classmethod
+    def read_glyph(cls, face, char):
+        """
+        从字体文件读取字符的原始位图（不经过缓存）
+
+        Args:
+            face: 字体名或 FontFace
+            char: 字符
+
+        Returns:
+            bytearray: 位图数据（格式为 face.glyph_format），字符不存在时返回 None
+        """
+        if not isinstance(face, FontFace):
+            face = cls.get_face(face)
+        return cls._read(face, cls.find_glyph(face, char))
+
+    @classmethod
+    def _read(cls, face, glyph):
+        """读取字形序号对应的位图，glyph 为 -1 时返回 None"""
+        if glyph == -1:
+            return None
+
+        data = bytearray(face.bytes_per_glyph)
+        try:
+            cls._read_glyphs(face, [glyph], [data])
+        except OSError:
+            return None
+        return data
+
+    @classmethod
+    def _read_glyphs(cls, face, glyphs, outputs):
+        """
+        读取多个字形的位图
+
+        Args:
+            face: FontFace
+            glyphs: 升序排列的字形序号
+            outputs: 与 glyphs 对应的缓冲区（每个 face.bytes_per_glyph 字节）
+        """
+        bpg = face.bytes_per_glyph
+        if face.compression == COMPRESS_NONE:
+            cls._read_batch(face.file, [face.data_offset + g * bpg for g in glyphs], bpg, outputs)
+            return
+
+        # 同一块中的字形只解压一次，连续读取同一块时直接使用上次解压的结果
+        per_block = face.block_glyphs
+        for glyph, out in zip(glyphs, outputs):
+            block = glyph // per_block
+            if block != face.block:
+                cls._inflate(face, block)
+            offset = (glyph - block * per_block) * bpg
+            out[:] = face.block_view[offset : offset + bpg]
+
+    @classmethod
+    def _inflate(cls, face, block):
+        """
+        读取并解压一个压缩块到 face.block_buffer
+
+        压缩数据读入复用的缓冲区，再复制到复用的输入流中。deflate 模块不能重置解压状态，
+        每次解压仍会新建一个 DeflateIO 和它的 2^FONT_WBITS 字节窗口（约 1 KB 的临时分配）。
+        """
+        start = face.block_offsets[block]
+        size = face.block_offsets[block + 1] - start
+        face.block = -1
+        face.file.seek(start)
+        data = face.compressed_view[:size]
+        face.file.readinto(data)
+        cls.reads += 1
+        stream = face.compressed_stream
+        stream.seek(0)
+        stream.write(data)
+        stream.seek(0)
+        with deflate.DeflateIO(stream, deflate.RAW, FONT_WBITS) as decoder:
+            decoder.readinto(face.block_buffer)
+        face.block = block
+        cls.inflates += 1
+
+    @classmethod
+    def get_glyph(cls, face, char):
+        """
+        获取字符可以直接 blit 的 FrameBuffer
+
+        Args:
+            face: 字体名或 FontFace
+            char: 字符
+
+        Returns:
+            framebuf.FrameBuffer: 字形（格式为 FontRegistry.format），
+                字符不存在时为替代字符的字形，字体没有替代字符时返回 None
+        """
+        if not isinstance(face, FontFace):
+            face = cls.get_face(face)
+
+        cls._tick += 1
+        entry = face.cache.get(char)
+        if entry is not None:
+            cls.hits += 1
+            entry[1] = cls._tick
+            return entry[0]
+
+        cls.misses += 1
+        glyph = cls.find_glyph(face, char)
+        data = cls._read(face, glyph if glyph != -1 else face.fallback)
+        if data is None:
+            # 不存在的字符也缓存，避免每帧重复查找索引
+            fb = None
+            size = cls.ENTRY_OVERHEAD
+        else:
+            fb, buf = cls._build(face, data)
+            size = len(buf) + cls.ENTRY_OVERHEAD
+        cls._store(face, char, fb, size, face.glyph_advance(char, glyph))
+        return fb
+
+    @classmethod
+    def _store(cls, face, char, fb, size, advance):
+        """把字形加入缓存，超出预算时先淘汰最久未用的条目"""
+        if cls.cache_used + size > cls.cache_budget:
+            cls._evict(int(cls.cache_budget * cls.EVICT_RATIO) - size)
+        if size <= cls.cache_budget:
+            face.cache[char] = [fb, cls._tick, size, advance]
+            cls.cache_used += size
+
+    @classmethod
+    def load_glyphs(cls, face, text):
+        """
+        把文本中尚未缓存的字符一次性读入缓存
+
+        先查出所有字形序号，按文件位置排序后把相邻的字形合并为一次 readinto，
+        避免新页面首次渲染时逐字 seek + read。
+
+        Args:
+            face: 字体名或 FontFace
+            text: 文本
+
+        Returns:
+            int: 新加入缓存的字符数
+        """
+        if not isinstance(face, FontFace):
+            face = cls.get_face(face)
+        cache = face.cache
+        pending = None
+        for char in text:
+            if char == "\n" or char in cache:
+                continue
+            if pending is None:
+                pending = {}
+            pending[char] = None
+        if pending is None or face.file is None:
+            return 0
+
+        # 字符 -> (字形序号, 实际读取的字形序号)，不存在的字符读取替代字符
+        items = []
+        for char in pending:
+            glyph = cls.find_glyph(face, char)
+            items.append((glyph if glyph != -1 else face.fallback, glyph, char))
+        items.sort()
+
+        found = [item for item in items if item[0] != -1]
+        datas = [bytearray(face.bytes_per_glyph) for _ in found]
+        cls._read_glyphs(face, [g for g, _, _ in found], datas)
+        if face.version == 2 and found:
+            widths = bytearray(len(found))
+            view = memoryview(widths)
+            cls._read_batch(
+                face.file,
+                [face.widths_offset + g for g, _, _ in found],
+                1,
+                [view[i : i + 1] for i in range(len(found))],
+            )
+
+        cls.misses += len(items)
+        i = 0
+        for target, glyph, char in items:
+            cls._tick += 1
+            if target == -1:
+                cls._store(face, char, None, cls.ENTRY_OVERHEAD, face.glyph_advance(char, -1))
+                continue
+            fb, buf = cls._build(face, datas[i])
+            if face.version == 2:
+                advance = widths[i]
+            else:
+                advance = face.glyph_advance(char, glyph)
+            cls._store(face, char, fb, len(buf) + cls.ENTRY_OVERHEAD, advance)
+            i += 1
+        return len(items)
+
+    @classmethod
+    def _read_batch(cls, file, offsets, size, outputs):
+        """
+        按升序的文件位置读取多个等长数据块，能放进读取缓冲区的相邻块合并为一次读取
+
+        Args:
+            file: 文件
+            offsets: 升序排列的文件位置
+            size: 每块的字节数
+            outputs: 与 offsets 对应的可写缓冲区
+        """
+        if cls._read_buffer is None or len(cls._read_buffer) < size:
+            cls._read_buffer = bytearray(max(cls.READ_BUFFER_SIZE, size))
+        view = memoryview(cls._read_buffer)
+        limit = len(cls._read_buffer)
+        count = len(offsets)
+        i = 0
+        while i < count:
+            start = offsets[i]
+            end = start + size
+            j = i + 1
+            while j < count and offsets[j] + size - start <= limit:
+                end = max(end, offsets[j] + size)
+                j += 1
+
+            file.seek(start)
+            file.readinto(view[: end - start])
+            cls.reads += 1
+            for k in range(i, j):
+                offset = offsets[k] - start
+                outputs[k][:] = view[offset : offset + size]
+            i = j
+
+    @classmethod
+    def get_advance(cls, face, char):
+        """
+        获取字符的步进宽度（v2 字体按字形读取，随字形一起缓存）
+
+        Args:
+            face: 字体名或 FontFace
+            char: 字符
+
+        Returns:
+            int: 步进宽度（像素）
+        """
+        if not isinstance(face, FontFace):
+            face = cls.get_face(face)
+        entry = face.cache.get(char)
+        if entry is None:
+            cls.get_glyph(face, char)
+            entry = face.cache.get(char)
+            if entry is None:
+                return face.glyph_advance(char, cls.find_glyph(face, char))
+        return entry[3]
+
+    @classmethod
+    def _build(cls, face, data):
+        """把原始位图转换为缓存格式的 FrameBuffer，格式相同时直接使用"""
+        width = face.glyph_width
+        height = face.height
+        src = framebuf.FrameBuffer(data, width, height, face.glyph_format)
+        if face.glyph_format == cls.format or cls.format not in (
+            framebuf.MONO_VLSB,
+            framebuf.MONO_HMSB,
+        ):
+            # 格式一致，或非单色屏幕，直接使用原始位图
+            return src, data
+        fb, buf = cls.make_buffer(width, height)
+        fb.blit(src, 0, 0)
+        return fb, buf
+
+    @classmethod
+    def buffer_size(cls, width, height):
+        """缓存格式下 width x height 单色缓冲区的字节数"""
+        if cls.format == framebuf.MONO_VLSB:
+            return (height + 7) // 8 * width
+        return (width + 7) // 8 * height
+
+    @classmethod
+    def make_buffer(cls, width, height):
+        """
+        创建缓存格式的单色缓冲区（用于字形和预渲染的文本）
+
+        Returns:
+            tuple: (FrameBuffer, bytearray)
+        """
+        fmt = cls.format
+        if fmt not in (framebuf.MONO_VLSB, framebuf.MONO_HMSB):
+            fmt = framebuf.MONO_HLSB
+        buf = bytearray(cls.buffer_size(width, height))
+        return framebuf.FrameBuffer(buf, width, height, fmt), buf
+
+    @classmethod
+    def _evict(cls, target):
+        """按最近使用顺序淘汰缓存条目，直到占用不超过 target 字节"""
+        entries = []
+        for face in cls.faces.values():
+            for entry in face.cache.values():
+                entries.append((entry[1], entry[2]))
+        entries.sort()
+
+        # 找到需要淘汰的最大使用序号
+        cutoff = -1
+        used = cls.cache_used
+        for tick, size in entries:
+            if used <= target:
+                break
+            used -= size
+            cutoff = tick
+
+        for face in cls.faces.values():
+            cache = face.cache
+            for char in [char for char, entry in cache.items() if entry[1] <= cutoff]:
+                del cache[char]
+        cls.cache_used = used
+
+    @classmethod
+    def get_cache_stats(cls):
+        """
+        获取字形缓存统计
+
+        Returns:
+            dict: entries、bytes、budget、hits、misses、reads、inflates
+        """
+        entries = 0
+        for face in cls.faces.values():
+            entries += len(face.cache)
+        return {
+            "entries": entries,
+            "bytes": cls.cache_used,
+            "budget": cls.cache_budget,
+            "hits": cls.hits,
+            "misses": cls.misses,
+            "reads": cls.reads,
+            "inflates": cls.inflates,
+        }
+
+    @classmethod
+    def unregister(cls, name):
+        """关闭并移除一种字体"""
+        face = cls.faces.pop(name, None)
+        if face is not None:
+            for entry in face.cache.values():
+                cls.cache_used -= entry[2]
+            face.close()
+
+    @classmethod
+    def clear_cache(cls):
+        """清空所有字体的字形缓存"""
+        for face in cls.faces.values():
+            face.cache.clear()
+        cls.cache_used = 0
+
+    @classmethod
+    def cleanup(cls):
+        """关闭所有字体文件和字符索引"""
+        for face in cls.faces.values():
+            face.close()
+        cls.faces.clear()
+        cls.cache_used = 0
+        if hasattr(cls.index, "close"):
+            cls.index.close()
+        cls.index = None
@@ -5,6 +5,7 @@ UI 框架主类
 
 import time
 
+from ui_framework.blit import native_format
 from ui_framework.components.box import Box
 from ui_framework.components.button import Button
 from ui_framework.components.circle import Circle
@@ -12,8 +13,11 @@ from ui_framework.components.label import Label
 from ui_framework.components.menu import Menu
 from ui_framework.components.progress_bar import ProgressBar
 from ui_framework.components.text import Text
+from ui_framework.fonts import FontRegistry
 from ui_framework.input import InputManager, KeyMapper
 from ui_framework.page import Page, PageManager
+from ui_framework.profiler import Profiler
+from ui_framework.scheduler import FrameScheduler
 from ui_framework.transitions import (
     FadeTransition,
     NoTransition,
@@ -41,9 +45,58 @@ class UIFramework:
         self.input_manager = InputManager()
         self.key_mapper = KeyMapper()
         self.running = False
-        self.fps = 30  # 目标帧率
-        self.frame_time = 1.0 / self.fps
-        self.last_update_time = 0
+        self.scheduler = FrameScheduler(30)  # 目标帧率 30
+        self.profiler = Profiler()  # 耗时分析（默认关闭）
+        self.last_update_ms = time.ticks_ms()
+
+        # 字形缓存使用屏幕的原生格式
+        FontRegistry.set_format(native_format(display))
+
+        # 空闲模式：页面、组件和过渡动画都静止时停止按帧率刷新，
+        # 改为等待按键或下一次定时更新
+        self.idle_enabled = True
+        self.idle_poll_ms = 20  # 空闲等待时检查按键的间隔（毫秒）
+        # 使用 machine.lightsleep 代替 sleep_ms 等待。lightsleep 期间引脚中断不运行，
+        # 边沿触发也不能唤醒，需要先配置电平触发的唤醒源（如 esp32.wake_on_ext1）并在设备上验证
+        self.idle_lightsleep = False
+        self.wake_requested = False
+
+        # 自动重复按键对应的页面和按键映射（变化时重新设置）
+        self._repeat_page = None
+        self._repeat_table = None
+
+    @property
+    def fps(self):
+        """目标帧率"""
+        return self.scheduler.fps
+
+    @fps.setter
+    def fps(self, value):
+        self.scheduler.fps = value
+
+    def get_frame_stats(self):
+        """
+        获取帧统计（帧数、超时帧数、最长帧耗时等）
+
+        Returns:
+            dict: 见 FrameScheduler.get_stats()
+        """
+        return self.scheduler.get_stats()
+
+    def enable_profiler(self, overlay=False):
+        """
+        开启耗时分析（可在 REPL 中调用 UIFramework.instance.profiler.dump() 查看结果）
+
+        Args:
+            overlay: 是否在屏幕底部叠加显示统计结果
+        """
+        self.profiler.reset()
+        self.profiler.enable(overlay)
+
+    def disable_profiler(self):
+        """关闭耗时分析"""
+        self.profiler.disable()
+        self.page_manager.damage.invalidate_all()
 
     def register_page(self, name, page):
         """
@@ -178,26 +231,65 @@ class UIFramework:
 
     def update(self):
         """更新框架状态"""
-        current_time = time.ticks_ms() / 1000.0
-        delta_time = current_time - self.last_update_time
-        self.last_update_time = current_time
+        # 用整数毫秒计算时间差，ticks_diff 可正确处理计数器回绕
+        now = time.ticks_ms()
+        delta_ms = time.ticks_diff(now, self.last_update_ms)
+        self.last_update_ms = now
+        # 页面和组件的 update() 使用秒为单位的时间差（动画和物理运算本身就是浮点数），
+        # 每帧只在这里转换一次
+        delta_time = delta_ms / 1000
+
+        profiler = Profiler.active
+        if profiler is not None:
+            start = time.ticks_us()
+
+        # 当前页面或按键映射变化时更新自动重复的按键
+        page = self.page_manager.current_page
+        if page is not self._repeat_page or self.key_mapper.table is not self._repeat_table:
+            self.apply_repeat_keys(page)
 
         # 更新输入状态
         self.input_manager.update()
 
-        # 处理输入事件
-        while self.input_manager.has_events():
-            event = self.input_manager.poll_event()
-            if event:
-                # 翻译按键映射
-                translated_event = self.key_mapper.translate_event(event)
-                # 让页面管理器处理事件
-                self.page_manager.handle_event(translated_event)
+        if profiler is not None:
+            profiler.record("frame", "input", start)
+            start = time.ticks_us()
 
-        # 更新页面
+        # 先更新页面再处理事件：空闲等待后的第一帧时间差很大，
+        # 由本帧按键开始的动画（页面过渡、菜单选择框等）应从下一帧开始计时
         self.page_manager.update(delta_time)
 
-        return delta_time
+        if profiler is not None:
+            profiler.record("frame", "update", start)
+            start = time.ticks_us()
+
+        # 处理输入事件（事件对象会被复用，处理完即失效）
+        input_manager = self.input_manager
+        while True:
+            event = input_manager.poll_event()
+            if event is None:
+                break
+            # 翻译按键映射（直接修改事件）
+            self.key_mapper.translate_event(event)
+            # 让页面管理器处理事件
+            self.page_manager.handle_event(event)
+
+        if profiler is not None:
+            profiler.record("frame", "events", start)
+
+    def apply_repeat_keys(self, page):
+        """
+        按页面声明的逻辑按键开启物理按键的自动重复
+
+        Args:
+            page: 当前页面（None 表示全部关闭）
+        """
+        self._repeat_page = page
+        self._repeat_table = self.key_mapper.table
+        keys = page.get_repeat_keys() if page is not None else ()
+        map_key = self.key_mapper.map_key
+        for name in self.input_manager.buttons:
+            self.input_manager.set_repeat(name, map_key(name) in keys)
 
     def render(self):
         """渲染当前帧"""
@@ -205,25 +297,99 @@ class UIFramework:
 
     def run_once(self):
         """运行一次更新和渲染循环"""
-        delta_time = self.update()
+        self.update()
         self.render()
-        return delta_time
 
     def run(self):
         """运行主循环（阻塞）"""
         self.running = True
-        self.last_update_time = time.ticks_ms() / 1000.0
+        self.last_update_ms = time.ticks_ms()
 
         while self.running:
-            frame_start = time.ticks_ms() / 1000.0
+            self.step()
 
-            # 更新和渲染
-            self.run_once()
+    def step(self, max_wait_ms=None):
+        """
+        运行主循环的一次迭代：更新、渲染，然后按帧率或空闲模式等待
 
-            # 帧率控制
-            frame_elapsed = time.ticks_ms() / 1000.0 - frame_start
-            if frame_elapsed < self.frame_time:
-                time.sleep(self.frame_time - frame_elapsed)
+        Args:
+            max_wait_ms: 空闲等待的最长时间（毫秒），None 表示不限制（用于脚本回放）
+        """
+        scheduler = self.scheduler
+        scheduler.begin_frame()
+        self.wake_requested = False
+
+        # 更新和渲染
+        self.run_once()
+
+        # 空闲时等待按键或下一次定时更新
+        idle_timeout = self.get_idle_timeout()
+        if idle_timeout > 0:
+            scheduler.end_frame(wait=False)
+            # 利用空闲时间为尚未进入的页面预读字形
+            self.page_manager.prewarm_next()
+            if max_wait_ms is not None and idle_timeout > max_wait_ms:
+                idle_timeout = max_wait_ms
+            if idle_timeout > 0:
+                self.idle_wait(idle_timeout)
+            return
+
+        # 帧率控制
+        scheduler.end_frame()
+
+    def wake(self):
+        """请求立即恢复全帧率刷新（如页面在回调中开始了新的动画）"""
+        self.wake_requested = True
+
+    def get_idle_timeout(self):
+        """
+        计算当前可以空闲等待的时间
+
+        Returns:
+            int: 毫秒数，0 表示需要继续按帧率刷新
+        """
+        if not self.idle_enabled or self.wake_requested:
+            return 0
+        # 按住按键时需要持续更新以检测长按，有待处理的边沿时立即处理
+        input_manager = self.input_manager
+        if (
+            input_manager.any_pressed()
+            or input_manager.has_events()
+            or input_manager.has_pending_input()
+        ):
+            return 0
+        if not self.page_manager.is_idle():
+            return 0
+        timeout = self.page_manager.get_wakeup_interval()
+        if timeout is None:
+            return 0
+        return timeout
+
+    def idle_wait(self, timeout_ms):
+        """
+        空闲等待，直到有按键状态变化或到达超时时间
+
+        每 idle_poll_ms 检查一次按键（中断模式下检查中断记录的边沿，轮询模式下读取引脚），
+        按键最多延迟 idle_poll_ms 处理。开启 idle_lightsleep 时每一段改用 lightsleep，
+        休眠结束后按实际电平补上休眠期间丢失的边沿。
+
+        Args:
+            timeout_ms: 最长等待时间（毫秒）
+        """
+        input_manager = self.input_manager
+        start = time.ticks_ms()
+        while not self.wake_requested and not input_manager.has_pending_input():
+            remaining = timeout_ms - time.ticks_diff(time.ticks_ms(), start)
+            if remaining <= 0:
+                break
+            step = min(remaining, self.idle_poll_ms)
+            if self.idle_lightsleep:
+                import machine
+
+                machine.lightsleep(step)
+                input_manager.check_levels()
+            else:
+                time.sleep_ms(step)
 
     def stop(self):
         """停止主循环"""
@@ -0,0 +1,220 @@
+"""
+字形索引
+按码点排序的字符索引（由 scripts/generate_font_bin.py 生成，单独存放或内嵌在 v2 字体文件中），
+二分查找字符对应的字形序号
+
+文件格式（小端序）：
+    0   4  魔数 b"GIDX"
+    4   2  版本号（1 或 2）
+    版本 1（字形顺序任意，用于 v1 字体）：
+        6   2  每块的条目数 B
+        8   4  条目总数 N
+        12  4 * ceil(N / B)  目录：每块第一个条目的码点
+        ... 6 * N            条目：码点（u32）+ 字形序号（u16），按码点升序排列
+    版本 2（字形按码点升序排列，用于 v2 字体）：
+        6   2  页数 P（每页 256 个码点，只保存有字符的页）
+        8   4  条目总数 N
+        12  2 * P   页号（码点 >> 8，升序）
+        ... 2 * P   每页第一个字符的字形序号
+        ... 32 * P  每页的位图（第 i 位表示码点 页号 << 8 | i 是否存在）
+
+只有目录常驻 RAM（版本 1 约 0.5 KB，版本 2 每页 4 字节），查找时读取一个块（版本 1 为 B 个条目，
+版本 2 为一页的位图），在块内二分查找或数出位图中前面的字符数。
+GB2312 字符集的版本 2 索引约 3.5 KB，版本 1 约 45 KB。
+"""
+
+import array
+import struct
+
+MAGIC = b"GIDX"
+VERSION = 1
+VERSION_PAGES = 2
+ENTRY_SIZE = 6
+PAGE_BITMAP_SIZE = 32
+
+# 每个字节中置位的个数
+POPCOUNT = bytearray(256)
+for _i in range(1, 256):
+    POPCOUNT[_i] = (_i & 1) + POPCOUNT[_i >> 1]
+
+
+class GlyphIndex:
+    """字形索引，find() 与 str.find() 对单个字符的用法相同"""
+
+    def __init__(self, path, offset=0):
+        """
+        打开索引
+
+        Args:
+            path: 索引文件路径，或已打开的文件（如内嵌索引的 v2 字体文件）
+            offset: 索引在文件中的起始位置
+        """
+        if isinstance(path, str):
+            self._file = open(path, "rb")
+            self._owns_file = True
+        else:
+            self._file = path
+            self._owns_file = False
+        self._file.seek(offset)
+        header = self._file.read(12)
+        if header[:4] != MAGIC:
+            self.close()
+            raise ValueError("invalid glyph index")
+        version, block_size, count = struct.unpack_from("<HHI", header, 4)
+        if version not in (VERSION, VERSION_PAGES):
+            self.close()
+            raise ValueError("unsupported glyph index version: %d" % version)
+
+        self.version = version
+        self.count = count
+        self._cached_block = -1
+        if version == VERSION_PAGES:
+            self._load_pages(offset, block_size)
+            return
+
+        self.block_size = block_size
+        blocks = (count + block_size - 1) // block_size
+
+        # 目录常驻 RAM
+        self._directory = array.array("I", [0] * blocks)
+        self._file.readinto(self._directory)
+        self._entries_offset = offset + 12 + 4 * blocks
+
+        # 最近读取的块
+        self._block = bytearray(block_size * ENTRY_SIZE)
+        self._block_view = memoryview(self._block)
+        self._cached_count = 0
+
+    def _load_pages(self, offset, pages):
+        # 页号和每页第一个字形序号常驻 RAM
+        self._pages = array.array("H", [0] * pages)
+        self._ranks = array.array("H", [0] * pages)
+        self._file.readinto(self._pages)
+        self._file.readinto(self._ranks)
+        self._bitmaps_offset = offset + 12 + 4 * pages
+        self._block = bytearray(PAGE_BITMAP_SIZE)
+
+    def close(self):
+        """关闭索引文件（共用的文件由调用方关闭）"""
+        if self._file and self._owns_file:
+            self._file.close()
+        self._file = None
+
+    def __len__(self):
+        return self.count
+
+    def find(self, char):
+        """
+        查找字符的字形序号
+
+        Args:
+            char: 单个字符
+
+        Returns:
+            int: 字形序号，不存在时返回 -1
+        """
+        code = ord(char)
+        if self.version == VERSION_PAGES:
+            return self._find_page(code)
+        directory = self._directory
+        high = len(directory) - 1
+        if high < 0 or code < directory[0]:
+            return -1
+
+        # 找到最后一个首码点不大于 code 的块
+        low = 0
+        while low < high:
+            mid = (low + high + 1) >> 1
+            if directory[mid] <= code:
+                low = mid
+            else:
+                high = mid - 1
+
+        if low != self._cached_block:
+            self._load_block(low)
+
+        # 块内二分查找
+        buf = self._block
+        low = 0
+        high = self._cached_count - 1
+        while low <= high:
+            mid = (low + high) >> 1
+            offset = mid * ENTRY_SIZE
+            entry = (
+                buf[offset]
+                | (buf[offset + 1] << 8)
+                | (buf[offset + 2] << 16)
+                | (buf[offset + 3] << 24)
+            )
+            if entry == code:
+                return buf[offset + 4] | (buf[offset + 5] << 8)
+            if entry < code:
+                low = mid + 1
+            else:
+                high = mid - 1
+        return -1
+
+    def _find_page(self, code):
+        pages = self._pages
+        page = code >> 8
+        low = 0
+        high = len(pages) - 1
+        while low <= high:
+            mid = (low + high) >> 1
+            if pages[mid] < page:
+                low = mid + 1
+            elif pages[mid] > page:
+                high = mid - 1
+            else:
+                break
+        else:
+            return -1
+
+        bitmap = self._block
+        if mid != self._cached_block:
+            self._file.seek(self._bitmaps_offset + mid * PAGE_BITMAP_SIZE)
+            self._file.readinto(bitmap)
+            self._cached_block = mid
+
+        byte = (code & 0xFF) >> 3
+        bit = code & 7
+        value = bitmap[byte]
+        if not value >> bit & 1:
+            return -1
+        # 字形序号 = 页内第一个字形序号 + 页内码点更小的字符数
+        glyph = self._ranks[mid] + POPCOUNT[value & ((1 << bit) - 1)]
+        for i in range(byte):
+            glyph += POPCOUNT[bitmap[i]]
+        return glyph
+
+    def _load_block(self, block):
+        start = block * self.block_size
+        count = min(self.block_size, self.count - start)
+        self._file.seek(self._entries_offset + start * ENTRY_SIZE)
+        self._file.readinto(self._block_view[: count * ENTRY_SIZE])
+        self._cached_block = block
+        self._cached_count = count
+
+
+def load_index(chars_path=None, index_path=None):
+    """
+    加载字符索引
+
+    优先使用排序索引文件；没有索引文件时把 chars.txt 整个读入 RAM，用 str.find() 线性查找。
+
+    Args:
+        chars_path: chars.txt 文件路径
+        index_path: 索引文件路径（如 chars.idx）
+
+    Returns:
+        GlyphIndex 或 str: 都可以用 find(char) 查找字形序号
+    """
+    if index_path:
+        try:
+            return GlyphIndex(index_path)
+        except OSError:
+            if not chars_path:
+                raise
+            print("Warning: Glyph index not found, using", chars_path)
+    with open(chars_path, "r", encoding="utf-8") as f:
+        return f.read()
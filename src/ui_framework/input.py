@@ -1,25 +1,106 @@
 """
 UI 输入事件管理器
 处理按键输入并转换为事件
+
+按键引脚的电平变化由 Pin.irq 在中断中记录到预分配的环形缓冲区（时间戳 + 按键 + 电平），
+主循环在 update() 中取出并按时间戳做防抖和短按/长按判断，
+双击和组合键（两个按键几乎同时按下）也按边沿的时间戳识别。
+即使某一帧很慢（如网络请求），短于一帧的按键也不会丢失，按键时长也不受帧率影响。
+不支持中断的环境可以改用轮询（use_irq=False），轮询结果同样写入环形缓冲区。
+lightsleep 期间中断不运行，休眠结束后用 check_levels() 按实际电平补上丢失的边沿。
+
+事件是预先分配、循环复用的 Event 对象，事件队列是固定容量的环形队列，
+产生、翻译和处理事件都不分配内存。
 """
 
+import array
 import time
 
 from machine import Pin
 
 
+class Event:
+    """
+    输入事件
+
+    事件对象属于 InputManager 的事件队列，会被循环复用：
+    只在 handle_event() 中使用，不要保存引用（需要时复制所需的字段）。
+    """
+
+    __slots__ = ("type", "key", "key2", "physical_key", "duration_ms")
+
+    def __init__(self):
+        # "key_press"、"key_release"、"key_click"、"key_long_press"、"key_repeat"、
+        # "key_double_click"、"key_chord"
+        self.type = None
+        self.key = None  # 按键名称（翻译后为逻辑按键）
+        self.key2 = None  # 组合键中后按下的按键（key_chord，翻译后为逻辑按键）
+        self.physical_key = None  # 翻译前的物理按键名称
+        self.duration_ms = 0  # 按住的时间（毫秒，key_release、key_long_press 和 key_repeat）
+
+    def is_chord(self, a, b):
+        """
+        是否为按键 a 和 b 的组合键事件（不分先后）
+
+        Args:
+            a, b: 按键名称
+
+        Returns:
+            bool: 是否匹配
+        """
+        return self.type == "key_chord" and (
+            (self.key == a and self.key2 == b) or (self.key == b and self.key2 == a)
+        )
+
+
 class InputManager:
     """输入管理器，处理按键和其他输入设备"""
 
-    def __init__(self):
-        """初始化输入管理器"""
+    # 环形缓冲区的容量（条目数，必须是 2 的幂）
+    RING_SIZE = 32
+    # 事件队列的容量（满时丢弃新事件）
+    EVENT_QUEUE_SIZE = 16
+
+    def __init__(self, use_irq=True):
+        """
+        初始化输入管理器
+
+        Args:
+            use_irq: 是否使用引脚中断检测按键（False 时每帧轮询引脚电平）
+        """
         self.buttons = {}
-        self.button_states = {}
-        self.button_last_press = {}
-        self.button_long_press_triggered = {}  # 记录长按是否已触发
-        self.debounce_time = 0.05  # 防抖时间（秒）
-        self.long_press_time = 0.5  # 长按时间（秒）
-        self.event_queue = []
+        self._button_list = []  # 按键序号 -> 按钮信息
+        self.debounce_ms = 50  # 防抖时间（毫秒）
+        self.long_press_ms = 500  # 长按时间（毫秒）
+
+        # 自动重复：开启重复的按键按住 repeat_delay_ms 后开始产生 key_repeat 事件，
+        # 间隔从 repeat_interval_ms 开始每次缩短为 repeat_accel_percent%，最短 repeat_min_interval_ms
+        # 开启重复的按键不产生长按事件，重复过的按键松开时也不产生点击事件
+        self.repeat_delay_ms = 400
+        self.repeat_interval_ms = 150
+        self.repeat_min_interval_ms = 40
+        self.repeat_accel_percent = 75
+
+        # 手势：两次点击的间隔（上一次松开到这一次按下）不超过 double_click_ms 时，
+        # 第二次点击后再产生 key_double_click；两个按键先后按下的间隔不超过 chord_ms 时
+        # 产生 key_chord，组合中的按键不再产生点击、长按和重复事件
+        self.double_click_ms = 300
+        self.chord_ms = 100
+        self.use_irq = use_irq
+
+        # 事件队列：预先分配的事件对象组成的环形队列
+        self._events = [Event() for _ in range(self.EVENT_QUEUE_SIZE)]
+        self._event_head = 0  # 下一个写入位置
+        self._event_count = 0
+        self.events_dropped = 0  # 队列满时丢弃的事件数
+
+        # 环形缓冲区：边沿的时间戳（ticks_ms）和 (按键序号 << 1 | 是否按下)
+        # 中断只修改 _head，主循环只修改 _tail
+        self._ring_time = array.array("I", [0] * self.RING_SIZE)
+        self._ring_code = bytearray(self.RING_SIZE)
+        self._head = 0
+        self._tail = 0
+        self.dropped = 0  # 缓冲区满时丢弃的边沿数
 
     def register_button(self, name, pin_num, pull=Pin.PULL_UP, inverted=True):
         """
@@ -32,105 +113,324 @@ class InputManager:
             inverted: 是否反转逻辑（True表示按下为0，默认True）
         """
         pin = Pin(pin_num, Pin.IN, pull)
-        self.buttons[name] = {
+        index = len(self._button_list)
+        btn = {
             "pin": pin,
             "inverted": inverted,
+            "pressed_level": 0 if inverted else 1,
+            "index": index,
+            "name": name,
             "pressed": False,
-            "press_time": 0,
+            "press_time": 0,  # 按下时的 ticks_ms
+            "last_edge": time.ticks_add(time.ticks_ms(), -self.debounce_ms),
+            "long_press_triggered": False,  # 记录长按是否已触发
+            "check": False,  # 有边沿因防抖被忽略，需要在防抖时间后按实际电平确认
+            "check_time": 0,  # 最后一个被忽略的边沿的时间戳
+            "level": False,  # 轮询模式下上一次读到的状态
+            "repeat": False,  # 是否开启自动重复
+            "repeats": 0,  # 本次按下已产生的 key_repeat 数
+            "next_repeat": 0,  # 下一次重复的时间戳
+            "repeat_interval": 0,  # 当前重复间隔（毫秒）
+            "chord": False,  # 本次按下是否属于组合键
+            "click_pending": False,  # 上一次点击是否可以和下一次组成双击
+            "last_click": 0,  # 上一次点击松开的时间戳
         }
-        self.button_states[name] = False
-        self.button_last_press[name] = 0
-        self.button_long_press_triggered[name] = False
+        self.buttons[name] = btn
+        self._button_list.append(btn)
+        if self.use_irq:
+            handler = self._make_handler(index, btn["pressed_level"])
+            pin.irq(handler=handler, trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING)
+
+    def _make_handler(self, index, pressed_level):
+        """创建按键的中断处理函数（中断中不分配内存）"""
+
+        def handler(pin):
+            self._record(index, 1 if pin.value() == pressed_level else 0, time.ticks_ms())
+
+        return handler
+
+    def _record(self, index, pressed, now):
+        """
+        把一个边沿写入环形缓冲区（在中断中调用）
+
+        Args:
+            index: 按键序号
+            pressed: 1 表示按下，0 表示松开
+            now: 时间戳（ticks_ms）
+        """
+        head = self._head
+        next_head = (head + 1) & (self.RING_SIZE - 1)
+        if next_head == self._tail:
+            # 缓冲区已满，丢弃的边沿之后按实际电平确认
+            self.dropped += 1
+            btn = self._button_list[index]
+            btn["check"] = True
+            btn["check_time"] = now
+            return
+        self._ring_time[head] = now
+        self._ring_code[head] = index << 1 | pressed
+        self._head = next_head
 
     def _is_button_pressed(self, name):
         """检查按钮是否被按下"""
         if name not in self.buttons:
             return False
-
         btn = self.buttons[name]
-        value = btn["pin"].value()
+        return btn["pin"].value() == btn["pressed_level"]
+
+    def update(self):
+        """取出记录的按键边沿，按时间戳生成事件"""
+        now = time.ticks_ms()
+
+        if not self.use_irq:
+            for btn in self._button_list:
+                pressed = btn["pin"].value() == btn["pressed_level"]
+                if pressed != btn["level"]:
+                    btn["level"] = pressed
+                    self._record(btn["index"], 1 if pressed else 0, now)
+
+        # 按发生顺序处理缓冲区中的边沿
+        mask = self.RING_SIZE - 1
+        while self._tail != self._head:
+            tail = self._tail
+            code = self._ring_code[tail]
+            self._apply(self._button_list[code >> 1], code & 1, self._ring_time[tail])
+            self._tail = (tail + 1) & mask
+
+        for btn in self._button_list:
+            # 防抖时间过后按实际电平确认被忽略的边沿
+            if btn["check"]:
+                elapsed = time.ticks_diff(now, btn["last_edge"])
+                if not 0 <= elapsed < self.debounce_ms:
+                    btn["check"] = False
+                    pressed = btn["pin"].value() == btn["pressed_level"]
+                    if pressed != btn["pressed"]:
+                        # 状态确实变化了，按最后一个被忽略的边沿的时间计算
+                        self._apply(btn, 1 if pressed else 0, btn["check_time"], True)
+
+            if not btn["pressed"] or btn["chord"]:
+                continue
+            if btn["repeat"]:
+                self._repeat(btn, now)
+            # 检测长按事件，只在达到长按时间且未触发过时触发一次
+            elif not btn["long_press_triggered"]:
+                duration = time.ticks_diff(now, btn["press_time"])
+                if duration >= self.long_press_ms:
+                    self._long_press(btn, duration)
+
+    def set_repeat(self, name, enabled):
+        """
+        开启或关闭按键的自动重复
+
+        Args:
+            name: 按钮名称
+            enabled: 是否开启
+        """
+        btn = self.buttons.get(name)
+        if btn is not None and btn["repeat"] != enabled:
+            btn["repeat"] = enabled
+            if btn["pressed"]:
+                # 按住时切换（如进入新页面），从现在开始计时
+                btn["repeats"] = 0
+                btn["next_repeat"] = time.ticks_add(time.ticks_ms(), self.repeat_delay_ms)
+                btn["repeat_interval"] = self.repeat_interval_ms
+
+    def _repeat(self, btn, now):
+        """按时间戳产生到期的 key_repeat 事件（慢帧后最多补发 4 个）"""
+        for _ in range(4):
+            if time.ticks_diff(now, btn["next_repeat"]) < 0:
+                return
+            btn["repeats"] += 1
+            self.push_event(
+                "key_repeat", btn["name"], time.ticks_diff(btn["next_repeat"], btn["press_time"])
+            )
+            interval = btn["repeat_interval"]
+            btn["next_repeat"] = time.ticks_add(btn["next_repeat"], interval)
+            btn["repeat_interval"] = max(
+                self.repeat_min_interval_ms, interval * self.repeat_accel_percent // 100
+            )
+        # 落后太多时不再补发
+        btn["next_repeat"] = time.ticks_add(now, btn["repeat_interval"])
+
+    def _apply(self, btn, pressed, ticks, confirmed=False):
+        """
+        处理一个边沿
 
-        # 如果是反转逻辑，0表示按下
-        if btn["inverted"]:
-            return value == 0
+        Args:
+            btn: 按钮信息
+            pressed: 1 表示按下，0 表示松开
+            ticks: 边沿的时间戳（ticks_ms）
+            confirmed: 是否已经按实际电平确认（不再做防抖检查）
+        """
+        if bool(pressed) == btn["pressed"]:
+            return
+        # 距上一次状态变化不到防抖时间，视为抖动
+        elapsed = time.ticks_diff(ticks, btn["last_edge"])
+        if not confirmed and 0 <= elapsed < self.debounce_ms:
+            btn["check"] = True
+            btn["check_time"] = ticks
+            return
+        btn["last_edge"] = ticks
+        name = btn["name"]
+
+        if pressed:
+            btn["pressed"] = True
+            btn["press_time"] = ticks
+            btn["long_press_triggered"] = False
+            btn["repeats"] = 0
+            btn["next_repeat"] = time.ticks_add(ticks, self.repeat_delay_ms)
+            btn["repeat_interval"] = self.repeat_interval_ms
+            btn["chord"] = False
+
+            # 生成按键按下事件
+            self.push_event("key_press", name)
+            self._check_chord(btn, ticks)
+            return
+
+        duration = time.ticks_diff(ticks, btn["press_time"])
+        btn["pressed"] = False
+        if btn["chord"]:
+            # 组合键松开时只产生释放事件
+            btn["click_pending"] = False
+            self.push_event("key_release", name, duration)
+            return
+        if btn["repeat"]:
+            # 慢帧期间按住并松开时，重复按时间戳补发
+            if time.ticks_diff(ticks, btn["next_repeat"]) >= 0:
+                self._repeat(btn, ticks)
+        elif duration >= self.long_press_ms and not btn["long_press_triggered"]:
+            # 慢帧期间按住并松开时，长按按时间戳补发
+            self._long_press(btn, duration)
+
+        # 生成按键释放事件
+        self.push_event("key_release", name, duration)
+
+        # 检查是否为点击事件（短按）
+        if duration < self.long_press_ms and not btn["repeats"]:
+            self.push_event("key_click", name)
+            self._check_double_click(btn, ticks)
+        else:
+            btn["click_pending"] = False
+
+    def _check_chord(self, btn, ticks):
+        """按下时检查是否和另一个刚按下的按键组成组合键"""
+        for other in self._button_list:
+            if (
+                other is not btn
+                and other["pressed"]
+                and not other["chord"]
+                and time.ticks_diff(ticks, other["press_time"]) <= self.chord_ms
+            ):
+                other["chord"] = True
+                btn["chord"] = True
+                self.push_event("key_chord", other["name"], key2=btn["name"])
+                return
+
+    def _check_double_click(self, btn, ticks):
+        """点击后检查是否和上一次点击组成双击"""
+        if (
+            btn["click_pending"]
+            and time.ticks_diff(btn["press_time"], btn["last_click"]) <= self.double_click_ms
+        ):
+            btn["click_pending"] = False
+            self.push_event("key_double_click", btn["name"])
         else:
-            return value == 1
+            btn["click_pending"] = True
+            btn["last_click"] = ticks
 
-    def update(self):
-        """更新输入状态，检测按键变化并生成事件"""
-        current_time = time.ticks_ms() / 1000.0
-
-        for name, btn in self.buttons.items():
-            is_pressed = self._is_button_pressed(name)
-            was_pressed = btn["pressed"]
-
-            # 检测按下事件
-            if is_pressed and not was_pressed:
-                # 防抖检查
-                if current_time - self.button_last_press[name] > self.debounce_time:
-                    btn["pressed"] = True
-                    btn["press_time"] = current_time
-                    self.button_last_press[name] = current_time
-
-                    # 生成按键按下事件
-                    self.event_queue.append({"type": "key_press", "key": name})
-
-            # 检测释放事件
-            elif not is_pressed and was_pressed:
-                press_duration = current_time - btn["press_time"]
-                btn["pressed"] = False
-
-                # 生成按键释放事件
-                self.event_queue.append(
-                    {
-                        "type": "key_release",
-                        "key": name,
-                        "duration": press_duration,
-                    }
-                )
-
-                # 检查是否为点击事件（短按）
-                if press_duration < self.long_press_time:
-                    self.event_queue.append({"type": "key_click", "key": name})
-
-                # 重置长按触发标志
-                self.button_long_press_triggered[name] = False
-
-            # 检测长按事件
-            elif is_pressed and was_pressed:
-                press_duration = current_time - btn["press_time"]
-                # 只在达到长按时间且未触发过时触发一次
-                if (
-                    press_duration >= self.long_press_time
-                    and not self.button_long_press_triggered[name]
-                ):
-                    self.button_long_press_triggered[name] = True
-                    self.event_queue.append(
-                        {
-                            "type": "key_long_press",
-                            "key": name,
-                            "duration": press_duration,
-                        }
-                    )
+    def _long_press(self, btn, duration):
+        """生成长按事件"""
+        btn["long_press_triggered"] = True
+        self.push_event("key_long_press", btn["name"], duration)
+
+    def has_pending_input(self):
+        """
+        检查是否有尚未被 update() 处理的按键状态变化（用于空闲等待时检测按键）
+
+        中断模式下只检查中断写入的缓冲区位置和待确认标志，不读取引脚。
+
+        Returns:
+            bool: 是否有按键被按下或释放
+        """
+        if self._head != self._tail:
+            return True
+        for btn in self._button_list:
+            if btn["check"]:
+                return True
+            if not self.use_irq:
+                if (btn["pin"].value() == btn["pressed_level"]) != btn["level"]:
+                    return True
+        return False
+
+    def check_levels(self):
+        """
+        按实际电平确认按键状态（lightsleep 之后调用）
+
+        lightsleep 期间中断不运行，按下或松开的边沿可能没有记录，
+        电平与当前状态不一致的按键在下一次 update() 中按防抖规则确认。
+        """
+        if not self.use_irq:
+            return
+        now = time.ticks_ms()
+        for btn in self._button_list:
+            if (btn["pin"].value() == btn["pressed_level"]) != btn["pressed"]:
+                btn["check"] = True
+                btn["check_time"] = now
+
+    def any_pressed(self):
+        """检查是否有按钮处于按下状态"""
+        for btn in self._button_list:
+            if btn["pressed"]:
+                return True
+        return False
 
     def poll_event(self):
         """
         获取下一个事件
 
         Returns:
-            dict or None: 事件对象，如果没有事件则返回 None
+            Event or None: 事件对象（会被复用，见 Event），如果没有事件则返回 None
+        """
+        count = self._event_count
+        if not count:
+            return None
+        self._event_count = count - 1
+        return self._events[(self._event_head - count) % self.EVENT_QUEUE_SIZE]
+
+    def push_event(self, type, key, duration_ms=0, key2=None):
+        """
+        把一个事件加入队列（也用于脚本回放和性能测试，不经过按键检测）
+
+        Args:
+            type: 事件类型
+            key: 按键名称
+            duration_ms: 按住的时间（毫秒）
+            key2: 组合键中的另一个按键名称
+
+        Returns:
+            bool: 是否加入成功（队列满时丢弃）
         """
-        if self.event_queue:
-            return self.event_queue.pop(0)
-        return None
+        if self._event_count >= self.EVENT_QUEUE_SIZE:
+            self.events_dropped += 1
+            return False
+        head = self._event_head
+        event = self._events[head]
+        event.type = type
+        event.key = key
+        event.key2 = key2
+        event.physical_key = key
+        event.duration_ms = duration_ms
+        self._event_head = (head + 1) % self.EVENT_QUEUE_SIZE
+        self._event_count += 1
+        return True
 
     def has_events(self):
         """检查是否有待处理的事件"""
-        return len(self.event_queue) > 0
+        return self._event_count > 0
 
     def clear_events(self):
         """清空事件队列"""
-        self.event_queue = []
+        self._event_count = 0
 
     def is_pressed(self, name):
         """
@@ -157,18 +457,24 @@ class InputManager:
             float: 按下持续时间（秒），如果未按下则返回0
         """
         if name in self.buttons and self.buttons[name]["pressed"]:
-            current_time = time.ticks_ms() / 1000.0
-            return current_time - self.buttons[name]["press_time"]
+            return time.ticks_diff(time.ticks_ms(), self.buttons[name]["press_time"]) / 1000
         return 0
 
 
 class KeyMapper:
-    """按键映射器，将物理按键映射到逻辑按键"""
+    """
+    按键映射器，将物理按键映射到逻辑按键
+
+    每个上下文的映射在映射变化或切换上下文时编译为一张完整的表（默认映射 + 上下文的覆盖），
+    翻译事件时只需查一次当前表，切换上下文也不需要重新合并。
+    """
 
     def __init__(self):
         """初始化按键映射器"""
         self.key_map = {}
         self.context_stack = ["default"]
+        self._tables = {}  # 上下文 -> 编译后的映射表
+        self.table = {}  # 当前上下文的映射表（物理按键 -> 逻辑按键）
 
     def set_mapping(self, physical_key, logical_key, context="default"):
         """
@@ -182,15 +488,37 @@ class KeyMapper:
         if context not in self.key_map:
             self.key_map[context] = {}
         self.key_map[context][physical_key] = logical_key
+        # 默认映射变化会影响所有上下文
+        if context == "default":
+            self._tables.clear()
+        else:
+            self._tables.pop(context, None)
+        self._activate()
+
+    def _compile(self, context):
+        """编译上下文的映射表"""
+        table = self._tables.get(context)
+        if table is None:
+            table = dict(self.key_map.get("default", {}))
+            if context != "default" and context in self.key_map:
+                table.update(self.key_map[context])
+            self._tables[context] = table
+        return table
+
+    def _activate(self):
+        """切换到当前上下文的映射表"""
+        self.table = self._compile(self.get_current_context())
 
     def push_context(self, context):
         """推入新的上下文"""
         self.context_stack.append(context)
+        self._activate()
 
     def pop_context(self):
         """弹出当前上下文"""
         if len(self.context_stack) > 1:
             self.context_stack.pop()
+            self._activate()
 
     def get_current_context(self):
         """获取当前上下文"""
@@ -206,32 +534,24 @@ class KeyMapper:
         Returns:
             str: 逻辑按键名称，如果没有映射则返回原始名称
         """
-        context = self.get_current_context()
-
-        # 先尝试当前上下文
-        if context in self.key_map and physical_key in self.key_map[context]:
-            return self.key_map[context][physical_key]
-
-        # 回退到默认上下文
-        if "default" in self.key_map and physical_key in self.key_map["default"]:
-            return self.key_map["default"][physical_key]
-
-        # 没有映射，返回原始名称
-        return physical_key
+        return self.table.get(physical_key, physical_key)
 
     def translate_event(self, event):
         """
-        翻译事件中的按键名称
+        翻译事件中的按键名称（直接修改事件，physical_key 保留原始名称）
 
         Args:
             event: 原始事件
 
         Returns:
-            dict: 翻译后的事件
+            Event: 翻译后的事件（同一个对象）
         """
-        if event and "key" in event:
-            translated_event = event.copy()
-            translated_event["key"] = self.map_key(event["key"])
-            translated_event["physical_key"] = event["key"]
-            return translated_event
+        if event is not None:
+            key = event.key
+            if key is not None:
+                event.physical_key = key
+                event.key = self.table.get(key, key)
+            key2 = event.key2
+            if key2 is not None:
+                event.key2 = self.table.get(key2, key2)
         return event
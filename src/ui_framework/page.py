@@ -3,12 +3,27 @@ UI 页面管理系统
 提供页面切换、生命周期管理等功能
 """
 
+import time
+
+from ui_framework.damage import DamageTracker
+from ui_framework.fonts import FontRegistry
+from ui_framework.profiler import Profiler
 from ui_framework.transitions import NoTransition
 
 
 class Page:
     """页面基类"""
 
+    # 页面的所有画面变化是否都通过 invalidate() 上报
+    # 为 True 时只传输脏区域，否则每帧整屏传输（如自行绘制动画的游戏页面）
+    track_damage = False
+
+    # 静止时最长多久更新一次页面（毫秒）
+    idle_interval = 1000
+
+    # 按住时产生 key_repeat 事件的逻辑按键（组件声明的按键会自动加入）
+    repeat_keys = ()
+
     def __init__(self, name="Page"):
         """
         初始化页面
@@ -31,6 +46,22 @@ class Page:
         if component in self.components:
             self.components.remove(component)
 
+    def invalidate(self, x=0, y=0, width=None, height=None):
+        """
+        标记页面上的一个区域需要重新传输（默认整屏）
+
+        Args:
+            x, y: 左上角坐标
+            width, height: 区域尺寸，None 表示整屏
+        """
+        tracker = DamageTracker.active
+        if tracker is None:
+            return
+        if width is None or height is None:
+            tracker.invalidate_all()
+        else:
+            tracker.add(x, y, width, height)
+
     def on_enter(self, **kwargs):
         """
         页面进入时调用（子类可重写）
@@ -62,8 +93,67 @@ class Page:
         if not self.active:
             return
 
+        profiler = Profiler.active
+        for component in self.components:
+            if profiler is None:
+                component.update(delta_time)
+            else:
+                start = time.ticks_us()
+                component.update(delta_time)
+                profiler.record("comp.update", type(component).__name__, start)
+
+    def is_idle(self):
+        """
+        页面是否处于静止状态（子类在 update 中有持续动画时需重写）
+
+        Returns:
+            bool: 是否静止
+        """
+        for component in self.components:
+            if not component.is_idle():
+                return False
+        return True
+
+    def get_wakeup_interval(self):
+        """
+        静止时距离下一次需要更新的时间
+
+        Returns:
+            int: 毫秒数，不超过 idle_interval
+        """
+        interval = self.idle_interval
+        for component in self.components:
+            component_interval = component.get_wakeup_interval()
+            if component_interval is not None and component_interval < interval:
+                interval = component_interval
+        return interval
+
+    def get_repeat_keys(self):
+        """
+        页面需要自动重复的逻辑按键（页面成为当前页面时由框架设置到 InputManager）
+
+        Returns:
+            list: 逻辑按键名称
+        """
+        out = list(self.repeat_keys)
+        for component in self.components:
+            component.get_repeat_keys(out)
+        return out
+
+    def get_prewarm_text(self):
+        """
+        页面将要显示的点阵字体文本（子类可重写以加入运行时才显示的文本，如课程名）
+
+        进入页面前和空闲时，框架把这些文本的字形预先读入缓存，
+        避免首次渲染（过渡动画的第一帧）逐字读取 Flash。
+
+        Returns:
+            list: [(字体, 文本), ...]，字体为字体名或 FontFace
+        """
+        out = []
         for component in self.components:
-            component.update(delta_time)
+            component.get_prewarm_text(out)
+        return out
 
     def render(self, display):
         """
@@ -125,6 +215,35 @@ class PageManager:
         self.transition = None  # 当前正在执行的过渡动画
         self.default_transition = None  # 默认过渡动画
 
+        # 脏区域跟踪（组件通过 DamageTracker.active 上报）
+        self.damage = DamageTracker(display.width, display.height)
+        DamageTracker.active = self.damage
+
+        # 上一次传输到屏幕的帧，用于逐 page 比较跳过未变化的内容
+        self.last_frame = None
+        self._screen_synced = False
+        buffer = getattr(display, "buffer", None)
+        if buffer is not None:
+            self.last_frame = bytearray(len(buffer))
+            # 预先切好每个 page 的视图，比较时不产生新的对象
+            self._frame_view = memoryview(buffer)
+            self._last_view = memoryview(self.last_frame)
+            self._frame_bands = []
+            self._last_bands = []
+            for page in range(display.height // 8):
+                start = page * display.width
+                end = start + display.width
+                self._frame_bands.append(self._frame_view[start:end])
+                self._last_bands.append(self._last_view[start:end])
+
+        # 等待在空闲时预读字形的页面
+        self.prewarm_queue = []
+
+        # 传输统计
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        self.bands_sent = 0
+
     def set_default_transition(self, transition):
         """
         设置默认过渡动画
@@ -144,8 +263,41 @@ class PageManager:
         """
         self.pages[name] = page
         page.manager = self
+        self.prewarm_queue.append(page)
         return page
 
+    def prewarm(self, page):
+        """
+        把页面将要显示的文本的字形读入缓存
+
+        Args:
+            page: 页面对象
+
+        Returns:
+            int: 新加入缓存的字符数
+        """
+        profiler = Profiler.active
+        if profiler is not None:
+            start = time.ticks_us()
+        loaded = 0
+        for face, text in page.get_prewarm_text():
+            loaded += FontRegistry.load_glyphs(face, text)
+        if profiler is not None:
+            profiler.record("page.prewarm", page.name, start)
+        return loaded
+
+    def prewarm_next(self):
+        """
+        空闲时为下一个已注册的页面预读字形（每次一个页面，避免长时间阻塞按键）
+
+        Returns:
+            bool: 是否预读了页面，False 表示所有页面都已处理
+        """
+        if not self.prewarm_queue:
+            return False
+        self.prewarm(self.prewarm_queue.pop(0))
+        return True
+
     def goto_page(self, name, clear_stack=False, transition=None, **kwargs):
         """
         切换到指定页面
@@ -194,9 +346,13 @@ class PageManager:
         self.current_page = page
         self.current_page.on_enter(**kwargs)
 
+        # 过渡动画开始时会渲染新页面，先把字形读入缓存
+        self.prewarm(page)
+
         # 启动过渡动画
         self.transition = used_transition
         self.transition.start(from_page, page, self.display)
+        self.damage.invalidate_all()
 
         # 如果旧页面存在且动画已完成，退出旧页面
         if from_page and self.transition.finished:
@@ -245,9 +401,13 @@ class PageManager:
         self.current_page = page
         self.current_page.on_enter(**kwargs)
 
+        # 过渡动画开始时会渲染新页面，先把字形读入缓存
+        self.prewarm(page)
+
         # 启动过渡动画
         self.transition = used_transition
         self.transition.start(from_page, page, self.display)
+        self.damage.invalidate_all()
 
         # 如果动画已完成，暂停旧页面
         if from_page and self.transition.finished:
@@ -285,9 +445,13 @@ class PageManager:
         self.current_page = to_page
         self.current_page.on_resume()
 
+        # 返回的页面的字形可能已被换出缓存
+        self.prewarm(to_page)
+
         # 启动过渡动画
         self.transition = used_transition
         self.transition.start(from_page, to_page, self.display)
+        self.damage.invalidate_all()
 
         # 如果动画已完成，退出旧页面
         if from_page and self.transition.finished:
@@ -306,24 +470,148 @@ class PageManager:
         Args:
             delta_time: 距离上次更新的时间差（秒）
         """
+        profiler = Profiler.active
+
         # 更新过渡动画
         if self.transition and not self.transition.finished:
             self.transition.update(delta_time)
 
         # 更新当前页面
         if self.current_page:
-            self.current_page.update(delta_time)
+            if profiler is None:
+                self.current_page.update(delta_time)
+            else:
+                start = time.ticks_us()
+                self.current_page.update(delta_time)
+                profiler.record("page.update", self.current_page.name, start)
 
     def render(self):
         """渲染当前页面"""
+        profiler = Profiler.active
+        if profiler is not None:
+            self._render_profiled(profiler)
+            return
+
         # 如果有正在执行的过渡动画，渲染动画
         if self.transition and not self.transition.finished:
             self.transition.render()
-            self.display.show()
+            self.damage.invalidate_all()
+            self._flush()
+            # 动画结束后的第一帧同样需要整屏比较，因此不清空脏区域
+            return
         # 否则正常渲染当前页面
+        if self.current_page:
+            self.current_page.render(self.display)
+            if not self.current_page.track_damage:
+                self.damage.invalidate_all()
+            self._flush()
+            self.damage.clear()
+
+    def _render_profiled(self, profiler):
+        """
+        渲染当前页面并记录渲染、传输耗时（开启耗时分析时使用）
+
+        Args:
+            profiler: 耗时分析器
+        """
+        start = time.ticks_us()
+        if self.transition and not self.transition.finished:
+            self.transition.render()
+            profiler.record("transition", type(self.transition).__name__, start)
+            # 动画结束后的第一帧同样需要整屏比较，因此不清空脏区域
+            clear_damage = False
         elif self.current_page:
             self.current_page.render(self.display)
+            profiler.record("page.render", self.current_page.name, start)
+            clear_damage = True
+        else:
+            return
+        profiler.record("frame", "render", start)
+
+        if profiler.overlay:
+            # 叠加层不经过组件的脏区域上报，整屏比较
+            profiler.draw_overlay(self.display)
+            self.damage.invalidate_all()
+        elif not clear_damage or not self.current_page.track_damage:
+            self.damage.invalidate_all()
+
+        start = time.ticks_us()
+        self._flush()
+        profiler.record("frame", "show", start)
+        if clear_damage:
+            self.damage.clear()
+
+    def _flush(self):
+        """
+        把新帧传输到屏幕
+
+        在脏区域覆盖的 page（8 行一组）中，与上一次传输的帧逐 page 比较脏区域的列，
+        只传输发生变化的 page；完全没有变化时跳过整次传输。
+        （组件画到标记区域之外的内容不参与比较，不会让 page 每帧都被判定为变化）
+        """
+        self.frames_rendered += 1
+        if self.last_frame is None:
+            # 显示对象没有可比较的缓冲区
+            self.display.show()
+            return
+
+        width = self.display.width
+        if not self._screen_synced:
+            # 屏幕内容未知（如启动画面），先整屏传输一次
             self.display.show()
+            self.last_frame[:] = self.display.buffer
+            self._screen_synced = True
+            self.bands_sent += len(self._frame_bands)
+            return
+
+        frame_bands = self._frame_bands
+        last_bands = self._last_bands
+        frame_view = self._frame_view
+        last_view = self._last_view
+        sent = 0
+        for x0, x1, page0, page1 in self.damage.spans():
+            full_width = x0 == 0 and x1 == width - 1
+            start = -1
+            for page in range(page0, page1 + 2):
+                changed = False
+                if page <= page1:
+                    if full_width:
+                        frame_cols = frame_bands[page]
+                        last_cols = last_bands[page]
+                    else:
+                        offset = page * width
+                        frame_cols = frame_view[offset + x0 : offset + x1 + 1]
+                        last_cols = last_view[offset + x0 : offset + x1 + 1]
+                    changed = frame_cols != last_cols
+                if changed:
+                    # 记录已传输的内容
+                    last_cols[:] = frame_cols
+                    if start < 0:
+                        start = page
+                elif start >= 0:
+                    # 连续变化的 page 合并为一次传输
+                    self.display.show_region(x0, x1, start, page - 1)
+                    sent += page - start
+                    start = -1
+
+        if sent:
+            self.bands_sent += sent
+        else:
+            self.frames_skipped += 1
+
+    def get_stats(self):
+        """
+        获取传输统计
+
+        Returns:
+            dict: frames（渲染帧数）、skipped（无变化而跳过传输的帧数）、
+                  bands（传输的 page 数）
+        """
+        return {
+            "frames": self.frames_rendered,
+            "skipped": self.frames_skipped,
+            "bands": self.bands_sent,
+        }
 
     def handle_event(self, event):
         """
@@ -336,9 +624,34 @@ class PageManager:
             bool: 是否消费了该事件
         """
         if self.current_page:
-            return self.current_page.handle_event(event)
+            profiler = Profiler.active
+            if profiler is None:
+                return self.current_page.handle_event(event)
+            start = time.ticks_us()
+            handled = self.current_page.handle_event(event)
+            profiler.record("page.event", self.current_page.name, start)
+            return handled
         return False
 
+    def is_idle(self):
+        """当前页面和过渡动画是否都处于静止状态"""
+        if self.transition and not self.transition.finished:
+            return False
+        if self.current_page:
+            return self.current_page.is_idle()
+        return True
+
+    def get_wakeup_interval(self):
+        """
+        静止时距离下一次需要更新的时间
+
+        Returns:
+            int or None: 毫秒数，None 表示没有页面
+        """
+        if self.current_page:
+            return self.current_page.get_wakeup_interval()
+        return None
+
     def get_current_page(self):
         """获取当前页面"""
         return self.current_page
@@ -0,0 +1,137 @@
+"""
+帧耗时分析器
+用 ticks_us 统计框架、页面和组件各阶段的耗时，可在 REPL 输出或叠加显示在屏幕上
+"""
+
+import time
+
+
+class Profiler:
+    """耗时分析器（默认关闭，开启后框架各处通过 Profiler.active 记录耗时）"""
+
+    # 当前生效的分析器，None 表示未开启（各处只做一次判断，几乎没有开销）
+    active = None  # type: Profiler | None
+
+    def __init__(self):
+        """初始化分析器"""
+        # {分组: {名称: [次数, 总耗时, 最短, 最长]}}，耗时单位为微秒
+        self.stats = {}
+        self.overlay = False
+
+    def enable(self, overlay=False):
+        """
+        开启分析
+
+        Args:
+            overlay: 是否在屏幕底部叠加显示统计结果
+        """
+        self.overlay = overlay
+        Profiler.active = self
+
+    def disable(self):
+        """关闭分析"""
+        self.overlay = False
+        if Profiler.active is self:
+            Profiler.active = None
+
+    def reset(self):
+        """清空统计数据"""
+        self.stats = {}
+
+    def record(self, group, name, start):
+        """
+        记录一次耗时
+
+        Args:
+            group: 分组（"frame"、"page.update"、"comp.render" 等）
+            name: 名称（页面名或组件类名）
+            start: 开始时间（time.ticks_us() 的返回值）
+        """
+        elapsed = time.ticks_diff(time.ticks_us(), start)
+        entries = self.stats.get(group)
+        if entries is None:
+            entries = {}
+            self.stats[group] = entries
+        entry = entries.get(name)
+        if entry is None:
+            entries[name] = [1, elapsed, elapsed, elapsed]
+            return
+        entry[0] += 1
+        entry[1] += elapsed
+        if elapsed < entry[2]:
+            entry[2] = elapsed
+        if elapsed > entry[3]:
+            entry[3] = elapsed
+
+    def report(self, group=None):
+        """
+        汇总统计结果
+
+        Args:
+            group: 只汇总指定分组，None 表示全部
+
+        Returns:
+            list: [(分组, 名称, 次数, 最短, 平均, 最长), ...]，按平均耗时从大到小排序，单位微秒
+        """
+        rows = []
+        for group_name, entries in self.stats.items():
+            if group is not None and group_name != group:
+                continue
+            for name, (count, total, min_us, max_us) in entries.items():
+                rows.append((group_name, name, count, min_us, total // count, max_us))
+        rows.sort(key=lambda row: row[4], reverse=True)
+        return rows
+
+    def dump(self):
+        """在 REPL 中打印统计结果（单位：微秒）"""
+        print("{:<12} {:<16} {:>6} {:>7} {:>7} {:>7}".format(
+            "group", "name", "count", "min", "avg", "max"
+        ))
+        for group, name, count, min_us, avg_us, max_us in self.report():
+            print("{:<12} {:<16} {:>6} {:>7} {:>7} {:>7}".format(
+                group, name, count, min_us, avg_us, max_us
+            ))
+
+    def _avg_ms(self, group, name):
+        """获取平均耗时（毫秒，保留一位小数的字符串）"""
+        entry = self.stats.get(group, {}).get(name)
+        if not entry:
+            return "-"
+        avg_us = entry[1] // entry[0]
+        return "{}.{}".format(avg_us // 1000, avg_us % 1000 // 100)
+
+    def draw_overlay(self, display):
+        """
+        在屏幕底部绘制统计结果
+
+        第一行为每帧更新/渲染/传输的平均耗时，后两行为平均耗时最长的页面或组件。
+
+        Args:
+            display: 显示对象
+        """
+        top = display.height - 24
+        display.fill_rect(0, top, display.width, 24, 0)
+        display.text(
+            "U{} R{} S{}".format(
+                self._avg_ms("frame", "update"),
+                self._avg_ms("frame", "render"),
+                self._avg_ms("frame", "show"),
+            ),
+            0,
+            top,
+            1,
+        )
+
+        y = top + 8
+        for group, name, count, min_us, avg_us, max_us in self.report():
+            if group == "frame":
+                continue
+            display.text(
+                "{:<10}{:>3}.{}".format(name[:10], avg_us // 1000, avg_us % 1000 // 100),
+                0,
+                y,
+                1,
+            )
+            y += 8
+            if y >= display.height:
+                break
@@ -0,0 +1,102 @@
+"""
+帧调度器
+基于 ticks_ms/ticks_diff 的整数毫秒帧率控制和帧耗时统计
+
+帧周期不是整数毫秒时（如 30fps 为 33.3ms），把余数分摊到各帧：
+每帧的预算为 frame_ms 或 frame_ms + 1，平均帧周期正好是 1000 / fps。
+"""
+
+import time
+
+
+class FrameScheduler:
+    """按固定帧周期调度主循环，并统计超出帧预算的帧"""
+
+    def __init__(self, fps=30):
+        """
+        初始化帧调度器
+
+        Args:
+            fps: 目标帧率
+        """
+        self.frame_ms = 0
+        self.frame_us = 0
+        self.budget_ms = 0  # 当前帧的预算（毫秒）
+        self._remainder = 0  # 1000 % fps
+        self._carry = 0  # 累计的余数
+        self.fps = fps
+        self.frame_start = time.ticks_ms()
+        self.reset_stats()
+
+    @property
+    def fps(self):
+        return self._fps
+
+    @fps.setter
+    def fps(self, value):
+        self._fps = value
+        # 帧周期（毫秒）的整数部分和余数，整数运算避免每帧分配浮点数
+        if value > 0:
+            self.frame_ms = 1000 // value
+            self._remainder = 1000 % value
+            self.frame_us = 1000000 // value
+        else:
+            self.frame_ms = self._remainder = self.frame_us = 0
+        self._carry = 0
+        self.budget_ms = self.frame_ms
+
+    def reset_stats(self):
+        """清空统计数据"""
+        self.frames = 0
+        self.late_frames = 0
+        self.max_frame_ms = 0
+        self.overrun_ms = 0
+
+    def begin_frame(self):
+        """标记一帧开始，计算本帧的预算"""
+        self.frame_start = time.ticks_ms()
+        budget = self.frame_ms
+        if self._remainder:
+            self._carry += self._remainder
+            if self._carry >= self._fps:
+                self._carry -= self._fps
+                budget += 1
+        self.budget_ms = budget
+
+    def end_frame(self, wait=True):
+        """
+        标记一帧结束，记录耗时，并等待到下一帧开始
+
+        Args:
+            wait: 是否休眠到帧周期结束
+
+        Returns:
+            int: 本帧耗时（毫秒）
+        """
+        elapsed = time.ticks_diff(time.ticks_ms(), self.frame_start)
+        self.frames += 1
+        if elapsed > self.max_frame_ms:
+            self.max_frame_ms = elapsed
+        budget = self.budget_ms
+        if elapsed > budget:
+            # 超出帧预算
+            self.late_frames += 1
+            self.overrun_ms += elapsed - budget
+        elif wait and elapsed < budget:
+            time.sleep_ms(budget - elapsed)
+        return elapsed
+
+    def get_stats(self):
+        """
+        获取帧统计
+
+        Returns:
+            dict: frames（帧数）、late（超出预算的帧数）、
+                  max_ms（最长帧耗时）、overrun_ms（累计超出预算的毫秒数）
+        """
+        return {
+            "frames": self.frames,
+            "late": self.late_frames,
+            "max_ms": self.max_frame_ms,
+            "overrun_ms": self.overrun_ms,
+        }
@@ -0,0 +1,170 @@
+"""
+文本排版
+一次遍历完成测量、换行和定位，结果按 (字体, 文本, 最大宽度) 缓存，
+FontText 的渲染、测量和对齐都使用同一份排版结果。
+
+换行规则：
+    - 换行符强制换行
+    - 空格之后可以换行（行尾的空格不计入行宽）
+    - 中日韩字符（及全角标点）前后可以换行，但行首不放逗号、句号、右括号等标点，
+      行尾不放左括号等标点
+    - 连续的西文单词不拆开，单词比整行还长时才在字符之间断开
+"""
+
+import array
+
+from ui_framework.fonts import FontRegistry
+
+# 不能出现在行首的标点
+NO_LINE_START = "，。、；：？！）》」』】〉〕”’…·%,.;:?!)]}"
+# 不能出现在行尾的标点
+NO_LINE_END = "（《「『【〈〔“‘([{"
+
+
+def is_wide(char):
+    """是否为中日韩字符或全角标点（字符之间可以换行）"""
+    return ord(char) >= 0x2E80
+
+
+class TextLayout:
+    """一段文本的排版结果（只读，可被多个组件共享）"""
+
+    # 排版缓存：(字体, 文本, 最大宽度) -> TextLayout
+    cache = {}
+    # 缓存条目上限，超出时整体清空（组件保留自己正在使用的排版）
+    CACHE_SIZE = 32
+
+    hits = 0
+    misses = 0
+
+    def __init__(self, face, text, max_width=None):
+        """
+        排版文本
+
+        Args:
+            face: FontFace
+            text: 文本
+            max_width: 最大行宽（像素），None 表示不自动换行
+        """
+        self.face = face
+        self.text = text
+        self.max_width = max_width
+        # 每个字符相对于行首的 x 坐标
+        self.xs = array.array("h", [0] * len(text))
+        # [(起始下标, 结束下标, 行宽, 位图宽度), ...]，位图宽度按整格计算
+        self.lines = []
+        self._layout()
+        self.width = 0  # 最宽一行的行宽
+        self.extent = 0  # 最宽一行的位图宽度
+        for _, _, advance, extent in self.lines:
+            if advance > self.width:
+                self.width = advance
+            if extent > self.extent:
+                self.extent = extent
+        self.height = len(self.lines) * face.height
+
+    @classmethod
+    def get(cls, face, text, max_width=None):
+        """
+        获取文本的排版（带缓存）
+
+        Args:
+            face: 字体名或 FontFace
+            text: 文本
+            max_width: 最大行宽（像素），None 表示不自动换行
+
+        Returns:
+            TextLayout: 排版结果
+        """
+        if isinstance(face, str):
+            face = FontRegistry.get_face(face)
+        key = (face, text, max_width)
+        layout = cls.cache.get(key)
+        if layout is not None:
+            cls.hits += 1
+            return layout
+
+        cls.misses += 1
+        layout = cls(face, text, max_width)
+        if len(cls.cache) >= cls.CACHE_SIZE:
+            cls.cache.clear()
+        cls.cache[key] = layout
+        return layout
+
+    @classmethod
+    def clear_cache(cls):
+        """清空排版缓存（如字体被移除时）"""
+        cls.cache.clear()
+
+    def _add_line(self, start, end):
+        """记录一行 [start, end)"""
+        if end > start:
+            last = end - 1
+            face = self.face
+            x = self.xs[last]
+            advance = x + face.char_width(self.text[last])
+            self.lines.append((start, end, advance, x + face.glyph_width))
+        else:
+            self.lines.append((start, end, 0, 0))
+
+    def _layout(self):
+        text = self.text
+        face = self.face
+        xs = self.xs
+        max_width = self.max_width
+
+        # 非 ASCII 字符的步进宽度随字形一起读取，先批量加载
+        FontRegistry.load_glyphs(face, text)
+
+        line_start = 0
+        x = 0
+        # 当前行中最后一个换行位置：本行结束下标、下一行起始下标
+        break_end = -1
+        break_next = -1
+        prev = None
+        for i, char in enumerate(text):
+            if char == "\n":
+                self._add_line(line_start, i)
+                line_start = i + 1
+                x = 0
+                break_end = break_next = -1
+                prev = None
+                continue
+
+            # 记录字符前的换行位置
+            if i > line_start:
+                if prev == " ":
+                    if char != " ":
+                        break_end, break_next = i - 1, i
+                elif (is_wide(prev) or is_wide(char)) and (
+                    char not in NO_LINE_START and prev not in NO_LINE_END and char != " "
+                ):
+                    break_end = break_next = i
+            prev = char
+
+            width = face.char_width(char)
+            # 超出行宽时换行（空格不可见，允许超出）
+            while (
+                max_width is not None
+                and char != " "
+                and x + width > max_width
+                and i > line_start
+            ):
+                if break_end > line_start:
+                    end, line_next = break_end, break_next
+                else:
+                    # 没有换行位置（单词比整行长），在当前字符前断开
+                    end = line_next = i
+                self._add_line(line_start, end)
+                line_start = line_next
+                break_end = break_next = -1
+                # 换到下一行的字符重新定位
+                x = 0
+                for j in range(line_next, i):
+                    xs[j] = x
+                    x += face.char_width(text[j])
+
+            xs[i] = x
+            x += width
+
+        self._add_line(line_start, len(text))
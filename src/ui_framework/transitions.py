@@ -5,6 +5,8 @@
 
 import framebuf
 
+from ui_framework.blit import blit_pages, copy_region, native_format
+
 
 class Transition:
     """过渡动画基类"""
@@ -45,17 +47,24 @@ class Transition:
         width = self.display.width
         height = self.display.height
 
+        # 缓冲区使用与屏幕相同的格式，blit 时无需逐像素转换格式
+        fmt = native_format(self.display)
+
         # 创建两个帧缓冲区
         self.from_buffer = bytearray(width * height // 8)
         self.to_buffer = bytearray(width * height // 8)
 
         # 创建 FrameBuffer 对象
-        self.from_fb = framebuf.FrameBuffer(
-            self.from_buffer, width, height, framebuf.MONO_HLSB
-        )
-        self.to_fb = framebuf.FrameBuffer(
-            self.to_buffer, width, height, framebuf.MONO_HLSB
-        )
+        self.from_fb = framebuf.FrameBuffer(self.from_buffer, width, height, fmt)
+        self.to_fb = framebuf.FrameBuffer(self.to_buffer, width, height, fmt)
+
+        # 格式为 MONO_VLSB 且能访问屏幕缓冲区时，页对齐的偏移直接按字节复制
+        self.display_view = None
+        display_buffer = getattr(self.display, "buffer", None)
+        if fmt == framebuf.MONO_VLSB and display_buffer is not None:
+            self.display_view = memoryview(display_buffer)
+        self.from_view = memoryview(self.from_buffer)
+        self.to_view = memoryview(self.to_buffer)
 
         # 渲染源页面
         self.from_fb.fill(0)
@@ -69,6 +78,26 @@ class Transition:
             for component in self.to_page.components:
                 component.render(self.to_fb)
 
+    def _blit(self, fb, view, x, y):
+        """
+        把页面缓冲区绘制到屏幕的 (x, y) 位置
+
+        Args:
+            fb: 页面 FrameBuffer
+            view: 该 FrameBuffer 底层缓冲区的 memoryview
+            x, y: 绘制位置
+        """
+        if self.display_view is not None and blit_pages(
+            self.display_view,
+            view,
+            self.display.width,
+            self.display.height,
+            x,
+            y,
+        ):
+            return
+        self.display.blit(fb, x, y)
+
     def update(self, delta_time):
         """
         更新动画状态
@@ -135,29 +164,29 @@ class SlideTransition(Transition):
             # 向左滑动：旧页面以一半速度向左移动，新页面从右侧滑入（视差效果）
             from_x = int(-width * t * 0.5)  # 旧页面移动一半距离
             to_x = int(width * (1 - t))
-            self.display.blit(self.from_fb, from_x, 0)
-            self.display.blit(self.to_fb, to_x, 0)
+            self._blit(self.from_fb, self.from_view, from_x, 0)
+            self._blit(self.to_fb, self.to_view, to_x, 0)
 
         elif self.direction == "right":
             # 向右滑动：旧页面以一半速度向右移动，新页面从左侧滑入（视差效果）
             from_x = int(width * t * 0.5)  # 旧页面移动一半距离
             to_x = int(-width * (1 - t))
-            self.display.blit(self.from_fb, from_x, 0)
-            self.display.blit(self.to_fb, to_x, 0)
+            self._blit(self.from_fb, self.from_view, from_x, 0)
+            self._blit(self.to_fb, self.to_view, to_x, 0)
 
         elif self.direction == "up":
             # 向上滑动：旧页面以一半速度向上移动，新页面从下方滑入（视差效果）
             from_y = int(-height * t * 0.5)  # 旧页面移动一半距离
             to_y = int(height * (1 - t))
-            self.display.blit(self.from_fb, 0, from_y)
-            self.display.blit(self.to_fb, 0, to_y)
+            self._blit(self.from_fb, self.from_view, 0, from_y)
+            self._blit(self.to_fb, self.to_view, 0, to_y)
 
         elif self.direction == "down":
             # 向下滑动：旧页面以一半速度向下移动，新页面从上方滑入（视差效果）
             from_y = int(height * t * 0.5)  # 旧页面移动一半距离
             to_y = int(-height * (1 - t))
-            self.display.blit(self.from_fb, 0, from_y)
-            self.display.blit(self.to_fb, 0, to_y)
+            self._blit(self.from_fb, self.from_view, 0, from_y)
+            self._blit(self.to_fb, self.to_view, 0, to_y)
 
     def reverse(self):
         """返回反向的滑动动画"""
@@ -187,10 +216,10 @@ class FadeTransition(Transition):
 
         if t < 0.5:
             # 前半段：显示源页面，逐渐增加闪烁
-            self.display.blit(self.from_fb, 0, 0)
+            self._blit(self.from_fb, self.from_view, 0, 0)
         else:
             # 后半段：显示目标页面
-            self.display.blit(self.to_fb, 0, 0)
+            self._blit(self.to_fb, self.to_view, 0, 0)
 
     def reverse(self):
         """淡入淡出的反向也是淡入淡出"""
@@ -278,9 +307,24 @@ class WipeTransition(Transition):
         if dest_y is None:
             dest_y = src_y
 
-        # 使用 blit 方法，但需要裁剪
-        # 简化实现：直接 blit 整个帧缓冲区，然后用遮罩
-        # 更高效的方法是逐行复制，但这里先用简单方法
+        # 与屏幕格式一致时按 page 字节复制
+        if self.display_view is not None:
+            view = self.from_view if fb is self.from_fb else self.to_view
+            if copy_region(
+                self.display_view,
+                view,
+                self.display.width,
+                self.display.height,
+                src_x,
+                src_y,
+                w,
+                h,
+                dest_x,
+                dest_y,
+            ):
+                return
+
+        # 回退：逐像素复制
         for y in range(h):
             for x in range(w):
                 pixel = fb.pixel(src_x + x, src_y + y)
@@ -323,26 +367,26 @@ class PushTransition(Transition):
         if self.direction == "left":
             # 向左推入
             offset = int(width * t)
-            self.display.blit(self.from_fb, -offset, 0)
-            self.display.blit(self.to_fb, width - offset, 0)
+            self._blit(self.from_fb, self.from_view, -offset, 0)
+            self._blit(self.to_fb, self.to_view, width - offset, 0)
 
         elif self.direction == "right":
             # 向右推入
             offset = int(width * t)
-            self.display.blit(self.from_fb, offset, 0)
-            self.display.blit(self.to_fb, -width + offset, 0)
+            self._blit(self.from_fb, self.from_view, offset, 0)
+            self._blit(self.to_fb, self.to_view, -width + offset, 0)
 
         elif self.direction == "up":
             # 向上推入
             offset = int(height * t)
-            self.display.blit(self.from_fb, 0, -offset)
-            self.display.blit(self.to_fb, 0, height - offset)
+            self._blit(self.from_fb, self.from_view, 0, -offset)
+            self._blit(self.to_fb, self.to_view, 0, height - offset)
 
         elif self.direction == "down":
             # 向下推入
             offset = int(height * t)
-            self.display.blit(self.from_fb, 0, offset)
-            self.display.blit(self.to_fb, 0, -height + offset)
+            self._blit(self.from_fb, self.from_view, 0, offset)
+            self._blit(self.to_fb, self.to_view, 0, -height + offset)
 
     def reverse(self):
         """返回反向的推入动画"""